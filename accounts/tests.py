@@ -7,13 +7,16 @@ Tests de:
 - Verificación de email
 - Roles y permisos
 - Recuperación de contraseña
+- Presupuestos de consultas por vista
 """
 
 import pytest
 from django.test import TestCase, Client
 from django.urls import reverse
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from accounts.models import CustomUser
+from blog_platform.query_inspector import QueryBudgetTestMixin
 
 User = get_user_model()
 
@@ -137,3 +140,56 @@ class UserRolesTestCase(TestCase):
         self.assertTrue(self.author_user.can_publish)
         self.assertTrue(self.admin_user.can_publish)
         self.assertFalse(self.reader_user.can_publish)
+
+
+class AccountsQueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    """Tests de presupuesto de consultas de las vistas de cuentas."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader',
+            email='reader@example.com',
+            password='ReaderPass123!',
+            role='reader',
+            is_active=True,
+            is_email_verified=True
+        )
+    
+    def test_anonymous_views(self):
+        """Test que las vistas públicas cumplen su presupuesto."""
+        self.assertWithinQueryBudget(reverse('home'))
+        self.assertWithinQueryBudget(reverse('register'))
+        self.assertWithinQueryBudget(reverse('login'))
+    
+    def test_authenticated_views(self):
+        """Test que las vistas del usuario cumplen su presupuesto."""
+        self.client.force_login(self.user)
+        self.assertWithinQueryBudget(reverse('home'))
+        self.assertWithinQueryBudget(reverse('dashboard'))
+        self.assertWithinQueryBudget(reverse('profile'))
+        self.assertWithinQueryBudget(reverse('logout'))
+        self.assertWithinQueryBudget(reverse('logout'), method='post')
+    
+    def test_register_post(self):
+        """Test que el registro cumple su presupuesto."""
+        response = self.assertWithinQueryBudget(
+            reverse('register'), method='post',
+            data={
+                'username': 'nuevo',
+                'email': 'nuevo@example.com',
+                'first_name': 'Nuevo',
+                'last_name': 'Usuario',
+                'password1': 'NuevoPass123!',
+                'password2': 'NuevoPass123!',
+            }
+        )
+        self.assertEqual(response.status_code, 302)
+    
+    def test_login_post(self):
+        """Test que el inicio de sesión cumple su presupuesto."""
+        self.assertWithinQueryBudget(
+            reverse('login'), method='post',
+            data={'username': 'reader@example.com', 'password': 'ReaderPass123!'}
+        )
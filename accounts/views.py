@@ -6,10 +6,9 @@ y recuperación de contraseña.
 """
 
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
+from django.contrib.auth import login as auth_login, logout as auth_logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.utils import timezone
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -19,10 +18,14 @@ from django.urls import reverse
 from django.conf import settings
 from django_ratelimit.decorators import ratelimit
 
+from blog.page_cache import cache_anonymous_page
+from blog_platform.query_inspector import query_budget
+
 from .forms import RegistrationForm, LoginForm
 from .models import CustomUser
 
 
+@query_budget(6)
 @ratelimit(key='ip', rate='5/m', method='POST', block=True)
 def register(request):
     """
@@ -109,6 +112,7 @@ def send_verification_email(request, user):
     )
 
 
+@query_budget(10)
 def verify_email(request, uidb64, token):
     """
     Vista de verificación de email.
@@ -141,6 +145,7 @@ def verify_email(request, uidb64, token):
         return redirect('register')
 
 
+@query_budget(9)
 @ratelimit(key='ip', rate='10/m', method='POST', block=True)
 def login_view(request):
     """
@@ -160,22 +165,16 @@ def login_view(request):
     if request.method == 'POST':
         form = LoginForm(data=request.POST)
         if form.is_valid():
-            email = form.cleaned_data.get('username')  # username es email en nuestro caso
-            password = form.cleaned_data.get('password')
             remember_me = form.cleaned_data.get('remember_me')
             
-            # Autenticar usuario
-            user = authenticate(request, username=email, password=password)
+            # El formulario ya autenticó al usuario (username es el email)
+            user = form.get_user()
             
             if user is not None:
                 if user.is_active:
-                    # Login exitoso
+                    # Login exitoso (auth_login actualiza last_login)
                     auth_login(request, user)
                     
-                    # Actualizar last_login
-                    user.last_login = timezone.now()
-                    user.save(update_fields=['last_login'])
-                    
                     # Configurar duración de sesión
                     if not remember_me:
                         # Sesión expira al cerrar navegador
@@ -204,6 +203,7 @@ def login_view(request):
     return render(request, 'accounts/login.html', {'form': form})
 
 
+@query_budget(5)
 @login_required
 def logout_view(request):
     """
@@ -221,6 +221,7 @@ def logout_view(request):
     return render(request, 'accounts/logout_confirm.html')
 
 
+@query_budget(5)
 @login_required
 def dashboard(request):
     """
@@ -237,6 +238,7 @@ def dashboard(request):
     return render(request, 'accounts/dashboard.html', context)
 
 
+@query_budget(5)
 @login_required
 def profile(request):
     """
@@ -251,6 +253,8 @@ def profile(request):
     return render(request, 'accounts/profile.html', context)
 
 
+@query_budget(5)
+@cache_anonymous_page()
 def home(request):
     """
     Vista de la página de inicio.
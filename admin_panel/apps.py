@@ -9,3 +9,6 @@ class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_panel'
     verbose_name = 'Panel de Administración'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,275 @@
+"""
+Benchmark de las rutas principales de lectura y escritura.
+
+``run_benchmarks`` hace peticiones con el cliente de pruebas de Django
+(middlewares, vistas, ORM y plantillas completos, sin red) contra la base
+de datos configurada y mide por escenario la latencia (p50/p95/p99), el
+rendimiento (peticiones por segundo), las consultas SQL y el tamaño de la
+respuesta. Los escenarios usan objetos representativos de los datos
+existentes: la categoría y la etiqueta con más posts, el post con más
+comentarios, el autor con más posts y un administrador.
+
+El resultado es un dict serializable a JSON; ``compare_reports`` compara
+dos ejecuciones escenario a escenario.
+
+Por defecto la caché de páginas anónimas se desactiva para medir el
+trabajo real de cada vista; las demás cachés (sidebar, estadísticas) se
+comportan como en producción. El inspector de consultas se desactiva
+durante la medición porque su coste no existe en producción.
+"""
+
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+import django
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog_platform.performance import percentile
+from blog_platform.query_inspector import QueryInspector
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 3
+
+Scenario = namedtuple('Scenario', ['name', 'url', 'user'])
+
+
+def dataset_counts():
+    """Filas de las tablas principales."""
+    from accounts.models import CustomUser
+    from blog.models import Category, Comment, Post, Tag
+
+    return {
+        'users': CustomUser.objects.count(),
+        'categories': Category.objects.count(),
+        'tags': Tag.objects.count(),
+        'posts': Post.objects.count(),
+        'published_posts': Post.published.count(),
+        'comments': Comment.objects.count(),
+    }
+
+
+def build_scenarios():
+    """
+    Escenarios a medir a partir de los datos existentes.
+
+    Returns:
+        list: ``Scenario(name, url, user)``; ``user`` es None para anónimos
+    """
+    from accounts.models import CustomUser
+    from blog.models import Category, Post, Tag
+
+    published = Q(posts__status='published')
+    category = Category.objects.annotate(total=Count('posts', filter=published)).order_by('-total').first()
+    tag = Tag.objects.annotate(total=Count('posts', filter=published)).order_by('-total').first()
+    busiest = Post.published.order_by('-approved_comment_count').first()
+    recent = Post.published.order_by('-created_at').first()
+    author = (
+        CustomUser.objects.filter(role__in=['author', 'admin'])
+        .annotate(total=Count('posts')).order_by('-total').first()
+    )
+    admin = CustomUser.objects.filter(role='admin', is_active=True).first()
+
+    post_list = reverse('post_list')
+    scenarios = [Scenario('post_list', post_list, None)]
+    for order in ('-created_at', 'created_at', '-views_count', 'title', 'reading_time'):
+        scenarios.append(Scenario(f'post_list?order={order}', f'{post_list}?order={order}', None))
+    if recent:
+        word = recent.title.split()[0]
+        scenarios.append(Scenario('post_list?q', f'{post_list}?q={word}', None))
+    if category:
+        scenarios.append(Scenario('post_list?category', f'{post_list}?category={category.slug}', None))
+    if tag:
+        scenarios.append(Scenario('post_list?tag', f'{post_list}?tag={tag.slug}', None))
+    if busiest:
+        scenarios.append(Scenario('post_detail', reverse('post_detail', args=[busiest.slug]), None))
+        if author:
+            scenarios.append(Scenario(
+                'post_detail (autenticado)', reverse('post_detail', args=[busiest.slug]), author
+            ))
+    scenarios.append(Scenario('category_list', reverse('category_list'), None))
+    scenarios.append(Scenario('tag_list', reverse('tag_list'), None))
+    if author:
+        scenarios.append(Scenario('my_posts', reverse('my_posts'), author))
+    if admin:
+        scenarios.append(Scenario('admin_dashboard', reverse('admin_panel:dashboard'), admin))
+        scenarios.append(Scenario('view_logs', reverse('admin_panel:logs'), admin))
+    return scenarios
+
+
+def _client(user):
+    client = Client()
+    if user is not None:
+        client.force_login(user)
+    return client
+
+
+def _summary(values):
+    values = sorted(values)
+    return {
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+        'mean': round(statistics.fmean(values), 3),
+        'min': round(values[0], 3),
+        'max': round(values[-1], 3),
+    }
+
+
+def run_scenario(scenario, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, concurrency=1):
+    """
+    Mide un escenario.
+
+    Las consultas se cuentan en una petición aparte (sin cronometrar) para
+    no sumar el coste de la inspección a la latencia.
+
+    Returns:
+        dict: ``latency_ms``, ``throughput_rps``, ``queries``,
+              ``response_bytes``, ``status`` y ``errors``
+    """
+    client = _client(scenario.user)
+    for _ in range(warmup):
+        client.get(scenario.url, secure=True)
+    with QueryInspector() as inspector:
+        response = client.get(scenario.url, secure=True)
+
+    latencies = []
+    errors = []
+
+    def worker(requests, client):
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                result = client.get(scenario.url, secure=True)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if result.status_code != 200:
+                    errors.append(result.status_code)
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    shares = [iterations // concurrency + (1 if i < iterations % concurrency else 0)
+              for i in range(concurrency)]
+    started = time.perf_counter()
+    if concurrency == 1:
+        worker(iterations, client)
+    else:
+        threads = [
+            threading.Thread(target=worker, args=(share, _client(scenario.user)))
+            for share in shares if share
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'name': scenario.name,
+        'url': scenario.url,
+        'authenticated': scenario.user is not None,
+        'status': response.status_code,
+        'iterations': len(latencies),
+        'errors': len(errors),
+        'queries': inspector.count,
+        'response_bytes': len(response.content),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_ms': _summary(latencies) if latencies else None,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, concurrency=1,
+                   only=None, page_cache=False, progress=None):
+    """
+    Ejecuta todos los escenarios (o los de ``only``) y retorna el informe.
+
+    Args:
+        iterations (int): Peticiones cronometradas por escenario
+        warmup (int): Peticiones previas sin cronometrar
+        concurrency (int): Hilos que reparten las peticiones
+        only (list): Nombres de escenarios a ejecutar
+        page_cache (bool): Mantener la caché de páginas anónimas
+        progress (callable): ``progress(resultado)`` tras cada escenario
+    """
+    hosts = list(settings.ALLOWED_HOSTS) + ['testserver']
+    with override_settings(
+        ALLOWED_HOSTS=hosts,
+        PAGE_CACHE_ENABLED=page_cache and settings.PAGE_CACHE_ENABLED,
+        QUERY_INSPECTOR_ENABLED=False,
+    ):
+        scenarios = build_scenarios()
+        if only:
+            scenarios = [scenario for scenario in scenarios if scenario.name in only]
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(scenario, iterations, warmup, concurrency)
+            results.append(result)
+            if progress:
+                progress(result)
+
+    return {
+        'created_at': timezone.now().isoformat(),
+        'git_revision': _git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'options': {
+            'iterations': iterations,
+            'warmup': warmup,
+            'concurrency': concurrency,
+            'page_cache': page_cache,
+        },
+        'dataset': dataset_counts(),
+        'results': results,
+    }
+
+
+def compare_reports(previous, current):
+    """
+    Compara dos informes escenario a escenario.
+
+    Returns:
+        list: Un dict por escenario común con p50, p95, rps y consultas
+              antes/después y la variación porcentual de p50 y p95
+    """
+    before = {result['name']: result for result in previous.get('results', [])}
+    rows = []
+    for result in current['results']:
+        old = before.get(result['name'])
+        if not old or not old.get('latency_ms') or not result.get('latency_ms'):
+            continue
+        row = {'name': result['name']}
+        for metric in ('p50', 'p95'):
+            old_value = old['latency_ms'][metric]
+            new_value = result['latency_ms'][metric]
+            row[metric] = (old_value, new_value)
+            row[f'{metric}_change'] = (
+                round((new_value - old_value) / old_value * 100, 1) if old_value else None
+            )
+        row['throughput_rps'] = (old['throughput_rps'], result['throughput_rps'])
+        row['queries'] = (old['queries'], result['queries'])
+        rows.append(row)
+    return rows
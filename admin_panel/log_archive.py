@@ -0,0 +1,150 @@
+"""
+Archivado de logs sin bloquear la petición.
+
+``archive_log`` renombra el log activo a ``<log>.AAAAMMDD-HHMMSS-ffffff`` (un
+``os.replace`` atómico, O(1) sin importar el tamaño) y deja que los
+handlers creen un archivo nuevo. La compresión gzip del archivo renombrado
+y la purga de archivos antiguos se hacen en un hilo en segundo plano.
+Antes de comprimir, las líneas del archivo que aún no estaban en el
+índice de logs (``admin_panel.log_store``) se ingieren.
+
+Los handlers de este proceso se reabren de inmediato; los de otros
+procesos (``ReopeningRotatingFileHandler``) detectan el cambio de inode y
+reabren el archivo antes de su siguiente escritura.
+
+Configuración (settings.py):
+    LOG_ARCHIVE_KEEP: número de archivos comprimidos a conservar por log
+"""
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+from blog_platform.log_handlers import iter_file_handlers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_KEEP = 5
+
+_ARCHIVE_SUFFIX_RE = r'\.\d{8}-\d{6}-\d{6}(?:\.gz)?$'
+
+
+def archive_keep():
+    return getattr(settings, 'LOG_ARCHIVE_KEEP', DEFAULT_ARCHIVE_KEEP)
+
+
+def list_archives(log_path):
+    """Retorna los archivos de un log, del más antiguo al más reciente."""
+    log_path = Path(log_path)
+    pattern = re.compile(re.escape(log_path.name) + _ARCHIVE_SUFFIX_RE)
+    archives = [
+        path for path in log_path.parent.iterdir()
+        if pattern.match(path.name)
+    ]
+    return sorted(archives, key=lambda path: path.name)
+
+
+def reopen_handlers(log_path):
+    """Cierra los handlers de este proceso que escriben en ``log_path``."""
+    target = os.path.abspath(log_path)
+    loggers = [logging.getLogger()] + [
+        item for item in logging.Logger.manager.loggerDict.values()
+        if isinstance(item, logging.Logger)
+    ]
+    # Handlers síncronos de cada logger y los que escriben desde una cola
+    handlers = [handler for log in loggers for handler in log.handlers]
+    handlers += iter_file_handlers()
+    for handler in handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == target:
+            handler.acquire()
+            try:
+                if handler.stream is not None:
+                    handler.stream.close()
+                    handler.stream = None
+            finally:
+                handler.release()
+
+
+def _ingest_before_compress(log_path):
+    """Ingiere en el índice de logs lo pendiente del log y sus archivos."""
+    from .log_store import LogStore
+
+    store = LogStore()
+    # Solo los logs del directorio que indexa el almacén, y si ya se usa
+    if Path(log_path).parent != store.logs_dir or not store.path.exists():
+        return
+    try:
+        store.ingest(log_types=[Path(log_path).stem])
+    except Exception as e:
+        logger.error(f"Error al ingerir {log_path} antes de comprimirlo: {e}")
+
+
+def compress_archive(log_path, archive_path, keep=None):
+    """
+    Comprime un archivo renombrado y purga los más antiguos.
+
+    Args:
+        log_path: Ruta del log activo al que pertenece el archivo
+        archive_path: Archivo sin comprimir (``<log>.AAAAMMDD-HHMMSS-ffffff``)
+        keep (int): Archivos a conservar (``LOG_ARCHIVE_KEEP`` si es None)
+    """
+    archive_path = Path(archive_path)
+    _ingest_before_compress(log_path)
+    gz_path = archive_path.with_name(f'{archive_path.name}.gz')
+    tmp_path = gz_path.with_name(f'{gz_path.name}.tmp')
+    with open(archive_path, 'rb') as f_in, gzip.open(tmp_path, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+    os.replace(tmp_path, gz_path)
+    archive_path.unlink()
+
+    keep = archive_keep() if keep is None else keep
+    archives = list_archives(log_path)
+    for old in archives[:max(len(archives) - keep, 0)]:
+        old.unlink(missing_ok=True)
+
+
+def _compress_in_background(log_path, archive_path, keep):
+    try:
+        compress_archive(log_path, archive_path, keep)
+    except Exception as e:
+        logger.error(f"Error al comprimir el archivo de log {archive_path}: {e}")
+
+
+def archive_log(log_path, keep=None, background=True):
+    """
+    Archiva el log activo: renombrado atómico y compresión en segundo plano.
+
+    Args:
+        log_path: Ruta del log activo
+        keep (int): Archivos a conservar (``LOG_ARCHIVE_KEEP`` si es None)
+        background (bool): Comprimir en un hilo aparte
+
+    Returns:
+        tuple: ``(ruta del archivo, hilo de compresión o None)``
+    """
+    log_path = Path(log_path)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    archive_path = log_path.with_name(f'{log_path.name}.{stamp}')
+
+    os.replace(log_path, archive_path)
+    reopen_handlers(log_path)
+
+    if not background:
+        compress_archive(log_path, archive_path, keep)
+        return archive_path, None
+
+    thread = threading.Thread(
+        target=_compress_in_background,
+        args=(log_path, archive_path, keep),
+        name=f'archive-{log_path.name}',
+        daemon=False,
+    )
+    thread.start()
+    return archive_path, thread
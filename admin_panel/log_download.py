@@ -0,0 +1,191 @@
+"""
+Descarga de logs en streaming.
+
+Los logs se envían por bloques con ``StreamingHttpResponse`` en lugar de
+leerlos completos en memoria. Se soporta:
+
+- Peticiones ``Range: bytes=inicio-fin`` (un solo rango) para reanudar
+  descargas o leer solo el final del archivo.
+- Compresión gzip al vuelo (``?gzip=1``); en ese caso se ignora ``Range``
+  porque el tamaño comprimido no se conoce de antemano.
+- Descarga del log activo junto con sus backups rotados como un único
+  flujo en orden cronológico (``?backups=1``).
+
+Los tamaños se fijan al recibir la petición: lo que se escriba en el log
+durante la descarga no se incluye, así ``Content-Length`` y los rangos
+son coherentes. Los archivos se abren antes de empezar a enviar, de modo
+que una rotación a mitad de la descarga no cambia el contenido.
+"""
+
+import os
+import re
+import zlib
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .log_reader import log_file_chain
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class UnsatisfiableRange(Exception):
+    """El rango solicitado queda fuera del contenido disponible."""
+
+
+def parse_range(header, total):
+    """
+    Interpreta la cabecera ``Range`` para un contenido de ``total`` bytes.
+
+    Args:
+        header (str): Valor de la cabecera (puede estar vacío)
+        total (int): Tamaño total del contenido
+
+    Returns:
+        tuple: ``(inicio, fin)`` inclusivos, o None si no hay rango o no
+               es soportado (varios rangos, sintaxis inválida)
+
+    Raises:
+        UnsatisfiableRange: Si el rango no se solapa con el contenido
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Sufijo: los últimos N bytes
+        length = int(last)
+        if length == 0 or total == 0:
+            raise UnsatisfiableRange(header)
+        return max(0, total - length), total - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= total:
+        raise UnsatisfiableRange(header)
+    end = int(last) if last else total - 1
+    return start, min(end, total - 1)
+
+
+class LogStream:
+    """
+    Iterable que envía un rango de la concatenación de varios archivos.
+
+    Args:
+        segments (list): Tuplas ``(archivo abierto, tamaño)`` en orden
+        start (int): Primer byte a enviar
+        end (int): Último byte a enviar (inclusivo)
+        compress (bool): Comprimir la salida con gzip
+    """
+
+    def __init__(self, segments, start, end, compress=False):
+        self.segments = segments
+        self.start = start
+        self.end = end
+        self.compress = compress
+
+    def _raw_chunks(self):
+        position = 0
+        for f, size in self.segments:
+            segment_start = max(self.start - position, 0)
+            segment_end = min(self.end - position + 1, size)
+            position += size
+            if segment_start >= segment_end:
+                continue
+            f.seek(segment_start)
+            remaining = segment_end - segment_start
+            while remaining > 0:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def __iter__(self):
+        if not self.compress:
+            yield from self._raw_chunks()
+            return
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+        for chunk in self._raw_chunks():
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def close(self):
+        for f, _ in self.segments:
+            f.close()
+
+
+def open_segments(log_path, include_backups=False):
+    """
+    Abre el log (y opcionalmente sus backups) del más antiguo al más reciente.
+
+    Returns:
+        list: Tuplas ``(archivo abierto, tamaño)``
+    """
+    chain = log_file_chain(log_path)
+    if not include_backups:
+        chain = [(index, path) for index, path in chain if index == 0]
+
+    segments = []
+    try:
+        for _, path in reversed(chain):
+            f = open(path, 'rb')
+            segments.append((f, os.fstat(f.fileno()).st_size))
+    except OSError:
+        for f, _ in segments:
+            f.close()
+        raise
+    return segments
+
+
+def log_download_response(request, log_path, filename, include_backups=False, compress=False):
+    """
+    Construye la respuesta de descarga de un log.
+
+    Args:
+        request: HttpRequest (se usa la cabecera ``Range``)
+        log_path: Ruta del log activo
+        filename (str): Nombre sugerido para el archivo descargado
+        include_backups (bool): Incluir los backups rotados
+        compress (bool): Comprimir con gzip al vuelo
+
+    Returns:
+        StreamingHttpResponse (200 o 206) o HttpResponse 416
+    """
+    segments = open_segments(log_path, include_backups)
+    total = sum(size for _, size in segments)
+
+    byte_range = None
+    if not compress:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), total)
+        except UnsatisfiableRange:
+            for f, _ in segments:
+                f.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{total}'
+            return response
+
+    start, end = byte_range or (0, total - 1)
+    stream = LogStream(segments, start, end, compress=compress)
+
+    if compress:
+        response = StreamingHttpResponse(stream, content_type='application/gzip')
+        filename = f'{filename}.gz'
+    else:
+        response = StreamingHttpResponse(stream, content_type='text/plain')
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Length'] = str(max(end - start + 1, 0))
+        if byte_range is not None:
+            response.status_code = 206
+            response['Content-Range'] = f'bytes {start}-{end}/{total}'
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,84 @@
+"""
+Parser de líneas de log.
+
+Una sola expresión regular compilada al importar el módulo reconoce, en
+una única pasada, los formatos que se escriben en ``logs/``:
+
+- ``verbose`` de settings.LOGGING:
+  ``[INFO] 2026-01-09 20:00:00,123 views 12345 67890 mensaje``
+- ``verbose`` de ``generate_test_logs.py``:
+  ``[INFO] 2026-01-09 20:00:00,123 - views (Process: 12345 Thread: 67890) - mensaje``
+- ``simple`` (con o sin guion):
+  ``[INFO] 2026-01-09 20:00:00,123 mensaje``
+
+Las líneas que no siguen ningún formato (p. ej. las de un traceback) se
+devuelven con nivel ``UNKNOWN`` y la línea completa como mensaje.
+"""
+
+import re
+
+_LOG_LINE_RE = re.compile(
+    r'\[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\] '
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})?) '
+    r'(?:'
+    # generate_test_logs.py: - módulo (Process: pid Thread: tid) - mensaje
+    r'- (\S+) \(Process: (\d+) Thread: (\d+)\) - (.*)'
+    r'|'
+    # settings.LOGGING verbose: módulo pid tid mensaje
+    r'(\w+) (\d+) (\d+) (.*)'
+    r'|'
+    # simple: mensaje
+    r'(?:- )?(.*)'
+    r')',
+    re.DOTALL,
+)
+
+
+class LogRecord:
+    """
+    Entrada de log parseada.
+
+    Atributos: ``level``, ``timestamp``, ``module``, ``pid``, ``thread``,
+    ``message`` y ``raw`` (la línea original). ``pid`` y ``thread`` son
+    cadenas vacías si el formato no los incluye.
+    """
+    __slots__ = ('level', 'timestamp', 'module', 'pid', 'thread', 'message', 'raw')
+
+    def __init__(self, level='UNKNOWN', timestamp='', module='', pid='', thread='',
+                 message='', raw=''):
+        self.level = level
+        self.timestamp = timestamp
+        self.module = module
+        self.pid = pid
+        self.thread = thread
+        self.message = message
+        self.raw = raw
+
+    def __repr__(self):
+        return f'<LogRecord {self.level} {self.timestamp} {self.message[:40]!r}>'
+
+
+def parse_log_line(line, _match=_LOG_LINE_RE.match):
+    """
+    Parsear una línea de log y extraer nivel, timestamp, módulo, proceso,
+    hilo y mensaje.
+
+    Args:
+        line (str): Línea sin el salto de línea final
+
+    Returns:
+        LogRecord
+    """
+    m = _match(line)
+    if m is None:
+        return LogRecord(message=line, raw=line)
+
+    (level, timestamp, test_module, test_pid, test_thread, test_message,
+     module, pid, thread, message, simple_message) = m.groups()
+
+    if test_message is not None:
+        return LogRecord(level, timestamp, test_module, test_pid, test_thread,
+                         test_message, line)
+    if message is not None:
+        return LogRecord(level, timestamp, module, pid, thread, message, line)
+    return LogRecord(level, timestamp, '', '', '', simple_message, line)
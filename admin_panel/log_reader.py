@@ -0,0 +1,131 @@
+"""
+Lectura de archivos de log desde el final.
+
+``view_logs`` solo muestra las líneas más recientes, así que en lugar de
+cargar el archivo completo (hasta 10 MB por archivo) se lee por bloques
+desde el final con ``seek`` y se generan las líneas de forma perezosa.
+La memoria usada es constante: un bloque más la línea parcial en curso.
+
+Las posiciones de lectura se expresan como ``LogPosition(file_index,
+offset)``, donde ``file_index`` es 0 para el log activo y N para el
+backup ``<log>.N`` creado por ``RotatingFileHandler``. Una posición
+identifica el inicio de una línea y permite continuar hacia atrás
+("más antiguos") en la siguiente petición, pasando al backup siguiente
+al llegar al principio de cada archivo.
+
+Si el log rota entre dos peticiones, los índices se desplazan y la
+posición guardada apunta a contenido distinto; basta con volver a la
+primera página.
+"""
+
+import os
+from collections import namedtuple
+from pathlib import Path
+
+BLOCK_SIZE = 64 * 1024
+
+# Igual que ``backupCount`` de los RotatingFileHandler de settings.LOGGING
+DEFAULT_BACKUP_COUNT = 5
+
+LogPosition = namedtuple('LogPosition', ['file_index', 'offset'])
+
+
+def log_file_chain(log_path, backup_count=DEFAULT_BACKUP_COUNT):
+    """
+    Retorna el log activo y sus backups rotados, del más reciente al más antiguo.
+
+    Returns:
+        list: Tuplas ``(file_index, path)`` de los archivos existentes
+    """
+    log_path = Path(log_path)
+    chain = []
+    for index in range(backup_count + 1):
+        path = log_path if index == 0 else log_path.with_name(f'{log_path.name}.{index}')
+        if path.exists():
+            chain.append((index, path))
+    return chain
+
+
+def reverse_lines(path, end=None, block_size=BLOCK_SIZE):
+    """
+    Genera las líneas de un archivo desde el final hacia el principio.
+
+    Args:
+        path: Ruta del archivo
+        end (int): Byte en el que empezar a leer hacia atrás (final del
+                   archivo si es None)
+        block_size (int): Tamaño de cada lectura
+
+    Yields:
+        tuple: ``(offset, line)`` con el byte de inicio de la línea y su
+               contenido en bytes, sin el salto de línea
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        position = size if end is None else max(0, min(end, size))
+        remainder = b''
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b'\n')
+            # El primer fragmento puede estar incompleto: se completa con el bloque anterior
+            remainder = lines[0]
+            line_end = position + len(chunk)
+            for line in reversed(lines[1:]):
+                start = line_end - len(line)
+                yield start, line
+                line_end = start - 1
+
+        if remainder:
+            yield 0, remainder
+
+
+def iter_log_lines(log_path, before=None, backup_count=DEFAULT_BACKUP_COUNT):
+    """
+    Genera las líneas no vacías de un log y sus backups, más recientes primero.
+
+    Args:
+        log_path: Ruta del log activo
+        before (LogPosition): Continuar con las líneas anteriores a esta
+                              posición (desde el final si es None)
+        backup_count (int): Número máximo de backups rotados a recorrer
+
+    Yields:
+        tuple: ``(LogPosition, line)`` con la línea decodificada
+    """
+    for index, path in log_file_chain(log_path, backup_count):
+        end = None
+        if before is not None:
+            if index < before.file_index:
+                continue
+            if index == before.file_index:
+                end = before.offset
+
+        for offset, raw in reverse_lines(path, end=end):
+            line = raw.decode('utf-8', errors='replace').strip()
+            if line:
+                yield LogPosition(index, offset), line
+
+
+def encode_position(position):
+    """Serializa una posición para usarla en la query string."""
+    return f'{position.file_index}:{position.offset}'
+
+
+def decode_position(value):
+    """
+    Convierte el valor de la query string en una ``LogPosition``.
+
+    Returns:
+        LogPosition o None si el valor está vacío o no es válido
+    """
+    try:
+        file_index, offset = (int(part) for part in value.split(':'))
+    except (AttributeError, ValueError):
+        return None
+    if file_index < 0 or offset < 0:
+        return None
+    return LogPosition(file_index, offset)
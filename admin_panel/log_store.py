@@ -0,0 +1,389 @@
+"""
+Almacén indexado de entradas de log.
+
+Los archivos ``logs/*.log`` se ingieren de forma incremental en una base
+de datos SQLite propia (``logs/log_index.sqlite3`` por defecto), con
+índices por tipo de log, nivel, timestamp y módulo, y un índice FTS5
+sobre el mensaje. Así el panel puede filtrar y buscar en millones de
+líneas sin releer el texto en cada petición.
+
+Ingesta incremental: por cada log se guarda el inode y el byte hasta el
+que se leyó. En la siguiente ingesta:
+
+- Si el inode es el del log activo, se continúa desde ese byte (solo
+  líneas completas).
+- Si el archivo rotó o se archivó, el inode guardado es ahora el de un
+  backup (``<log>.1``...) o el de un archivo aún sin comprimir
+  (``<log>.AAAAMMDD-HHMMSS-ffffff``): se termina de leer y se sigue con
+  los más recientes. ``compress_archive`` ingiere el archivo antes de
+  comprimirlo para no perder sus últimas líneas.
+- Si el archivo es más pequeño que el byte guardado, se truncó y se
+  empieza desde el principio.
+- En la primera ingesta se leen los backups (del más antiguo al más
+  reciente) y luego el log activo.
+
+El número de entradas por tipo de log y nivel se mantiene en la tabla
+``level_counts`` durante la ingesta (y al podar), de modo que los totales
+sin filtros no recorren ``log_entries``.
+
+Configuración (settings.py):
+    LOG_STORE_PATH: ruta de la base de datos del índice
+"""
+
+import os
+import sqlite3
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+
+from django.conf import settings
+
+from blog.search import build_fts_query
+from .log_archive import list_archives
+from .log_parser import parse_log_line
+from .log_reader import log_file_chain
+
+# Líneas insertadas por transacción durante la ingesta
+BATCH_SIZE = 5000
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS log_entries ('
+    'id INTEGER PRIMARY KEY, log_type TEXT NOT NULL, level TEXT NOT NULL, '
+    'timestamp TEXT NOT NULL, module TEXT NOT NULL, message TEXT NOT NULL, '
+    'raw TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS log_entries_level '
+    'ON log_entries(log_type, level, id)',
+    'CREATE INDEX IF NOT EXISTS log_entries_timestamp '
+    'ON log_entries(log_type, timestamp)',
+    'CREATE INDEX IF NOT EXISTS log_entries_module '
+    'ON log_entries(log_type, module, id)',
+    'CREATE VIRTUAL TABLE IF NOT EXISTS log_entries_fts USING fts5('
+    "message, content='log_entries', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    'CREATE TABLE IF NOT EXISTS ingest_state ('
+    'log_type TEXT PRIMARY KEY, inode INTEGER NOT NULL, offset INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS level_counts ('
+    'log_type TEXT NOT NULL, level TEXT NOT NULL, count INTEGER NOT NULL, '
+    'PRIMARY KEY (log_type, level))',
+]
+
+UPSERT_LEVEL_COUNT = (
+    'INSERT INTO level_counts(log_type, level, count) VALUES (?, ?, ?) '
+    'ON CONFLICT(log_type, level) DO UPDATE SET count = count + excluded.count'
+)
+
+
+def default_store_path():
+    return Path(
+        getattr(settings, 'LOG_STORE_PATH', None)
+        or settings.BASE_DIR / 'logs' / 'log_index.sqlite3'
+    )
+
+
+class LogStore:
+    """
+    Índice SQLite de las entradas de los logs de la aplicación.
+
+    Args:
+        path: Ruta de la base de datos (``LOG_STORE_PATH`` si es None)
+        logs_dir: Directorio de logs (``BASE_DIR/logs`` si es None)
+    """
+
+    def __init__(self, path=None, logs_dir=None):
+        self.path = Path(path) if path else default_store_path()
+        self.logs_dir = Path(logs_dir) if logs_dir else settings.BASE_DIR / 'logs'
+
+    def connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            conn.execute(statement)
+        if conn.execute('SELECT 1 FROM level_counts LIMIT 1').fetchone() is None:
+            # Índices creados antes de existir level_counts (o vacíos)
+            with conn:
+                conn.execute(
+                    'INSERT INTO level_counts(log_type, level, count) '
+                    'SELECT log_type, level, COUNT(*) FROM log_entries GROUP BY log_type, level'
+                )
+        return conn
+
+    # Ingesta
+
+    def log_types(self):
+        """Tipos de log con archivos en el directorio (activos o archivados)."""
+        if not self.logs_dir.exists():
+            return []
+        return sorted({
+            path.name[:path.name.index('.log')] for path in self.logs_dir.glob('*.log*')
+        })
+
+    def ingest(self, max_lines=None, log_types=None):
+        """
+        Ingiere las líneas nuevas de los logs del directorio.
+
+        Args:
+            max_lines (int): Máximo de líneas por log en esta llamada (el
+                             resto se ingiere en la siguiente)
+            log_types (iterable): Solo estos tipos de log (todos si es None)
+
+        Returns:
+            dict: Líneas ingeridas por tipo de log
+        """
+        types = self.log_types()
+        if log_types is not None:
+            types = [log_type for log_type in types if log_type in set(log_types)]
+        if not types:
+            return {}
+        ingested = {}
+        with closing(self.connect()) as conn:
+            for log_type in types:
+                ingested[log_type] = self._ingest_log(
+                    conn, log_type, self.logs_dir / f'{log_type}.log', max_lines
+                )
+        return ingested
+
+    @staticmethod
+    def _ingest_files(log_path):
+        """
+        Archivos de un log del más antiguo al más reciente: backups rotados
+        y archivos sin comprimir por fecha de modificación, y el log activo.
+        """
+        older = [path for index, path in log_file_chain(log_path) if index > 0]
+        older += [path for path in list_archives(log_path) if path.suffix != '.gz']
+        files = sorted(older, key=lambda path: path.stat().st_mtime)
+        if log_path.exists():
+            files.append(log_path)
+        return files
+
+    def _ingest_log(self, conn, log_type, log_path, max_lines):
+        # Archivos del más antiguo al más reciente, identificados por inode
+        files = self._ingest_files(log_path)
+        if not files:
+            return 0
+        inodes = [os.stat(path).st_ino for path in files]
+        state = conn.execute(
+            'SELECT inode, offset FROM ingest_state WHERE log_type = ?', (log_type,)
+        ).fetchone()
+
+        if state is None:
+            position, offset = 0, 0
+        elif state['inode'] in inodes:
+            # Mismo archivo (o rotado a un backup): continuar donde se quedó
+            position, offset = inodes.index(state['inode']), state['offset']
+            if os.path.getsize(files[position]) < offset:
+                offset = 0
+        else:
+            # El archivo leído ya no existe (archivado o eliminado)
+            position, offset = len(files) - 1, 0
+
+        budget = [max_lines]
+        total = 0
+        for index in range(position, len(files)):
+            count, finished = self._read_and_store(
+                conn, log_type, files[index], offset if index == position else 0,
+                inodes[index], budget
+            )
+            total += count
+            if not finished:
+                break
+        return total
+
+    def _read_and_store(self, conn, log_type, path, offset, inode, budget):
+        """
+        Inserta las líneas completas desde ``offset`` y guarda el progreso.
+
+        Returns:
+            tuple: ``(líneas, terminado)``; no terminado si se agotó el límite
+        """
+        count = 0
+        batch = []
+        finished = True
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # Línea a medio escribir: se leerá completa la próxima vez
+                    break
+                if budget[0] is not None and budget[0] <= 0:
+                    finished = False
+                    break
+                offset += len(raw)
+                line = raw.decode('utf-8', errors='replace').strip()
+                if not line:
+                    continue
+                record = parse_log_line(line)
+                batch.append((
+                    log_type, record.level, record.timestamp,
+                    record.module, record.message, line,
+                ))
+                count += 1
+                if budget[0] is not None:
+                    budget[0] -= 1
+                if len(batch) >= BATCH_SIZE:
+                    self._flush(conn, log_type, batch, inode, offset)
+                    batch = []
+        self._flush(conn, log_type, batch, inode, offset)
+        return count, finished
+
+    def _flush(self, conn, log_type, batch, inode, offset):
+        levels = Counter(row[1] for row in batch)
+        with conn:
+            for row in batch:
+                cursor = conn.execute(
+                    'INSERT INTO log_entries(log_type, level, timestamp, module, message, raw) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    row
+                )
+                conn.execute(
+                    'INSERT INTO log_entries_fts(rowid, message) VALUES (?, ?)',
+                    (cursor.lastrowid, row[4])
+                )
+            conn.executemany(
+                UPSERT_LEVEL_COUNT,
+                [(log_type, level, count) for level, count in levels.items()]
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO ingest_state(log_type, inode, offset) '
+                'VALUES (?, ?, ?)',
+                (log_type, inode, offset)
+            )
+
+    # Consultas
+
+    @staticmethod
+    def _where(log_type, level=None, module=None, since=None, until=None, query=None):
+        clauses = ['log_entries.log_type = ?']
+        params = [log_type]
+        if level:
+            clauses.append('log_entries.level = ?')
+            params.append(level)
+        if module:
+            clauses.append('log_entries.module = ?')
+            params.append(module)
+        if since:
+            clauses.append('log_entries.timestamp >= ?')
+            params.append(since)
+        if until:
+            clauses.append('log_entries.timestamp < ?')
+            params.append(until)
+        if query:
+            fts_query = build_fts_query(query)
+            if fts_query:
+                clauses.append(
+                    'log_entries.id IN (SELECT rowid FROM log_entries_fts '
+                    'WHERE log_entries_fts MATCH ?)'
+                )
+                params.append(fts_query)
+        return ' AND '.join(clauses), params
+
+    def search(self, log_type, level=None, module=None, since=None, until=None,
+               query=None, before_id=None, limit=50):
+        """
+        Retorna entradas filtradas, de la más reciente a la más antigua.
+
+        Args:
+            log_type (str): Tipo de log (nombre del archivo sin ``.log``)
+            level, module (str): Filtros exactos
+            since, until (str): Rango de timestamps ``YYYY-MM-DD HH:MM[:SS]``
+            query (str): Búsqueda full-text en el mensaje
+            before_id (int): Solo entradas anteriores a este id (paginación)
+            limit (int): Máximo de entradas
+
+        Returns:
+            list: Diccionarios con id, level, timestamp, module, message y raw
+        """
+        where, params = self._where(log_type, level, module, since, until, query)
+        if before_id:
+            where += ' AND log_entries.id < ?'
+            params.append(before_id)
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                f'SELECT id, level, timestamp, module, message, raw FROM log_entries '
+                f'WHERE {where} ORDER BY id DESC LIMIT ?',
+                params + [limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def level_counts(self, log_type, module=None, since=None, until=None, query=None,
+                     limit=None):
+        """
+        Retorna el número de entradas por nivel con los filtros indicados.
+
+        Sin filtros se leen los totales de ``level_counts``. Con filtros se
+        cuentan las entradas; ``limit`` acota las filas recorridas (las
+        más recientes) y entonces los totales son un mínimo.
+        """
+        with closing(self.connect()) as conn:
+            if not any((module, since, until, query)):
+                rows = conn.execute(
+                    'SELECT level, count FROM level_counts WHERE log_type = ? AND count > 0',
+                    (log_type,)
+                ).fetchall()
+            else:
+                where, params = self._where(log_type, None, module, since, until, query)
+                matching = f'SELECT level FROM log_entries WHERE {where}'
+                if limit is not None:
+                    matching += ' ORDER BY id DESC LIMIT ?'
+                    params.append(limit)
+                rows = conn.execute(
+                    f'SELECT level, COUNT(*) FROM ({matching}) GROUP BY level',
+                    params
+                ).fetchall()
+        return {level: count for level, count in rows}
+
+    def modules(self, log_type):
+        """Retorna los módulos distintos de un tipo de log."""
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                'SELECT DISTINCT module FROM log_entries '
+                "WHERE log_type = ? AND module != '' ORDER BY module",
+                (log_type,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # Mantenimiento
+
+    def prune(self, older_than):
+        """
+        Elimina las entradas con timestamp anterior al indicado.
+
+        Returns:
+            int: Número de entradas eliminadas
+        """
+        with closing(self.connect()) as conn, conn:
+            removed = conn.execute(
+                "SELECT log_type, level, COUNT(*) FROM log_entries "
+                "WHERE timestamp < ? AND timestamp != '' GROUP BY log_type, level",
+                (older_than,)
+            ).fetchall()
+            conn.executemany(
+                UPSERT_LEVEL_COUNT,
+                [(log_type, level, -count) for log_type, level, count in removed]
+            )
+            conn.execute(
+                "INSERT INTO log_entries_fts(log_entries_fts, rowid, message) "
+                "SELECT 'delete', id, message FROM log_entries "
+                "WHERE timestamp < ? AND timestamp != ''",
+                (older_than,)
+            )
+            cursor = conn.execute(
+                "DELETE FROM log_entries WHERE timestamp < ? AND timestamp != ''",
+                (older_than,)
+            )
+            return cursor.rowcount
+
+    def reset(self, log_type=None):
+        """Vacía el índice (de un tipo de log o completo) y su estado de ingesta."""
+        where, params = ('WHERE log_type = ?', [log_type]) if log_type else ('', [])
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                f"INSERT INTO log_entries_fts(log_entries_fts, rowid, message) "
+                f"SELECT 'delete', id, message FROM log_entries {where}",
+                params
+            )
+            conn.execute(f'DELETE FROM log_entries {where}', params)
+            conn.execute(f'DELETE FROM ingest_state {where}', params)
+            conn.execute(f'DELETE FROM level_counts {where}', params)
@@ -0,0 +1,70 @@
+"""
+Comando para medir el rendimiento del parser de logs.
+
+Parsea N líneas sintéticas con los tres formatos reconocidos (y líneas
+de traceback) y muestra las líneas por segundo.
+
+Uso:
+    python manage.py benchmark_log_parser
+    python manage.py benchmark_log_parser --lines 200000 --file logs/general.log
+"""
+
+import itertools
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.log_parser import parse_log_line
+
+SAMPLE_LINES = [
+    "[INFO] 2026-01-09 20:00:00,123 views 12345 140234 Usuario 'admin' inició sesión",
+    '[WARNING] 2026-01-09 20:00:01,456 - generate_test_logs (Process: 12345 Thread: 140234) '
+    '- Cache de la aplicación está lleno, considere limpiar',
+    '[ERROR] 2026-01-09 20:00:02,789 Error al conectar con la base de datos',
+    '[DEBUG] 2026-01-09 20:00:03,000 - Consulta ejecutada en 0.002s',
+    'Traceback (most recent call last):',
+    '  File "/app/blog/views.py", line 42, in post_detail',
+]
+
+
+class Command(BaseCommand):
+    help = 'Mide cuántas líneas de log por segundo procesa parse_log_line.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lines',
+            type=int,
+            default=1_000_000,
+            help='Número de líneas a parsear (1.000.000 por defecto).',
+        )
+        parser.add_argument(
+            '--file',
+            help='Tomar las líneas de este archivo (se repiten hasta completar --lines).',
+        )
+
+    def handle(self, *args, **options):
+        total = options['lines']
+        sample = SAMPLE_LINES
+        if options['file']:
+            with open(options['file'], encoding='utf-8', errors='replace') as f:
+                sample = [line.rstrip('\n') for line in itertools.islice(f, 10000) if line.strip()]
+            if not sample:
+                self.stderr.write('El archivo no contiene líneas.')
+                return
+
+        lines = itertools.islice(itertools.cycle(sample), total)
+        levels = {}
+
+        start = time.perf_counter()
+        for line in lines:
+            level = parse_log_line(line).level
+            levels[level] = levels.get(level, 0) + 1
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f'Líneas parseadas: {total}')
+        self.stdout.write(f'Tiempo: {elapsed:.3f}s')
+        for level, count in sorted(levels.items()):
+            self.stdout.write(f'  {level}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{total / elapsed:,.0f} líneas/segundo' if elapsed else 'Tiempo insuficiente para medir'
+        ))
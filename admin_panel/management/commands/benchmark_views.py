@@ -0,0 +1,133 @@
+"""
+Comando para medir latencia y rendimiento de las vistas principales.
+
+Ejecuta los escenarios de ``admin_panel.benchmarks`` contra la base de
+datos configurada y guarda el informe en JSON para comparar ejecuciones.
+Con ``--seed`` genera antes un conjunto de datos con ``blog.seeding``
+(conviene usar una base de datos dedicada).
+
+Uso:
+    python manage.py benchmark_views
+    python manage.py benchmark_views --seed --posts 100000 --comments 1000000 --tags 10000 --users 50000
+    python manage.py benchmark_views --seed --force   # con DEBUG=False
+    python manage.py benchmark_views --iterations 200 --concurrency 4
+    python manage.py benchmark_views --compare benchmarks/benchmark-20260101-120000.json
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from admin_panel.benchmarks import (
+    DEFAULT_ITERATIONS, DEFAULT_WARMUP, compare_reports, run_benchmarks,
+)
+from admin_panel.stats import invalidate_dashboard_stats
+from blog.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia (p50/p95/p99) y peticiones por segundo de las vistas principales.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                            help=f'Peticiones por escenario ({DEFAULT_ITERATIONS} por defecto).')
+        parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                            help=f'Peticiones de calentamiento ({DEFAULT_WARMUP} por defecto).')
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Hilos que reparten las peticiones (1 por defecto).')
+        parser.add_argument('--only', nargs='+', metavar='ESCENARIO',
+                            help='Ejecutar solo estos escenarios (p. ej. post_list my_posts).')
+        parser.add_argument('--page-cache', action='store_true',
+                            help='Mantener la caché de páginas anónimas activa.')
+        parser.add_argument('--output',
+                            help='Archivo JSON de resultados (por defecto benchmarks/benchmark-<fecha>.json).')
+        parser.add_argument('--compare', help='Informe JSON anterior con el que comparar.')
+
+        seeding = parser.add_argument_group('datos de prueba')
+        seeding.add_argument('--seed', action='store_true',
+                             help='Generar datos antes de medir.')
+        seeding.add_argument('--users', type=int, default=50_000)
+        seeding.add_argument('--categories', type=int, default=50)
+        seeding.add_argument('--tags', type=int, default=10_000)
+        seeding.add_argument('--posts', type=int, default=100_000)
+        seeding.add_argument('--comments', type=int, default=1_000_000)
+        seeding.add_argument('--random-seed', type=int, default=42,
+                             help='Semilla de los datos generados (42 por defecto).')
+        seeding.add_argument('--force', action='store_true',
+                             help='Permitir la generación con DEBUG=False.')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--iterations y --concurrency deben ser positivos.')
+        if options['seed'] and not settings.DEBUG and not options['force']:
+            raise CommandError(
+                'DEBUG=False: usa --force para generar datos de prueba en esta base de datos.'
+            )
+
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING(
+                'DEBUG=True: las consultas se guardan en memoria y los tiempos '
+                'no son representativos de producción.'
+            ))
+
+        previous = None
+        if options['compare']:
+            try:
+                previous = json.loads(Path(options['compare']).read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                raise CommandError(f'No se pudo leer {options["compare"]}: {e}')
+
+        if options['seed']:
+            self.stdout.write('Generando datos de prueba...')
+            created = seed_dataset(
+                users=options['users'], categories=options['categories'], tags=options['tags'],
+                posts=options['posts'], comments=options['comments'], seed=options['random_seed'],
+            )
+            invalidate_dashboard_stats()
+            self.stdout.write(f'Datos generados: {created}')
+
+        report = run_benchmarks(
+            iterations=options['iterations'], warmup=options['warmup'],
+            concurrency=options['concurrency'], only=options['only'],
+            page_cache=options['page_cache'], progress=self.write_result,
+        )
+
+        output = Path(options['output']) if options['output'] else (
+            Path(settings.BASE_DIR) / 'benchmarks'
+            / f'benchmark-{timezone.localtime():%Y%m%d-%H%M%S}.json'
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {output}'))
+
+        if previous is not None:
+            self.write_comparison(compare_reports(previous, report))
+
+    def write_result(self, result):
+        latency = result['latency_ms'] or {}
+        line = (
+            f'{result["name"]:<28} {result["status"]} '
+            f'p50 {latency.get("p50", 0):8.2f} ms  p95 {latency.get("p95", 0):8.2f} ms  '
+            f'p99 {latency.get("p99", 0):8.2f} ms  {result["throughput_rps"] or 0:8.1f} req/s  '
+            f'{result["queries"]:3d} consultas'
+        )
+        if result['errors'] or result['status'] != 200:
+            self.stdout.write(self.style.ERROR(line))
+        else:
+            self.stdout.write(line)
+
+    def write_comparison(self, rows):
+        self.stdout.write('\nComparación con el informe anterior (p50 / p95):')
+        for row in rows:
+            changes = []
+            for metric in ('p50', 'p95'):
+                before, after = row[metric]
+                change = row[f'{metric}_change']
+                changes.append(
+                    f'{metric} {before:.2f} -> {after:.2f} ms'
+                    + (f' ({change:+.1f}%)' if change is not None else '')
+                )
+            self.stdout.write(f'{row["name"]:<28} ' + '  '.join(changes))
@@ -0,0 +1,67 @@
+"""
+Comando para ingerir los logs en el almacén indexado del panel.
+
+Pensado para ejecutarse periódicamente (cron) o en bucle con --follow.
+
+Uso:
+    python manage.py ingest_logs
+    python manage.py ingest_logs --follow 10
+    python manage.py ingest_logs --keep-days 30
+    python manage.py ingest_logs --reset
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.log_store import LogStore
+
+
+class Command(BaseCommand):
+    help = 'Ingiere de forma incremental logs/*.log en el índice SQLite del panel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--follow',
+            type=int,
+            metavar='SEGUNDOS',
+            help='Repetir la ingesta cada N segundos hasta interrumpir el comando.',
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            help='Eliminar del índice las entradas con más de N días.',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Vaciar el índice y volver a ingerir desde el principio.',
+        )
+
+    def handle(self, *args, **options):
+        store = LogStore()
+
+        if options['reset']:
+            store.reset()
+            self.stdout.write('Índice de logs vaciado.')
+
+        while True:
+            ingested = store.ingest()
+            for log_type, count in ingested.items():
+                if count:
+                    self.stdout.write(f'{log_type}: {count} línea(s) nuevas')
+
+            if options['keep_days']:
+                cutoff = datetime.now() - timedelta(days=options['keep_days'])
+                removed = store.prune(cutoff.strftime('%Y-%m-%d %H:%M:%S'))
+                if removed:
+                    self.stdout.write(f'{removed} entrada(s) antiguas eliminadas')
+
+            if not options['follow']:
+                break
+            time.sleep(options['follow'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Ingesta completada: {sum(ingested.values())} línea(s) nuevas.'
+        ))
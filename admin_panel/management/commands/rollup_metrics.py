@@ -0,0 +1,30 @@
+"""
+Comando para actualizar las series temporales de métricas del panel.
+
+Pensado para ejecutarse periódicamente (p. ej. cada hora con cron).
+
+Uso:
+    python manage.py rollup_metrics
+    python manage.py rollup_metrics --full
+"""
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.rollups import run_rollup
+
+
+class Command(BaseCommand):
+    help = 'Materializa por hora y por día las métricas de posts, comentarios, usuarios y vistas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recalcular todo el histórico en lugar de solo desde la última ejecución.',
+        )
+
+    def handle(self, *args, **options):
+        written = run_rollup(full=options['full'])
+        for metric, count in written.items():
+            self.stdout.write(f'{metric}: {count}')
+        self.stdout.write(self.style.SUCCESS('Métricas actualizadas.'))
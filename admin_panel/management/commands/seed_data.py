@@ -0,0 +1,72 @@
+"""
+Comando para generar datos de prueba masivos.
+
+Crea usuarios, categorías, etiquetas, publicaciones con etiquetas y
+comentarios anidados con ``blog.seeding.seed_dataset`` (inserciones por
+lotes, semilla determinista). Los usuarios generados comparten la
+contraseña ``SEED_PASSWORD``. Para obtener un fixture reutilizable basta
+con ``dumpdata`` sobre la base de datos generada.
+
+Uso:
+    python manage.py seed_data
+    python manage.py seed_data --posts 100000 --comments 1000000 --tags 10000 --users 50000
+    python manage.py seed_data --seed 7 --batch-size 10000
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel.stats import invalidate_dashboard_stats
+from blog.seeding import DEFAULT_BATCH_SIZE, SEED_PASSWORD, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Genera usuarios, categorías, etiquetas, posts y comentarios de prueba por lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--tags', type=int, default=500)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Semilla del generador (42 por defecto).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Filas por lote de inserción ({DEFAULT_BATCH_SIZE} por defecto).')
+        parser.add_argument('--force', action='store_true',
+                            help='Permitir la generación con DEBUG=False.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(
+                'DEBUG=False: usa --force para generar datos de prueba en esta base de datos.'
+            )
+        counts = [options[name] for name in ('users', 'categories', 'tags', 'posts', 'comments')]
+        if min(counts) < 0 or options['batch_size'] < 1:
+            raise CommandError('Las cantidades no pueden ser negativas y --batch-size debe ser positivo.')
+
+        self.started = time.perf_counter()
+        try:
+            created = seed_dataset(
+                users=options['users'], categories=options['categories'], tags=options['tags'],
+                posts=options['posts'], comments=options['comments'], seed=options['seed'],
+                batch_size=options['batch_size'], progress=self.write_progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        invalidate_dashboard_stats()
+
+        seconds = created.pop('seconds')
+        rows = sum(created.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows} filas generadas en {seconds:.1f} s ({rows / max(seconds, 0.001):.0f} filas/s): '
+            + ', '.join(f'{name}={count}' for name, count in created.items())
+        ))
+        self.stdout.write(f'Contraseña de los usuarios generados: {SEED_PASSWORD}')
+
+    def write_progress(self, label, done, total):
+        percent = done * 100 // total if total else 100
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f'{label:<11} {done:>10}/{total:<10} {percent:3d}%  {elapsed:7.1f} s')
@@ -0,0 +1,107 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupState",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Nombre",
+                    ),
+                ),
+                (
+                    "last_run",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Última ejecución"
+                    ),
+                ),
+                (
+                    "views_total",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Total de vistas"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Estado del rollup",
+                "verbose_name_plural": "Estados del rollup",
+                "db_table": "rollup_state",
+            },
+        ),
+        migrations.CreateModel(
+            name="MetricBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("new_posts", "Posts creados"),
+                            ("publishes", "Posts publicados"),
+                            ("comments", "Comentarios"),
+                            ("registrations", "Registros"),
+                            ("views", "Vistas"),
+                        ],
+                        max_length=20,
+                        verbose_name="Métrica",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hora"), ("day", "Día")],
+                        max_length=5,
+                        verbose_name="Granularidad",
+                    ),
+                ),
+                (
+                    "bucket_start",
+                    models.DateTimeField(verbose_name="Inicio del intervalo"),
+                ),
+                (
+                    "value",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Valor"),
+                ),
+            ],
+            options={
+                "verbose_name": "Intervalo de métrica",
+                "verbose_name_plural": "Intervalos de métricas",
+                "db_table": "metric_buckets",
+                "ordering": ["metric", "granularity", "bucket_start"],
+                "indexes": [
+                    models.Index(
+                        fields=["granularity", "bucket_start"],
+                        name="metric_buck_granula_15fb9f_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="metricbucket",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "granularity", "bucket_start"),
+                name="unique_metric_bucket",
+            ),
+        ),
+    ]
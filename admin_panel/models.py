@@ -0,0 +1,71 @@
+"""
+Modelos del panel de administración.
+
+Series temporales agregadas (rollups) de la actividad del blog, para que
+el panel pueda mostrar meses de historia sin recorrer las tablas de
+publicaciones, comentarios y usuarios.
+"""
+
+from django.db import models
+
+
+class MetricBucket(models.Model):
+    """
+    Valor de una métrica en un intervalo (hora o día) que empieza en
+    ``bucket_start``.
+    """
+    METRIC_CHOICES = [
+        ('new_posts', 'Posts creados'),
+        ('publishes', 'Posts publicados'),
+        ('comments', 'Comentarios'),
+        ('registrations', 'Registros'),
+        ('views', 'Vistas'),
+    ]
+
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hora'),
+        ('day', 'Día'),
+    ]
+
+    metric = models.CharField('Métrica', max_length=20, choices=METRIC_CHOICES)
+    granularity = models.CharField('Granularidad', max_length=5, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField('Inicio del intervalo')
+    value = models.PositiveBigIntegerField('Valor', default=0)
+
+    class Meta:
+        db_table = 'metric_buckets'
+        verbose_name = 'Intervalo de métrica'
+        verbose_name_plural = 'Intervalos de métricas'
+        ordering = ['metric', 'granularity', 'bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'granularity', 'bucket_start'],
+                name='unique_metric_bucket'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
+        ]
+
+    def __str__(self):
+        return f'{self.metric} {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M}: {self.value}'
+
+
+class RollupState(models.Model):
+    """
+    Marca de agua de la última ejecución del rollup.
+
+    ``views_total`` guarda la suma de ``Post.views_count`` en esa ejecución
+    para calcular las vistas nuevas por diferencia.
+    """
+    name = models.CharField('Nombre', max_length=50, primary_key=True)
+    last_run = models.DateTimeField('Última ejecución', null=True, blank=True)
+    views_total = models.PositiveBigIntegerField('Total de vistas', default=0)
+
+    class Meta:
+        db_table = 'rollup_state'
+        verbose_name = 'Estado del rollup'
+        verbose_name_plural = 'Estados del rollup'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,157 @@
+"""
+Rollups de métricas por hora y por día.
+
+``run_rollup`` materializa en ``MetricBucket`` el número de posts creados,
+posts publicados, comentarios y registros de usuarios por hora y por día,
+y las vistas nuevas desde la ejecución anterior.
+
+Es incremental: solo recalcula los intervalos desde el inicio del día (o
+de la hora) de la última ejecución, sustituyendo esos intervalos por
+completo, de modo que altas y bajas recientes quedan reflejadas. Con
+``full=True`` se recalcula todo el histórico.
+
+Las vistas no tienen fecha en la base de datos (solo ``Post.views_count``),
+así que se atribuyen a la hora y al día de la ejecución por diferencia con
+el total anterior; no se pueden reconstruir con ``full=True``.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import MetricBucket, RollupState
+
+STATE_NAME = 'metrics'
+
+TRUNCATES = {
+    'hour': TruncHour,
+    'day': TruncDay,
+}
+
+
+def metric_sources():
+    """Retorna, por métrica, el modelo, el campo de fecha y el filtro a contar."""
+    from blog.models import Post, Comment
+
+    return {
+        'new_posts': (Post, 'created_at', Q()),
+        'publishes': (Post, 'published_at', Q(status='published')),
+        'comments': (Comment, 'created_at', Q()),
+        'registrations': (get_user_model(), 'date_joined', Q()),
+    }
+
+
+def bucket_floor(moment, granularity):
+    """Inicio del intervalo (en la zona horaria actual) que contiene ``moment``."""
+    local = timezone.localtime(moment)
+    if granularity == 'day':
+        return local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return local.replace(minute=0, second=0, microsecond=0)
+
+
+def _rollup_metric(metric, model, field, condition, granularity, since):
+    queryset = model.objects.filter(condition, **{f'{field}__isnull': False})
+    buckets = MetricBucket.objects.filter(metric=metric, granularity=granularity)
+    if since is not None:
+        start = bucket_floor(since, granularity)
+        queryset = queryset.filter(**{f'{field}__gte': start})
+        buckets = buckets.filter(bucket_start__gte=start)
+
+    rows = (
+        queryset.annotate(bucket=TRUNCATES[granularity](field))
+        .order_by()
+        .values('bucket')
+        .annotate(total=Count('pk'))
+    )
+    new_buckets = [
+        MetricBucket(metric=metric, granularity=granularity,
+                     bucket_start=row['bucket'], value=row['total'])
+        for row in rows
+    ]
+    buckets.delete()
+    MetricBucket.objects.bulk_create(new_buckets, batch_size=1000)
+    return len(new_buckets)
+
+
+def _add_views(now, delta):
+    for granularity in TRUNCATES:
+        bucket, _ = MetricBucket.objects.get_or_create(
+            metric='views', granularity=granularity,
+            bucket_start=bucket_floor(now, granularity),
+        )
+        bucket.value += delta
+        bucket.save(update_fields=['value'])
+
+
+def run_rollup(full=False, now=None):
+    """
+    Actualiza los intervalos de métricas.
+
+    Args:
+        full (bool): Recalcular todo el histórico en lugar de solo lo reciente
+        now (datetime): Momento de la ejecución (ahora si es None)
+
+    Returns:
+        dict: Intervalos escritos por métrica y vistas nuevas (``views``)
+    """
+    from blog.models import Post
+
+    now = now or timezone.now()
+    written = {}
+    with transaction.atomic():
+        state, _ = RollupState.objects.select_for_update().get_or_create(name=STATE_NAME)
+        since = None if full else state.last_run
+
+        for metric, (model, field, condition) in metric_sources().items():
+            written[metric] = sum(
+                _rollup_metric(metric, model, field, condition, granularity, since)
+                for granularity in TRUNCATES
+            )
+
+        views_total = Post.objects.aggregate(total=Sum('views_count'))['total'] or 0
+        delta = views_total - state.views_total if state.last_run else 0
+        if delta > 0:
+            _add_views(now, delta)
+        written['views'] = max(delta, 0)
+
+        state.last_run = now
+        state.views_total = views_total
+        state.save()
+    return written
+
+
+def get_series(granularity='day', days=90, now=None):
+    """
+    Retorna las series de todas las métricas para los últimos ``days`` días,
+    con ceros en los intervalos sin actividad.
+
+    Returns:
+        dict: ``labels`` (inicio de cada intervalo) y ``series`` (lista de
+              valores por métrica, alineada con ``labels``)
+    """
+    now = now or timezone.now()
+    if granularity == 'day':
+        first_day = timezone.localdate(now) - timedelta(days=days - 1)
+        labels = [
+            timezone.make_aware(datetime.combine(first_day + timedelta(days=offset), time.min))
+            for offset in range(days)
+        ]
+    else:
+        last_hour = bucket_floor(now, 'hour')
+        labels = [last_hour - timedelta(hours=offset) for offset in reversed(range(days * 24))]
+    start = labels[0]
+
+    index = {label: position for position, label in enumerate(labels)}
+    series = {metric: [0] * len(labels) for metric, _ in MetricBucket.METRIC_CHOICES}
+    buckets = MetricBucket.objects.filter(
+        granularity=granularity, bucket_start__gte=start
+    ).values_list('metric', 'bucket_start', 'value')
+    for metric, bucket_start, value in buckets:
+        position = index.get(bucket_floor(bucket_start, granularity))
+        if position is not None and metric in series:
+            series[metric][position] = value
+    return {'labels': labels, 'series': series}
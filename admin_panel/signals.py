@@ -0,0 +1,37 @@
+"""
+Señales del panel de administración.
+
+Invalidan las estadísticas cacheadas del dashboard cuando se crean,
+modifican o eliminan los objetos que cuenta.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from blog.models import Post, Comment, Category, Tag
+from .stats import invalidate_dashboard_stats
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_stats_on_user_change(sender, update_fields=None, **kwargs):
+    """Invalida las estadísticas salvo en la actualización de ``last_login``."""
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_stats_on_content_change(sender, **kwargs):
+    """Invalida las estadísticas cuando cambia el contenido del blog."""
+    invalidate_dashboard_stats()
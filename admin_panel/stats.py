@@ -0,0 +1,73 @@
+"""
+Estadísticas agregadas del dashboard de administración.
+
+Cada modelo se resume con una sola consulta de agregación condicional
+(``Count(..., filter=Q(...))``) en lugar de un ``COUNT`` por cifra, y el
+resultado se guarda en la caché por defecto durante unos segundos. Las
+señales de ``admin_panel.signals`` invalidan la entrada cuando cambian
+usuarios, publicaciones, comentarios, categorías o etiquetas.
+
+Configuración (settings.py):
+    DASHBOARD_STATS_TIMEOUT: segundos de vida de la entrada (60 por defecto)
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+DASHBOARD_STATS_CACHE_KEY = 'admin_panel:dashboard_stats'
+DEFAULT_DASHBOARD_STATS_TIMEOUT = 60
+
+
+def build_dashboard_stats():
+    """Calcula las estadísticas del dashboard consultando la base de datos."""
+    from accounts.models import CustomUser
+    from blog.models import Post, Comment, Category, Tag
+
+    week_ago = timezone.now() - timedelta(days=7)
+
+    stats = CustomUser.objects.aggregate(
+        total_users=Count('pk'),
+        active_users=Count('pk', filter=Q(is_active=True)),
+        admins=Count('pk', filter=Q(role='admin')),
+        authors=Count('pk', filter=Q(role='author')),
+        readers=Count('pk', filter=Q(role='reader')),
+        recent_users=Count('pk', filter=Q(date_joined__gte=week_ago)),
+    )
+    stats.update(Post.objects.aggregate(
+        total_posts=Count('pk'),
+        published_posts=Count('pk', filter=Q(status='published')),
+        draft_posts=Count('pk', filter=Q(status='draft')),
+    ))
+    stats.update(Comment.objects.aggregate(
+        total_comments=Count('pk'),
+        approved_comments=Count('pk', filter=Q(is_approved=True)),
+        pending_comments=Count('pk', filter=Q(is_approved=False)),
+    ))
+    stats['total_categories'] = Category.objects.count()
+    stats['total_tags'] = Tag.objects.count()
+    return stats
+
+
+def get_dashboard_stats():
+    """
+    Retorna las estadísticas del dashboard, desde la caché si están disponibles.
+
+    Returns:
+        dict: Totales de usuarios (por rol, activos, recientes), posts (por
+              estado), comentarios (por aprobación), categorías y etiquetas
+    """
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = build_dashboard_stats()
+        timeout = getattr(settings, 'DASHBOARD_STATS_TIMEOUT', DEFAULT_DASHBOARD_STATS_TIMEOUT)
+        cache.set(DASHBOARD_STATS_CACHE_KEY, stats, timeout)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Elimina las estadísticas del dashboard de la caché."""
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
@@ -0,0 +1,825 @@
+"""
+Tests para el panel de administración.
+
+Tests de:
+- Estado del sistema
+- Lectura de logs desde el final
+- Descarga de logs en streaming
+- Índice de logs
+- Parser de líneas de log
+- Archivado de logs
+- Estadísticas agregadas del dashboard
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+
+from blog_platform import performance
+from blog_platform.log_handlers import ReopeningRotatingFileHandler
+
+from .log_archive import archive_log, list_archives
+from .log_download import UnsatisfiableRange, parse_range
+from blog.models import Category, Post
+from blog.seeding import seed_dataset
+
+from .log_parser import parse_log_line
+from .log_store import LogStore
+from .models import MetricBucket
+from .rollups import get_series, run_rollup
+from .stats import get_dashboard_stats
+from .log_reader import (
+    LogPosition, decode_position, encode_position, iter_log_lines, reverse_lines,
+)
+
+User = get_user_model()
+
+
+class SystemStatusTestCase(TestCase):
+    """Tests para la vista de estado del sistema."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+    
+    def test_cache_health_check(self):
+        """Test que el estado del sistema comprueba la caché."""
+        response = self.client.get(reverse('admin_panel:system_status'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['cache_status']['ok'])
+        self.assertEqual(
+            response.context['cache_status']['backend'],
+            settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1]
+        )
+
+
+class LogReaderTestCase(TestCase):
+    """Tests para la lectura de logs desde el final."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logs_dir = Path(self.tmp.name) / 'logs'
+        self.logs_dir.mkdir()
+        self.log_path = self.logs_dir / 'general.log'
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write_lines(self, path, lines):
+        path.write_text(''.join(f'{line}\n' for line in lines), encoding='utf-8')
+    
+    def test_reverse_lines_across_blocks(self):
+        """Test que las líneas se leen en orden inverso con bloques pequeños."""
+        lines = [f'linea {i} ' + 'x' * (i % 7) for i in range(200)]
+        self.write_lines(self.log_path, lines)
+        
+        result = [
+            line.decode() for _, line in reverse_lines(self.log_path, block_size=16)
+            if line
+        ]
+        self.assertEqual(result, list(reversed(lines)))
+    
+    def test_reverse_lines_offsets(self):
+        """Test que cada offset apunta al inicio de su línea."""
+        self.log_path.write_bytes(b'uno\ndos\ntres')
+        data = self.log_path.read_bytes()
+        
+        for offset, line in reverse_lines(self.log_path, block_size=3):
+            self.assertEqual(data[offset:offset + len(line)], line)
+    
+    def test_iter_log_lines_includes_backups(self):
+        """Test que se continúa por los backups rotados en orden."""
+        self.write_lines(self.log_path, ['nueva 1', 'nueva 2'])
+        self.write_lines(self.logs_dir / 'general.log.1', ['media 1', 'media 2'])
+        self.write_lines(self.logs_dir / 'general.log.2', ['vieja 1'])
+        
+        lines = [line for _, line in iter_log_lines(self.log_path)]
+        self.assertEqual(
+            lines, ['nueva 2', 'nueva 1', 'media 2', 'media 1', 'vieja 1']
+        )
+    
+    def test_iter_log_lines_resumes_before_position(self):
+        """Test que se puede continuar hacia atrás desde una posición."""
+        self.write_lines(self.log_path, ['a', 'b', 'c'])
+        self.write_lines(self.logs_dir / 'general.log.1', ['z'])
+        
+        positions = list(iter_log_lines(self.log_path))
+        before = positions[1][0]
+        
+        remaining = [line for _, line in iter_log_lines(self.log_path, before=before)]
+        self.assertEqual(remaining, ['a', 'z'])
+    
+    def test_position_round_trip(self):
+        """Test que las posiciones se serializan para la query string."""
+        position = LogPosition(2, 1024)
+        self.assertEqual(decode_position(encode_position(position)), position)
+        self.assertIsNone(decode_position('basura'))
+        self.assertIsNone(decode_position('-1:5'))
+    
+    def test_view_logs_pages_back_into_backups(self):
+        """Test que el visualizador muestra ventanas más antiguas."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.force_login(admin)
+        self.write_lines(
+            self.log_path,
+            [f'[INFO] 2026-01-09 20:00:00,000 views 1 2 activa {i}' for i in range(300)]
+        )
+        self.write_lines(
+            self.logs_dir / 'general.log.1',
+            [f'[ERROR] 2026-01-08 20:00:00,000 views 1 2 rotada {i}' for i in range(300)]
+        )
+        
+        with override_settings(BASE_DIR=Path(self.tmp.name)):
+            response = self.client.get(reverse('admin_panel:logs'))
+            self.assertEqual(response.context['log_stats']['total'], 500)
+            self.assertEqual(response.context['log_stats']['error'], 200)
+            self.assertEqual(
+                response.context['log_entries'][0].message, 'activa 299'
+            )
+            older_cursor = response.context['older_cursor']
+            self.assertTrue(older_cursor)
+            
+            response = self.client.get(
+                reverse('admin_panel:logs'), {'before': older_cursor}
+            )
+            self.assertEqual(response.context['log_stats']['total'], 100)
+            self.assertEqual(
+                response.context['log_entries'][0].message, 'rotada 99'
+            )
+            self.assertEqual(response.context['older_cursor'], '')
+
+
+class LogDownloadTestCase(TestCase):
+    """Tests para la descarga de logs en streaming."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmp = tempfile.TemporaryDirectory()
+        logs_dir = Path(self.tmp.name) / 'logs'
+        logs_dir.mkdir()
+        (logs_dir / 'general.log').write_bytes(b'0123456789')
+        (logs_dir / 'general.log.1').write_bytes(b'abcde')
+        
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.force_login(admin)
+        self.url = reverse('admin_panel:download_log', args=['general'])
+        self.settings_override = override_settings(BASE_DIR=Path(self.tmp.name))
+        self.settings_override.enable()
+    
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmp.cleanup()
+    
+    def test_parse_range(self):
+        """Test de interpretación de la cabecera Range."""
+        self.assertEqual(parse_range('bytes=2-5', 10), (2, 5))
+        self.assertEqual(parse_range('bytes=4-', 10), (4, 9))
+        self.assertEqual(parse_range('bytes=-3', 10), (7, 9))
+        self.assertEqual(parse_range('bytes=8-100', 10), (8, 9))
+        self.assertIsNone(parse_range('', 10))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+        with self.assertRaises(UnsatisfiableRange):
+            parse_range('bytes=10-', 10)
+    
+    def test_download_streams_file(self):
+        """Test que la descarga completa se envía en streaming."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+    
+    def test_download_range(self):
+        """Test que se respeta la cabecera Range."""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=3-6')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 3-6/10')
+        self.assertEqual(b''.join(response.streaming_content), b'3456')
+        
+        response = self.client.get(self.url, HTTP_RANGE='bytes=50-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+    
+    def test_download_with_backups_range(self):
+        """Test que los backups se concatenan en orden cronológico."""
+        response = self.client.get(self.url, {'backups': '1'}, HTTP_RANGE='bytes=3-7')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 3-7/15')
+        self.assertEqual(b''.join(response.streaming_content), b'de012')
+    
+    def test_download_gzip(self):
+        """Test que la compresión gzip se aplica al vuelo."""
+        response = self.client.get(self.url, {'backups': '1', 'gzip': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.gz', response['Content-Disposition'])
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(content, b'abcde0123456789')
+
+
+def log_line(level, message, module='views', timestamp='2026-01-09 20:00:00,000'):
+    return f'[{level}] {timestamp} {module} 100 200 {message}\n'
+
+
+class LogStoreTestCase(TestCase):
+    """Tests para el índice SQLite de logs."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logs_dir = Path(self.tmp.name) / 'logs'
+        self.logs_dir.mkdir()
+        self.log_path = self.logs_dir / 'general.log'
+        self.store = LogStore(path=Path(self.tmp.name) / 'index.sqlite3', logs_dir=self.logs_dir)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def append(self, text, path=None):
+        with open(path or self.log_path, 'a', encoding='utf-8') as f:
+            f.write(text)
+    
+    def messages(self, **filters):
+        return [e['message'] for e in self.store.search('general', **filters)]
+    
+    def test_incremental_ingest(self):
+        """Test que solo se ingieren las líneas nuevas y completas."""
+        self.append(log_line('INFO', 'uno') + log_line('INFO', 'dos'))
+        self.assertEqual(self.store.ingest(), {'general': 2})
+        
+        self.append(log_line('ERROR', 'tres') + '[INFO] 2026-01-09 a medio')
+        self.assertEqual(self.store.ingest(), {'general': 1})
+        self.assertEqual(self.messages(), ['tres', 'dos', 'uno'])
+        
+        self.append(' escribir\n')
+        self.assertEqual(self.store.ingest(), {'general': 1})
+        self.assertEqual(self.store.ingest(), {'general': 0})
+    
+    def test_ingest_follows_rotation(self):
+        """Test que tras una rotación se termina el backup y se sigue con el nuevo."""
+        self.append(log_line('INFO', 'antes'))
+        self.store.ingest()
+        
+        self.append(log_line('INFO', 'sin leer'))
+        os.rename(self.log_path, self.logs_dir / 'general.log.1')
+        self.append(log_line('INFO', 'nuevo'))
+        
+        self.assertEqual(self.store.ingest(), {'general': 2})
+        self.assertEqual(self.messages(), ['nuevo', 'sin leer', 'antes'])
+    
+    def test_first_ingest_reads_backups_with_limit(self):
+        """Test que la primera ingesta recorre los backups sin duplicar al reanudar."""
+        self.append(log_line('INFO', 'viejo 1') + log_line('INFO', 'viejo 2'),
+                    self.logs_dir / 'general.log.1')
+        self.append(log_line('INFO', 'actual'))
+        
+        self.assertEqual(self.store.ingest(max_lines=1), {'general': 1})
+        self.assertEqual(self.store.ingest(max_lines=1), {'general': 1})
+        self.assertEqual(self.store.ingest(), {'general': 1})
+        self.assertEqual(self.messages(), ['actual', 'viejo 2', 'viejo 1'])
+    
+    def test_truncated_log_restarts(self):
+        """Test que un log truncado se vuelve a leer desde el principio."""
+        self.append(log_line('INFO', 'largo' * 10))
+        self.store.ingest()
+        self.log_path.write_text(log_line('INFO', 'corto'), encoding='utf-8')
+        
+        self.assertEqual(self.store.ingest(), {'general': 1})
+    
+    def test_search_filters(self):
+        """Test de filtros por nivel, módulo, fechas y texto."""
+        self.append(
+            log_line('INFO', 'Usuario admin inició sesión', 'auth', '2026-01-08 10:00:00,000') +
+            log_line('ERROR', 'Fallo de conexión', 'db', '2026-01-09 10:00:00,000') +
+            log_line('ERROR', 'Sesión expirada', 'auth', '2026-01-10 10:00:00,000')
+        )
+        self.store.ingest()
+        
+        self.assertEqual(self.messages(level='ERROR', module='auth'), ['Sesión expirada'])
+        self.assertEqual(
+            self.messages(since='2026-01-09 00:00:00', until='2026-01-10 00:00:00'),
+            ['Fallo de conexión']
+        )
+        self.assertEqual(
+            self.messages(query='sesion'),
+            ['Sesión expirada', 'Usuario admin inició sesión']
+        )
+        self.assertEqual(
+            self.store.level_counts('general', module='auth'), {'INFO': 1, 'ERROR': 1}
+        )
+        self.assertEqual(self.store.modules('general'), ['auth', 'db'])
+    
+    def test_prune_keeps_search_index_consistent(self):
+        """Test que al podar se eliminan también las entradas del índice FTS."""
+        self.append(
+            log_line('INFO', 'viejo mensaje', timestamp='2025-01-01 00:00:00,000') +
+            log_line('INFO', 'nuevo mensaje', timestamp='2026-01-01 00:00:00,000')
+        )
+        self.store.ingest()
+        
+        self.assertEqual(self.store.prune('2025-06-01 00:00:00'), 1)
+        self.assertEqual(self.messages(query='mensaje'), ['nuevo mensaje'])
+    
+    def test_level_counts_are_maintained(self):
+        """Test que los totales por nivel se mantienen al ingerir, podar y vaciar."""
+        self.append(
+            log_line('INFO', 'uno', timestamp='2025-01-01 00:00:00,000') +
+            log_line('ERROR', 'dos') + log_line('ERROR', 'tres')
+        )
+        self.store.ingest()
+        self.assertEqual(self.store.level_counts('general'), {'INFO': 1, 'ERROR': 2})
+        self.assertEqual(self.store.level_counts('general', query='tres'), {'ERROR': 1})
+        self.assertEqual(self.store.level_counts('general', module='views', limit=2), {'ERROR': 2})
+        
+        self.store.prune('2025-06-01 00:00:00')
+        self.assertEqual(self.store.level_counts('general'), {'ERROR': 2})
+        self.store.reset('general')
+        self.assertEqual(self.store.level_counts('general'), {})
+    
+    def test_ingest_reads_uncompressed_archive(self):
+        """Test que las líneas pendientes de un log archivado no se pierden."""
+        self.append(log_line('INFO', 'leído'))
+        self.store.ingest()
+        self.append(log_line('INFO', 'pendiente'))
+        os.replace(self.log_path, self.logs_dir / 'general.log.20260101-000000-000000')
+        self.append(log_line('INFO', 'nuevo'))
+        
+        self.assertEqual(self.store.ingest(), {'general': 2})
+        self.assertEqual(self.messages(), ['nuevo', 'pendiente', 'leído'])
+    
+    def test_archive_ingests_before_compressing(self):
+        """Test que archivar un log ingiere sus líneas antes de comprimirlo."""
+        self.append(log_line('INFO', 'leído'))
+        self.store.ingest()
+        self.append(log_line('INFO', 'pendiente'))
+        
+        with override_settings(BASE_DIR=Path(self.tmp.name), LOG_STORE_PATH=str(self.store.path)):
+            archive_log(self.log_path, background=False)
+        self.assertEqual(self.messages(), ['pendiente', 'leído'])
+        self.assertEqual(self.store.ingest(), {'general': 0})
+    
+    def test_search_view_and_command(self):
+        """Test de la vista de búsqueda y del comando de ingesta."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.force_login(admin)
+        self.append(''.join(log_line('WARNING', f'aviso {i}') for i in range(60)))
+        
+        with override_settings(BASE_DIR=Path(self.tmp.name), LOG_STORE_PATH=str(self.store.path)):
+            out = StringIO()
+            call_command('ingest_logs', stdout=out)
+            self.assertIn('general: 60', out.getvalue())
+            
+            response = self.client.get(reverse('admin_panel:search_logs'), {'level': 'WARNING'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['log_stats']['warning'], 60)
+            self.assertEqual(len(response.context['log_entries']), 50)
+            self.assertEqual(response.context['log_entries'][0]['message'], 'aviso 59')
+            
+            response = self.client.get(
+                reverse('admin_panel:search_logs'),
+                {'level': 'WARNING', 'before': response.context['older_cursor']}
+            )
+            self.assertEqual(len(response.context['log_entries']), 10)
+            self.assertEqual(response.context['older_cursor'], '')
+
+
+class LogParserTestCase(TestCase):
+    """Tests para el parser de líneas de log."""
+    
+    def test_parse_verbose_format(self):
+        """Test del formato verbose de settings.LOGGING."""
+        record = parse_log_line(
+            '[ERROR] 2026-01-09 20:00:00,123 views 12345 67890 Fallo al guardar: id 5'
+        )
+        self.assertEqual(record.level, 'ERROR')
+        self.assertEqual(record.timestamp, '2026-01-09 20:00:00,123')
+        self.assertEqual(record.module, 'views')
+        self.assertEqual(record.pid, '12345')
+        self.assertEqual(record.thread, '67890')
+        self.assertEqual(record.message, 'Fallo al guardar: id 5')
+    
+    def test_parse_generate_test_logs_format(self):
+        """Test del formato escrito por generate_test_logs.py."""
+        record = parse_log_line(
+            '[WARNING] 2026-01-09 20:00:00,123 - generate_test_logs '
+            '(Process: 111 Thread: 222) - Cache lleno'
+        )
+        self.assertEqual(record.level, 'WARNING')
+        self.assertEqual(record.module, 'generate_test_logs')
+        self.assertEqual(record.pid, '111')
+        self.assertEqual(record.thread, '222')
+        self.assertEqual(record.message, 'Cache lleno')
+    
+    def test_parse_simple_and_unknown_lines(self):
+        """Test del formato simple y de líneas sin formato."""
+        record = parse_log_line('[INFO] 2026-01-09 20:00:00,123 Servidor iniciado')
+        self.assertEqual(record.level, 'INFO')
+        self.assertEqual(record.module, '')
+        self.assertEqual(record.message, 'Servidor iniciado')
+        
+        line = 'Traceback (most recent call last):'
+        record = parse_log_line(line)
+        self.assertEqual(record.level, 'UNKNOWN')
+        self.assertEqual(record.message, line)
+        self.assertEqual(record.raw, line)
+    
+    def test_benchmark_command(self):
+        """Test que el comando de benchmark informa de las líneas por segundo."""
+        out = StringIO()
+        call_command('benchmark_log_parser', lines=1000, stdout=out)
+        self.assertIn('Líneas parseadas: 1000', out.getvalue())
+        self.assertIn('líneas/segundo', out.getvalue())
+
+
+class LogArchiveTestCase(TestCase):
+    """Tests para el archivado de logs."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logs_dir = Path(self.tmp.name) / 'logs'
+        self.logs_dir.mkdir()
+        self.log_path = self.logs_dir / 'general.log'
+        self.log_path.write_text('contenido antiguo\n', encoding='utf-8')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_archive_renames_and_compresses(self):
+        """Test que el log se renombra y se comprime en segundo plano."""
+        archive_path, thread = archive_log(self.log_path)
+        self.assertFalse(self.log_path.exists())
+        thread.join()
+        
+        archives = list_archives(self.log_path)
+        self.assertEqual(len(archives), 1)
+        self.assertEqual(archives[0].name, f'{archive_path.name}.gz')
+        self.assertFalse(archive_path.exists())
+        with gzip.open(archives[0], 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'contenido antiguo\n')
+    
+    def test_archive_keeps_configured_number(self):
+        """Test que solo se conservan los archivos más recientes."""
+        for i in range(4):
+            self.log_path.write_text(f'log {i}\n', encoding='utf-8')
+            archive_log(self.log_path, keep=2, background=False)
+        
+        archives = list_archives(self.log_path)
+        self.assertEqual(len(archives), 2)
+        with gzip.open(archives[-1], 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'log 3\n')
+    
+    def test_handler_reopens_renamed_file(self):
+        """Test que el handler escribe en un archivo nuevo tras el renombrado."""
+        handler = ReopeningRotatingFileHandler(self.log_path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        test_logger = logging.getLogger('admin_panel.tests.archive')
+        test_logger.addHandler(handler)
+        test_logger.propagate = False
+        try:
+            test_logger.warning('antes')
+            archive_path, _ = archive_log(self.log_path, background=False)
+            test_logger.warning('después')
+        finally:
+            test_logger.removeHandler(handler)
+            handler.close()
+        
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), 'después\n')
+        with gzip.open(f'{archive_path}.gz', 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'contenido antiguo\nantes\n')
+    
+    def test_clear_log_view(self):
+        """Test que la vista de limpieza archiva el log."""
+        admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.force_login(admin)
+        
+        with override_settings(BASE_DIR=Path(self.tmp.name)):
+            response = self.client.post(reverse('admin_panel:clear_log', args=['general']))
+        self.assertTrue(response.json()['success'])
+        for thread in threading.enumerate():
+            if thread.name.startswith('archive-'):
+                thread.join()
+        
+        self.assertEqual(len(list_archives(self.log_path)), 1)
+
+
+class DashboardStatsTestCase(TestCase):
+    """Tests para las estadísticas agregadas del dashboard."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.author = User.objects.create_user(
+            username='autor',
+            email='autor@example.com',
+            password='AutorPass123!',
+            role='author',
+            is_active=False
+        )
+        self.category = Category.objects.create(name='Tecnología')
+        Post.objects.create(
+            title='Publicado', content='Contenido', author=self.author,
+            category=self.category, status='published'
+        )
+        Post.objects.create(
+            title='Borrador', content='Contenido', author=self.author,
+            category=self.category, status='draft'
+        )
+    
+    def test_stats_values(self):
+        """Test que las cifras agregadas coinciden con los datos."""
+        stats = get_dashboard_stats()
+        self.assertEqual(stats['total_users'], 2)
+        self.assertEqual(stats['active_users'], 1)
+        self.assertEqual(stats['admins'], 1)
+        self.assertEqual(stats['authors'], 1)
+        self.assertEqual(stats['readers'], 0)
+        self.assertEqual(stats['recent_users'], 2)
+        self.assertEqual(stats['published_posts'], 1)
+        self.assertEqual(stats['draft_posts'], 1)
+        self.assertEqual(stats['total_comments'], 0)
+        self.assertEqual(stats['total_categories'], 1)
+    
+    def test_stats_use_fixed_queries_and_cache(self):
+        """Test que se usa una consulta por modelo y luego la caché."""
+        with CaptureQueriesContext(connection) as queries:
+            get_dashboard_stats()
+        self.assertEqual(len(queries), 5)
+        
+        with CaptureQueriesContext(connection) as queries:
+            get_dashboard_stats()
+        self.assertEqual(len(queries), 0)
+    
+    def test_stats_invalidated_by_signals(self):
+        """Test que crear contenido invalida las estadísticas."""
+        self.assertEqual(get_dashboard_stats()['total_posts'], 2)
+        Post.objects.create(
+            title='Otro', content='Contenido', author=self.author, category=self.category
+        )
+        self.assertEqual(get_dashboard_stats()['total_posts'], 3)
+    
+    def test_login_does_not_invalidate_stats(self):
+        """Test que actualizar last_login no invalida las estadísticas."""
+        get_dashboard_stats()
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+        with CaptureQueriesContext(connection) as queries:
+            get_dashboard_stats()
+        self.assertEqual(len(queries), 0)
+    
+    def test_dashboard_view(self):
+        """Test que el dashboard muestra las estadísticas agregadas."""
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_panel:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_posts'], 2)
+        self.assertEqual(response.context['pending_comments'], 0)
+
+
+class MetricsRollupTestCase(TestCase):
+    """Tests para los rollups de métricas por hora y por día."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.category = Category.objects.create(name='Tecnología')
+        self.post = Post.objects.create(
+            title='Publicado', content='Contenido', author=self.admin,
+            category=self.category, status='published'
+        )
+        Post.objects.create(
+            title='Borrador', content='Contenido', author=self.admin,
+            category=self.category, status='draft'
+        )
+    
+    def bucket_total(self, metric, granularity='day'):
+        return sum(
+            MetricBucket.objects.filter(metric=metric, granularity=granularity)
+            .values_list('value', flat=True)
+        )
+    
+    def test_rollup_counts(self):
+        """Test que los intervalos coinciden con los datos existentes."""
+        run_rollup()
+        for granularity in ('day', 'hour'):
+            self.assertEqual(self.bucket_total('new_posts', granularity), 2)
+            self.assertEqual(self.bucket_total('publishes', granularity), 1)
+            self.assertEqual(self.bucket_total('registrations', granularity), 1)
+            self.assertEqual(self.bucket_total('comments', granularity), 0)
+    
+    def test_incremental_rollup_replaces_recent_buckets(self):
+        """Test que una nueva ejecución no duplica los intervalos recientes."""
+        run_rollup()
+        Post.objects.create(
+            title='Otro', content='Contenido', author=self.admin, category=self.category
+        )
+        run_rollup()
+        self.assertEqual(self.bucket_total('new_posts'), 3)
+        self.assertEqual(
+            MetricBucket.objects.filter(metric='new_posts', granularity='day').count(), 1
+        )
+    
+    def test_views_attributed_by_delta(self):
+        """Test que las vistas se cuentan por diferencia entre ejecuciones."""
+        Post.objects.filter(pk=self.post.pk).update(views_count=10)
+        self.assertEqual(run_rollup()['views'], 0)
+        
+        Post.objects.filter(pk=self.post.pk).update(views_count=15)
+        self.assertEqual(run_rollup()['views'], 5)
+        self.assertEqual(self.bucket_total('views'), 5)
+        self.assertEqual(self.bucket_total('views', 'hour'), 5)
+    
+    def test_series_zero_filled(self):
+        """Test que las series tienen un valor por intervalo, con ceros."""
+        run_rollup()
+        data = get_series('day', 7)
+        self.assertEqual(len(data['labels']), 7)
+        self.assertEqual(data['series']['new_posts'][-1], 2)
+        self.assertEqual(data['series']['new_posts'][:-1], [0] * 6)
+        
+        data = get_series('hour', 1, now=timezone.now())
+        self.assertEqual(len(data['labels']), 24)
+        self.assertEqual(sum(data['series']['new_posts']), 2)
+    
+    def test_metrics_view(self):
+        """Test que la página de métricas responde para administradores."""
+        run_rollup()
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+        response = self.client.get(reverse('admin_panel:metrics'), {'granularity': 'hour', 'days': 99})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['days'], 14)
+        self.assertEqual(len(response.context['chart_data']['labels']), 14 * 24)
+        self.assertContains(response, 'metrics-data')
+    
+    def test_rollup_command(self):
+        """Test del comando rollup_metrics."""
+        out = StringIO()
+        call_command('rollup_metrics', '--full', stdout=out)
+        self.assertIn('new_posts: 2', out.getvalue())
+        self.assertEqual(self.bucket_total('new_posts'), 2)
+
+
+class PerformancePageTestCase(TestCase):
+    """Tests para las páginas de rendimiento por vista."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        performance.registry.reset()
+        self.addCleanup(performance.registry.reset)
+        User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='AdminPass123!',
+            role='admin',
+            is_active=True
+        )
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+    
+    def test_json_endpoint(self):
+        """Test que el endpoint JSON incluye los percentiles por vista."""
+        self.client.get(reverse('admin_panel:dashboard'))
+        response = self.client.get(reverse('admin_panel:performance_json'))
+        self.assertEqual(response.status_code, 200)
+        views = {view['view']: view for view in response.json()['views']}
+        self.assertIn('admin_panel:dashboard', views)
+        self.assertEqual(
+            set(views['admin_panel:dashboard']['wall_ms']), {'p50', 'p95', 'p99', 'max', 'avg'}
+        )
+    
+    def test_page(self):
+        """Test que la página de rendimiento lista las vistas."""
+        self.client.get(reverse('admin_panel:dashboard'))
+        response = self.client.get(reverse('admin_panel:performance'), {'sort': 'sql_count'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'admin_panel:dashboard')
+    
+    def test_requires_admin(self):
+        """Test que los anónimos no ven las métricas."""
+        self.client.logout()
+        response = self.client.get(reverse('admin_panel:performance_json'))
+        self.assertEqual(response.status_code, 302)
+
+
+class BenchmarkCommandTestCase(TestCase):
+    """Tests para el comando benchmark_views."""
+    
+    def setUp(self):
+        cache.clear()
+        seed_dataset(users=10, categories=2, tags=5, posts=15, comments=40, batch_size=20)
+    
+    def test_command_writes_report(self):
+        """Test que el comando mide todos los escenarios y guarda el JSON."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / 'report.json'
+            out = StringIO()
+            call_command(
+                'benchmark_views', '--iterations', '2', '--warmup', '0',
+                '--output', str(output), stdout=out
+            )
+            report = json.loads(output.read_text(encoding='utf-8'))
+            names = {result['name'] for result in report['results']}
+            self.assertTrue({'post_list', 'post_list?q', 'post_detail', 'my_posts',
+                             'tag_list', 'admin_dashboard', 'view_logs'} <= names)
+            for result in report['results']:
+                self.assertEqual(result['status'], 200, result['name'])
+                self.assertEqual(result['iterations'], 2)
+            self.assertEqual(report['dataset']['posts'], 15)
+            
+            # Comparación con el informe anterior
+            out = StringIO()
+            call_command(
+                'benchmark_views', '--iterations', '1', '--warmup', '0', '--only', 'post_list',
+                '--output', str(Path(tmp) / 'second.json'), '--compare', str(output), stdout=out
+            )
+            self.assertIn('Comparación', out.getvalue())
+    
+    def test_seed_requires_force_without_debug(self):
+        """Test que --seed exige --force con DEBUG=False."""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_views', '--seed', '--posts', '1', stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 15)
+
+
+class SeedDataCommandTestCase(TestCase):
+    """Tests para el comando seed_data."""
+    
+    def test_command(self):
+        """Test que el comando genera los datos y muestra el progreso."""
+        cache.clear()
+        out = StringIO()
+        call_command(
+            'seed_data', '--users', '10', '--categories', '2', '--tags', '5',
+            '--posts', '20', '--comments', '50', '--batch-size', '8', '--force', stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn('comments', output)
+        self.assertIn('100%', output)
+        self.assertEqual(Post.objects.count(), 20)
+        self.assertEqual(get_dashboard_stats()['total_posts'], 20)
+    
+    @override_settings(DEBUG=False)
+    def test_requires_force_without_debug(self):
+        """Test que sin DEBUG hay que confirmar con --force."""
+        with self.assertRaises(CommandError):
+            call_command('seed_data', '--posts', '1', stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 0)
@@ -14,9 +14,17 @@ urlpatterns = [
     
     # Visualización de logs
     path('logs/', views.view_logs, name='logs'),
+    path('logs/search/', views.search_logs, name='search_logs'),
     path('logs/download/<str:log_type>/', views.download_log, name='download_log'),
     path('logs/clear/<str:log_type>/', views.clear_log, name='clear_log'),
     
+    # Métricas históricas
+    path('metrics/', views.metrics, name='metrics'),
+    
+    # Rendimiento por vista
+    path('performance/', views.performance, name='performance'),
+    path('performance/json/', views.performance_json, name='performance_json'),
+    
     # Estado del sistema
     path('system/', views.system_status, name='system_status'),
 ]
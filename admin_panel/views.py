@@ -6,16 +6,48 @@ Solo accesible para usuarios administradores.
 
 import os
 import logging
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime
 from django.shortcuts import render
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
+from django.utils import timezone
 from django.http import JsonResponse, HttpResponse
 from django.core.paginator import Paginator
 from accounts.decorators import admin_required
+from blog.page_cache import get_stats as get_page_cache_stats
+from blog_platform.log_handlers import get_queue_stats as get_log_queue_stats
+from blog_platform.performance import get_stats as get_performance_stats
+from .log_reader import iter_log_lines, encode_position, decode_position
+from .log_archive import archive_log
+from .log_download import log_download_response
+from .log_store import LogStore
+from .models import MetricBucket, RollupState
+from .rollups import STATE_NAME as ROLLUP_STATE_NAME, get_series
+from .stats import get_dashboard_stats
+from .log_parser import LogRecord, parse_log_line
 
 logger = logging.getLogger(__name__)
 
+# Mapeo de tipos de log a archivos
+LOG_FILES = {
+    'general': 'general.log',
+    'error': 'error.log',
+    'security': 'security.log',
+    'database': 'database.log',
+}
+
+# Líneas de log procesadas por cada ventana del visualizador
+LOG_WINDOW_LINES = 500
+
+# Líneas nuevas que cada búsqueda ingiere en el índice antes de consultar
+LOG_STORE_INGEST_PER_REQUEST = 500
+
+# Entradas recorridas como máximo para contar niveles con filtros
+LOG_LEVEL_COUNT_LIMIT = 100000
+LOG_SEARCH_PAGE_SIZE = 50
+
 
 @login_required
 @admin_required
@@ -23,34 +55,13 @@ def admin_dashboard(request):
     """
     Dashboard principal para administradores con estadísticas del sistema.
     """
-    from accounts.models import CustomUser
-    from blog.models import Post, Comment, Category, Tag
-    
-    # Estadísticas de usuarios
-    total_users = CustomUser.objects.count()
-    active_users = CustomUser.objects.filter(is_active=True).count()
-    admins = CustomUser.objects.filter(role='admin').count()
-    authors = CustomUser.objects.filter(role='author').count()
-    readers = CustomUser.objects.filter(role='reader').count()
-    
-    # Estadísticas de contenido
-    total_posts = Post.objects.count()
-    published_posts = Post.objects.filter(status='published').count()
-    draft_posts = Post.objects.filter(status='draft').count()
-    total_comments = Comment.objects.count()
-    approved_comments = Comment.objects.filter(is_approved=True).count()
-    pending_comments = Comment.objects.filter(is_approved=False).count()
-    
-    # Categorías y Tags
-    total_categories = Category.objects.count()
-    total_tags = Tag.objects.count()
+    from blog.models import Post
     
-    # Posts más vistos (top 5)
-    top_posts = Post.published.all().order_by('-views_count')[:5]
+    # Estadísticas de usuarios, contenido, categorías y tags (cacheadas)
+    stats = get_dashboard_stats()
     
-    # Usuarios registrados recientemente (últimos 7 días)
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_users = CustomUser.objects.filter(date_joined__gte=week_ago).count()
+    # Posts más vistos (top 5)
+    top_posts = Post.published.summaries().select_related('author').order_by('-views_count')[:5]
     
     # Logs disponibles
     logs_dir = settings.BASE_DIR / 'logs'
@@ -69,27 +80,84 @@ def admin_dashboard(request):
                 })
     
     context = {
-        'total_users': total_users,
-        'active_users': active_users,
-        'admins': admins,
-        'authors': authors,
-        'readers': readers,
-        'total_posts': total_posts,
-        'published_posts': published_posts,
-        'draft_posts': draft_posts,
-        'total_comments': total_comments,
-        'approved_comments': approved_comments,
-        'pending_comments': pending_comments,
-        'total_categories': total_categories,
-        'total_tags': total_tags,
+        **stats,
         'top_posts': top_posts,
-        'recent_users': recent_users,
         'log_files': log_files,
     }
     
     return render(request, 'admin_panel/dashboard.html', context)
 
 
+@login_required
+@admin_required
+def metrics(request):
+    """
+    Gráficas históricas de actividad a partir de los rollups de métricas.
+    """
+    granularity = request.GET.get('granularity', 'day')
+    if granularity not in ('day', 'hour'):
+        granularity = 'day'
+    try:
+        days = int(request.GET.get('days', 90))
+    except ValueError:
+        days = 90
+    # Las series por hora se limitan a dos semanas
+    days = max(1, min(days, 730 if granularity == 'day' else 14))
+    
+    data = get_series(granularity, days)
+    chart_data = {
+        'labels': [
+            timezone.localtime(label).strftime('%Y-%m-%d' if granularity == 'day' else '%m-%d %H:%M')
+            for label in data['labels']
+        ],
+        'series': [
+            {'metric': metric, 'label': label, 'values': data['series'][metric],
+             'total': sum(data['series'][metric])}
+            for metric, label in MetricBucket.METRIC_CHOICES
+        ],
+    }
+    
+    context = {
+        'granularity': granularity,
+        'days': days,
+        'chart_data': chart_data,
+        'rollup_state': RollupState.objects.filter(name=ROLLUP_STATE_NAME).first(),
+    }
+    
+    return render(request, 'admin_panel/metrics.html', context)
+
+
+@login_required
+@admin_required
+def performance(request):
+    """
+    Percentiles de tiempo, SQL, plantillas y tamaño de respuesta por vista.
+    """
+    stats = get_performance_stats()
+    sort = request.GET.get('sort', 'wall_ms')
+    if sort not in ('wall_ms', 'sql_count', 'sql_ms', 'template_ms', 'response_bytes'):
+        sort = 'wall_ms'
+    # Las vistas más lentas (p95 de la métrica elegida) primero
+    stats['views'].sort(key=lambda view: view[sort]['p95'] or 0, reverse=True)
+    
+    context = {
+        'performance': stats,
+        'sort': sort,
+        'monitor_enabled': getattr(settings, 'PERF_MONITOR_ENABLED', True),
+    }
+    
+    return render(request, 'admin_panel/performance.html', context)
+
+
+@login_required
+@admin_required
+def performance_json(request):
+    """
+    Las mismas métricas de rendimiento en formato JSON.
+    """
+    return JsonResponse(get_performance_stats())
+
+
 @login_required
 @admin_required
 def view_logs(request):
@@ -100,73 +168,72 @@ def view_logs(request):
     search_query = request.GET.get('q', '')
     level_filter = request.GET.get('level', '')
     
-    # Mapeo de tipos de log a archivos
-    log_files = {
-        'general': 'general.log',
-        'error': 'error.log',
-        'security': 'security.log',
-        'database': 'database.log',
-    }
-    
-    log_filename = log_files.get(log_type, 'general.log')
+    log_filename = LOG_FILES.get(log_type, 'general.log')
     log_path = settings.BASE_DIR / 'logs' / log_filename
+    before = decode_position(request.GET.get('before', ''))
     
     log_entries = []
+    older_position = None
+    last_position = None
     
     if log_path.exists():
         try:
-            with open(log_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            # Procesar una ventana de 500 líneas (más recientes primero),
+            # leyendo el archivo y sus backups desde el final
+            lines = iter_log_lines(log_path, before=before)
+            for count, (position, line) in enumerate(lines):
+                if count == LOG_WINDOW_LINES:
+                    # Hay más líneas: la ventana siguiente empieza antes
+                    # de la última procesada
+                    older_position = last_position
+                    break
+                last_position = position
                 
-                # Procesar últimas 500 líneas (más recientes)
-                lines = lines[-500:]
+                # Filtrar por búsqueda
+                if search_query and search_query.lower() not in line.lower():
+                    continue
                 
-                for line in reversed(lines):  # Más recientes primero
-                    line = line.strip()
-                    if not line:
+                # Filtrar por nivel
+                if level_filter:
+                    if f'[{level_filter}]' not in line:
                         continue
-                    
-                    # Filtrar por búsqueda
-                    if search_query and search_query.lower() not in line.lower():
-                        continue
-                    
-                    # Filtrar por nivel
-                    if level_filter:
-                        if f'[{level_filter}]' not in line:
-                            continue
-                    
-                    # Parsear línea de log
-                    entry = parse_log_line(line)
-                    log_entries.append(entry)
+                
+                # Parsear línea de log
+                entry = parse_log_line(line)
+                log_entries.append(entry)
         
         except Exception as e:
             logger.error(f"Error al leer archivo de log {log_filename}: {e}")
-            log_entries.append({
-                'level': 'ERROR',
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'message': f'Error al leer el archivo de log: {str(e)}',
-                'raw': str(e),
-            })
+            log_entries.append(LogRecord(
+                level='ERROR',
+                timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                message=f'Error al leer el archivo de log: {str(e)}',
+                raw=str(e),
+            ))
     else:
-        log_entries.append({
-            'level': 'INFO',
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'message': 'No se encontró el archivo de log. Se creará cuando ocurra el primer evento.',
-            'raw': '',
-        })
+        log_entries.append(LogRecord(
+            level='INFO',
+            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            message='No se encontró el archivo de log. Se creará cuando ocurra el primer evento.',
+        ))
     
     # Paginación
     paginator = Paginator(log_entries, 50)
     page = request.GET.get('page')
     log_entries_page = paginator.get_page(page)
     
-    # Estadísticas de logs
+    # Parámetros a conservar en los enlaces de paginación
+    pagination_query = request.GET.copy()
+    pagination_query.pop('page', None)
+    
+    # Estadísticas de logs (una sola pasada por las entradas)
+    level_counts = Counter(entry.level for entry in log_entries)
     log_stats = {
         'total': len(log_entries),
-        'error': sum(1 for e in log_entries if e['level'] == 'ERROR'),
-        'warning': sum(1 for e in log_entries if e['level'] == 'WARNING'),
-        'info': sum(1 for e in log_entries if e['level'] == 'INFO'),
-        'debug': sum(1 for e in log_entries if e['level'] == 'DEBUG'),
+        'error': level_counts['ERROR'],
+        'warning': level_counts['WARNING'],
+        'info': level_counts['INFO'],
+        'debug': level_counts['DEBUG'],
     }
     
     context = {
@@ -175,26 +242,113 @@ def view_logs(request):
         'search_query': search_query,
         'level_filter': level_filter,
         'log_stats': log_stats,
-        'log_types': log_files.keys(),
+        'log_types': LOG_FILES.keys(),
+        'pagination_query': pagination_query.urlencode(),
+        'is_older_window': before is not None,
+        'older_cursor': encode_position(older_position) if older_position else '',
     }
     
     return render(request, 'admin_panel/logs.html', context)
 
 
+def _log_filter_datetime(value):
+    """Convierte el valor de un input datetime-local al formato de los logs."""
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
 @login_required
 @admin_required
-def download_log(request, log_type):
+def search_logs(request):
     """
-    Descargar archivo de log completo.
+    Búsqueda en el índice de logs por nivel, módulo, rango de fechas y texto.
     """
-    log_files = {
-        'general': 'general.log',
-        'error': 'error.log',
-        'security': 'security.log',
-        'database': 'database.log',
+    log_type = request.GET.get('type', 'general')
+    if log_type not in LOG_FILES:
+        log_type = 'general'
+    level_filter = request.GET.get('level', '')
+    module_filter = request.GET.get('module', '')
+    search_query = request.GET.get('q', '').strip()
+    since = request.GET.get('since', '')
+    until = request.GET.get('until', '')
+    try:
+        before_id = int(request.GET.get('before', ''))
+    except ValueError:
+        before_id = None
+    
+    filters = {
+        'module': module_filter or None,
+        'since': _log_filter_datetime(since),
+        'until': _log_filter_datetime(until),
+        'query': search_query or None,
+    }
+    
+    store = LogStore()
+    log_entries = []
+    level_counts = {}
+    modules = []
+    try:
+        # Ingesta incremental acotada del log mostrado; el grueso lo hace
+        # el comando ingest_logs (cron o --follow)
+        store.ingest(max_lines=LOG_STORE_INGEST_PER_REQUEST, log_types=[log_type])
+        log_entries = store.search(
+            log_type, level=level_filter or None, before_id=before_id,
+            limit=LOG_SEARCH_PAGE_SIZE + 1, **filters
+        )
+        level_counts = store.level_counts(log_type, limit=LOG_LEVEL_COUNT_LIMIT, **filters)
+        modules = store.modules(log_type)
+    except Exception as e:
+        logger.error(f"Error al consultar el índice de logs: {e}")
+        messages.error(request, f'Error al consultar el índice de logs: {str(e)}')
+    
+    older_cursor = ''
+    if len(log_entries) > LOG_SEARCH_PAGE_SIZE:
+        log_entries = log_entries[:LOG_SEARCH_PAGE_SIZE]
+        older_cursor = log_entries[-1]['id']
+    
+    # Parámetros a conservar en los enlaces de paginación
+    pagination_query = request.GET.copy()
+    pagination_query.pop('before', None)
+    
+    context = {
+        'log_type': log_type,
+        'log_types': LOG_FILES.keys(),
+        'log_entries': log_entries,
+        'level_filter': level_filter,
+        'module_filter': module_filter,
+        'search_query': search_query,
+        'since': since,
+        'until': until,
+        'modules': modules,
+        'log_stats': {
+            'total': sum(level_counts.values()),
+            'error': level_counts.get('ERROR', 0),
+            'warning': level_counts.get('WARNING', 0),
+            'info': level_counts.get('INFO', 0),
+            'debug': level_counts.get('DEBUG', 0),
+            # Con filtros solo se cuentan las LOG_LEVEL_COUNT_LIMIT más recientes
+            'truncated': (
+                any(filters.values())
+                and sum(level_counts.values()) >= LOG_LEVEL_COUNT_LIMIT
+            ),
+        },
+        'older_cursor': older_cursor,
+        'is_older_page': before_id is not None,
+        'pagination_query': pagination_query.urlencode(),
     }
     
-    log_filename = log_files.get(log_type)
+    return render(request, 'admin_panel/log_search.html', context)
+
+
+@login_required
+@admin_required
+def download_log(request, log_type):
+    """
+    Descargar archivo de log completo (en streaming, con soporte de Range).
+    """
+    log_filename = LOG_FILES.get(log_type)
     if not log_filename:
         return HttpResponse("Log no encontrado", status=404)
     
@@ -203,11 +357,17 @@ def download_log(request, log_type):
     if not log_path.exists():
         return HttpResponse("Archivo de log no existe", status=404)
     
+    # ?backups=1 concatena los backups rotados; ?gzip=1 comprime al vuelo
+    include_backups = request.GET.get('backups') == '1'
+    compress = request.GET.get('gzip') == '1'
+    if include_backups:
+        log_filename = log_filename.replace('.log', '-completo.log')
+    
     try:
-        with open(log_path, 'rb') as f:
-            response = HttpResponse(f.read(), content_type='text/plain')
-            response['Content-Disposition'] = f'attachment; filename="{log_filename}"'
-            return response
+        return log_download_response(
+            request, log_path, log_filename,
+            include_backups=include_backups, compress=compress
+        )
     except Exception as e:
         logger.error(f"Error al descargar log {log_filename}: {e}")
         return HttpResponse(f"Error al descargar log: {str(e)}", status=500)
@@ -218,18 +378,14 @@ def download_log(request, log_type):
 def clear_log(request, log_type):
     """
     Limpiar un archivo de log específico (requiere confirmación POST).
+    
+    El log se archiva (renombrado + gzip en segundo plano) en lugar de
+    copiarse y truncarse, así la petición no depende del tamaño del archivo.
     """
     if request.method != 'POST':
         return JsonResponse({'error': 'Método no permitido'}, status=405)
     
-    log_files = {
-        'general': 'general.log',
-        'error': 'error.log',
-        'security': 'security.log',
-        'database': 'database.log',
-    }
-    
-    log_filename = log_files.get(log_type)
+    log_filename = LOG_FILES.get(log_type)
     if not log_filename:
         return JsonResponse({'error': 'Log no encontrado'}, status=404)
     
@@ -237,21 +393,14 @@ def clear_log(request, log_type):
     
     try:
         if log_path.exists():
-            # Hacer backup antes de limpiar
-            backup_path = settings.BASE_DIR / 'logs' / f'{log_filename}.backup'
-            with open(log_path, 'r') as f_in:
-                with open(backup_path, 'w') as f_out:
-                    f_out.write(f_in.read())
-            
-            # Limpiar el archivo
-            with open(log_path, 'w') as f:
-                f.write('')
+            # Renombrado atómico; la compresión se hace en segundo plano
+            archive_path, _ = archive_log(log_path)
             
-            logger.info(f"Log {log_filename} limpiado por usuario {request.user.username}")
+            logger.info(f"Log {log_filename} archivado como {archive_path.name} por usuario {request.user.username}")
             
             return JsonResponse({
                 'success': True,
-                'message': f'Log {log_type} limpiado exitosamente. Se creó un backup.'
+                'message': f'Log {log_type} limpiado exitosamente. Se archivó una copia comprimida.'
             })
         else:
             return JsonResponse({
@@ -266,55 +415,43 @@ def clear_log(request, log_type):
         }, status=500)
 
 
-def parse_log_line(line):
+def check_cache():
     """
-    Parsear una línea de log y extraer información relevante.
-    """
-    import re
-    
-    # Formato: [LEVEL] timestamp module message
-    # Ejemplo: [INFO] 2026-01-09 20:00:00,123 module 12345 67890 message
+    Comprueba que la caché por defecto acepte escrituras y lecturas.
     
-    entry = {
-        'level': 'UNKNOWN',
-        'timestamp': '',
-        'module': '',
+    Returns:
+        dict: backend, ubicación, estado ('ok' o mensaje de error) y latencia
+    """
+    import time
+    import uuid
+    from django.core.cache import cache
+    
+    config = settings.CACHES['default']
+    status = {
+        'backend': config['BACKEND'].rsplit('.', 1)[-1],
+        'location': config.get('LOCATION', ''),
+        'ok': False,
         'message': '',
-        'raw': line,
+        'latency_ms': None,
     }
     
-    # Extraer nivel
-    level_match = re.search(r'\[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\]', line)
-    if level_match:
-        entry['level'] = level_match.group(1)
-    
-    # Extraer timestamp (formato: YYYY-MM-DD HH:MM:SS,mmm)
-    timestamp_match = re.search(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})?', line)
-    if timestamp_match:
-        entry['timestamp'] = timestamp_match.group(0)
-    
-    # Extraer módulo
-    module_match = re.search(r'\] \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})? (\w+)', line)
-    if module_match:
-        entry['module'] = module_match.group(1)
-    
-    # Extraer mensaje (después del último número de proceso/thread)
-    message_match = re.search(r'\d+ \d+ (.+)$', line)
-    if message_match:
-        entry['message'] = message_match.group(1)
-    else:
-        # Si no hay proceso/thread, tomar todo después del timestamp
-        parts = line.split('] ', 1)
-        if len(parts) > 1:
-            remaining = parts[1]
-            # Saltar timestamp y módulo
-            message_parts = remaining.split(None, 3)
-            if len(message_parts) > 2:
-                entry['message'] = message_parts[-1]
-            else:
-                entry['message'] = remaining
-    
-    return entry
+    probe_key = f'health:{uuid.uuid4().hex}'
+    start = time.perf_counter()
+    try:
+        cache.set(probe_key, 'ok', 30)
+        value = cache.get(probe_key)
+        cache.delete(probe_key)
+        status['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        if value == 'ok':
+            status['ok'] = True
+            status['message'] = 'Operativa'
+        else:
+            status['message'] = 'La caché no devolvió el valor escrito'
+    except Exception as e:
+        logger.error(f"Error al comprobar la caché: {e}")
+        status['message'] = f'Error: {str(e)}'
+    
+    return status
 
 
 @login_required
@@ -351,10 +488,20 @@ def system_status(request):
             if file.endswith('.log'):
                 total_log_size += os.path.getsize(logs_dir / file)
     
+    # Estado de la caché y métricas de la caché de páginas anónimas
+    cache_status = check_cache()
+    page_cache_stats = get_page_cache_stats()
+    
+    # Colas de los handlers de logging asíncronos
+    log_queue_stats = get_log_queue_stats()
+    
     context = {
         'system_info': system_info,
         'db_status': db_status,
+        'cache_status': cache_status,
         'total_log_size': round(total_log_size / (1024 * 1024), 2),  # MB
+        'page_cache_stats': page_cache_stats,
+        'log_queue_stats': log_queue_stats,
     }
     
     return render(request, 'admin_panel/system_status.html', context)
@@ -4,6 +4,8 @@ Configuración del panel de administración para los modelos del blog.
 
 from django.contrib import admin
 from .models import Category, Tag, Post, Comment
+from .counters import recount_approved_comments
+from .page_cache import invalidate, post_group
 
 
 @admin.register(Category)
@@ -56,12 +58,12 @@ class PostAdmin(admin.ModelAdmin):
             'fields': ('status', 'published_at')
         }),
         ('Estadísticas', {
-            'fields': ('views_count',),
+            'fields': ('views_count', 'approved_comment_count'),
             'classes': ('collapse',)
         }),
     )
     
-    readonly_fields = ['views_count']
+    readonly_fields = ['views_count', 'approved_comment_count']
     
     def save_model(self, request, obj, form, change):
         """Establece el autor automáticamente si es nuevo post."""
@@ -86,12 +88,18 @@ class CommentAdmin(admin.ModelAdmin):
     
     def approve_comments(self, request, queryset):
         """Acción para aprobar comentarios."""
+        post_ids = set(queryset.values_list('post_id', flat=True))
         updated = queryset.update(is_approved=True)
+        recount_approved_comments(post_ids)
+        invalidate(*(post_group(post_id) for post_id in post_ids))
         self.message_user(request, f'{updated} comentario(s) aprobado(s).')
     approve_comments.short_description = 'Aprobar comentarios seleccionados'
     
     def disapprove_comments(self, request, queryset):
         """Acción para desaprobar comentarios."""
+        post_ids = set(queryset.values_list('post_id', flat=True))
         updated = queryset.update(is_approved=False)
+        recount_approved_comments(post_ids)
+        invalidate(*(post_group(post_id) for post_id in post_ids))
         self.message_user(request, f'{updated} comentario(s) desaprobado(s).')
     disapprove_comments.short_description = 'Desaprobar comentarios seleccionados'
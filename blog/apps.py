@@ -1,6 +1,18 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core.signals import request_finished
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .view_counter import view_counter
+
+        # Volcar las visitas pendientes tras enviar la respuesta (si toca)
+        # y al terminar el proceso
+        request_finished.connect(view_counter.flush_if_due, dispatch_uid='blog_view_counter_flush')
+        atexit.register(view_counter.flush)
@@ -0,0 +1,62 @@
+"""
+Recálculo por lotes de columnas derivadas de las publicaciones.
+
+Lo usan ``backfill_reading_time`` y ``render_posts``: recorren los posts
+en orden de clave primaria y reescriben solo las filas cuyo valor
+guardado ya no coincide con el calculado.
+"""
+
+from django.db import connection, transaction
+
+
+def backfill_posts(read, write, compute, post_ids=None, batch_size=1000):
+    """
+    Recalcula columnas de los posts y actualiza las que han cambiado.
+
+    Las filas cambiadas se actualizan con un UPDATE por clave primaria
+    ejecutado con ``executemany``: ``bulk_update`` construye un ``CASE``
+    por fila y es varias veces más lento con cientos de miles de posts.
+    Todo se hace en una transacción.
+
+    Args:
+        read (tuple): Columnas leídas de cada post (además de ``pk``)
+        write (tuple): Columnas que se escriben
+        compute (callable): Recibe los valores de ``read`` y retorna los
+                            nuevos valores de ``write``, o None si la fila
+                            está al día
+        post_ids (iterable): Posts a revisar; todos si es None.
+        batch_size (int): Posts leídos y actualizados por lote
+
+    Returns:
+        int: Número de publicaciones actualizadas.
+    """
+    from .models import Post
+
+    posts = Post.objects.order_by('pk')
+    if post_ids is not None:
+        posts = posts.filter(pk__in=list(post_ids))
+    rows = posts.values_list('pk', *read)
+
+    quote = connection.ops.quote_name
+    assignments = ', '.join(f'{quote(column)} = %s' for column in write)
+    sql = f'UPDATE {quote(Post._meta.db_table)} SET {assignments} WHERE {quote("id")} = %s'
+    updated = 0
+    changed = []
+
+    def flush():
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, changed)
+
+    with transaction.atomic():
+        for pk, *values in rows.iterator(chunk_size=batch_size):
+            new_values = compute(*values)
+            if new_values is not None:
+                changed.append((*new_values, pk))
+            if len(changed) >= batch_size:
+                flush()
+                updated += len(changed)
+                changed = []
+        if changed:
+            flush()
+            updated += len(changed)
+    return updated
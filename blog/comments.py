@@ -0,0 +1,115 @@
+"""
+Carga de comentarios en árbol, paginados por hilo.
+
+Los comentarios raíz aprobados se paginan en SQL (``LIMIT``/``OFFSET``) y
+solo se cargan las respuestas de los hilos de la página, con una consulta
+recursiva (``WITH RECURSIVE``) sobre el índice de ``parent_id``. El coste
+de cada página depende de sus hilos, no del total de comentarios del
+post. El árbol padre/respuestas se arma en memoria, con cualquier
+profundidad de anidamiento; cada comentario recibe los atributos
+``children`` (lista de respuestas) y ``depth``.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Comment
+
+
+def build_comment_tree(comments):
+    """
+    Arma el árbol de comentarios a partir de una lista plana.
+
+    Las respuestas cuyo padre no está en la lista (por ejemplo, porque
+    el padre no está aprobado) se descartan junto con su subárbol.
+
+    Args:
+        comments (iterable): Comentarios ordenados cronológicamente
+
+    Returns:
+        list: Comentarios raíz, cada uno con sus ``children``
+    """
+    by_id = {}
+    for comment in comments:
+        comment.children = []
+        by_id[comment.pk] = comment
+
+    roots = []
+    for comment in by_id.values():
+        if comment.parent_id is None:
+            roots.append(comment)
+        else:
+            parent = by_id.get(comment.parent_id)
+            if parent is not None:
+                parent.children.append(comment)
+
+    # Asignar profundidad recorriendo desde las raíces
+    stack = [(root, 0) for root in roots]
+    while stack:
+        comment, depth = stack.pop()
+        comment.depth = depth
+        stack.extend((child, depth + 1) for child in comment.children)
+
+    return roots
+
+
+def _replies_sql(root_ids):
+    """Subconsulta con los ids de todas las respuestas (a cualquier nivel)."""
+    # Solo (id, parent_id): el recorrido usa el índice de parent_id como
+    # índice cubriente. Filtrar aquí por is_approved obliga a leer cada
+    # fila y SQLite recurre a un filtro de Bloom que recorre la tabla.
+    table = connection.ops.quote_name(Comment._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(root_ids))
+    sql = (
+        f'WITH RECURSIVE thread(id) AS ('
+        f'SELECT id FROM {table} WHERE parent_id IN ({placeholders}) '
+        f'UNION ALL '
+        f'SELECT c.id FROM thread t JOIN {table} c ON c.parent_id = t.id'
+        f') SELECT id FROM thread'
+    )
+    return sql, root_ids
+
+
+def load_replies(roots):
+    """
+    Respuestas aprobadas de los comentarios indicados, en una consulta.
+
+    Incluye respuestas aprobadas cuyo padre no lo está;
+    ``build_comment_tree`` las descarta con su subárbol.
+
+    Returns:
+        list: Respuestas con su usuario, en orden cronológico
+    """
+    root_ids = [root.pk for root in roots]
+    if not root_ids:
+        return []
+    return list(
+        Comment.objects.filter(pk__in=RawSQL(*_replies_sql(root_ids)), is_approved=True)
+        .select_related('user')
+        .order_by('created_at', 'id')
+    )
+
+
+def load_comment_page(post, number, per_page):
+    """
+    Página de hilos de comentarios aprobados de una publicación.
+
+    Args:
+        post: Publicación
+        number: Número de página (como lo recibe ``Paginator.get_page``)
+        per_page (int): Hilos (comentarios raíz) por página
+
+    Returns:
+        Page: Página cuyos elementos son los comentarios raíz ordenados por
+              fecha, con sus respuestas en ``children``
+    """
+    roots = (
+        post.comments.filter(is_approved=True, parent__isnull=True)
+        .select_related('user')
+        .order_by('created_at', 'id')
+    )
+    page = Paginator(roots, per_page).get_page(number)
+    page_roots = list(page.object_list)
+    page.object_list = build_comment_tree(page_roots + load_replies(page_roots))
+    return page
@@ -0,0 +1,49 @@
+"""
+Contadores desnormalizados de las publicaciones.
+
+``Post.approved_comment_count`` guarda el número de comentarios aprobados
+para que los listados no tengan que ejecutar un ``COUNT(*)`` por fila.
+Las señales de ``blog.signals`` lo ajustan en cada alta, baja o cambio de
+aprobación de un comentario; las operaciones masivas (``QuerySet.update``)
+deben llamar a ``recount_approved_comments`` con los posts afectados.
+"""
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def adjust_approved_comment_count(post_id, delta):
+    """Suma ``delta`` al contador de comentarios aprobados de un post."""
+    from .models import Post
+
+    if delta:
+        Post.objects.filter(pk=post_id).update(
+            approved_comment_count=F('approved_comment_count') + delta
+        )
+
+
+def recount_approved_comments(post_ids=None):
+    """
+    Recalcula el contador a partir de la tabla de comentarios.
+
+    Args:
+        post_ids (iterable): Posts a recalcular; todos si es None.
+
+    Returns:
+        int: Número de publicaciones actualizadas.
+    """
+    from .models import Post, Comment
+
+    approved = (
+        Comment.objects.filter(post=OuterRef('pk'), is_approved=True)
+        .order_by()
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    posts = Post.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=list(post_ids))
+    return posts.update(
+        approved_comment_count=Coalesce(Subquery(approved), Value(0))
+    )
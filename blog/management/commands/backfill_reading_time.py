@@ -0,0 +1,36 @@
+"""
+Comando para recalcular las palabras y el tiempo de lectura guardados.
+
+Uso:
+    python manage.py backfill_reading_time
+    python manage.py backfill_reading_time --post 12 --post 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.reading_time import backfill_reading_time
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Post.word_count y Post.reading_time a partir del contenido.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--post',
+            action='append',
+            type=int,
+            dest='post_ids',
+            help='ID de la publicación a recalcular (repetible). Por defecto, todas.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Publicaciones por lote (1000 por defecto).',
+        )
+
+    def handle(self, *args, **options):
+        updated = backfill_reading_time(options['post_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Tiempo de lectura recalculado en {updated} publicación(es).'
+        ))
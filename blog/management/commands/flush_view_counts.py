@@ -0,0 +1,30 @@
+"""
+Comando para volcar el contador de vistas a la base de datos.
+
+Uso:
+    python manage.py flush_view_counts
+
+Las visitas pendientes viven en la caché compartida ``VIEW_COUNT_CACHE``
+(ver ``blog.view_counter``), así que el comando vuelca las de todos los
+workers. Conviene programarlo (por ejemplo, con cron cada minuto) para
+que las visitas no esperen a la siguiente petición cuando no hay tráfico.
+Avisa si esa caché es ``locmem`` (cada proceso tiene la suya y el comando
+no ve las visitas de los workers) o de archivos (``incr`` no atómico).
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.view_counter import backend_warning, view_counter
+
+
+class Command(BaseCommand):
+    help = 'Vuelca a la base de datos las visitas pendientes de todos los workers.'
+
+    def handle(self, *args, **options):
+        warning = backend_warning()
+        if warning:
+            self.stdout.write(self.style.WARNING(warning))
+        updated, views = view_counter.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f'{views} visita(s) volcada(s) en {updated} publicación(es).'
+        ))
@@ -0,0 +1,48 @@
+"""
+Comando para recalcular las publicaciones relacionadas precalculadas.
+
+Sin opciones reconstruye la tabla completa (conviene tras cargas masivas
+o al cambiar los pesos de ``blog.related``); con ``--post`` recalcula
+solo esos posts y las listas de sus vecinos.
+
+Uso:
+    python manage.py rebuild_related_posts
+    python manage.py rebuild_related_posts --post 12 --post 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog import related
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las publicaciones relacionadas de cada post publicado.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--post',
+            action='append',
+            type=int,
+            dest='post_ids',
+            help='ID de la publicación a recalcular (repetible). Por defecto, todas.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Filas por lote de inserción (5000 por defecto).',
+        )
+
+    def handle(self, *args, **options):
+        if options['post_ids']:
+            updated = related.refresh_related_posts(options['post_ids'])
+        else:
+            updated = related.rebuild_related_posts(
+                batch_size=options['batch_size'], progress=self.write_progress,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Publicaciones relacionadas recalculadas: {updated} publicación(es).'
+        ))
+
+    def write_progress(self, done, total):
+        self.stdout.write(f'  {done}/{total}')
@@ -0,0 +1,21 @@
+"""
+Comando para reconstruir el índice de búsqueda full-text de publicaciones.
+
+Uso:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda full-text de las publicaciones.'
+
+    def handle(self, *args, **options):
+        indexed = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice de búsqueda ({search.search_backend()}) reconstruido: '
+            f'{indexed} publicación(es).'
+        ))
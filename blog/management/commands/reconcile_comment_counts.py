@@ -0,0 +1,30 @@
+"""
+Comando para recalcular los contadores de comentarios aprobados.
+
+Uso:
+    python manage.py reconcile_comment_counts
+    python manage.py reconcile_comment_counts --post 12 --post 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog.counters import recount_approved_comments
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Post.approved_comment_count a partir de los comentarios.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--post',
+            action='append',
+            type=int,
+            dest='post_ids',
+            help='ID de la publicación a recalcular (repetible). Por defecto, todas.',
+        )
+
+    def handle(self, *args, **options):
+        updated = recount_approved_comments(options['post_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Contadores de comentarios recalculados en {updated} publicación(es).'
+        ))
@@ -0,0 +1,50 @@
+"""
+Comando para volver a renderizar el HTML guardado de las publicaciones.
+
+Por defecto solo renderiza los posts cuyo hash no coincide con su
+contenido y la versión actual del renderizador.
+
+Uso:
+    python manage.py render_post_content
+    python manage.py render_post_content --force
+    python manage.py render_post_content --post 12 --post 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from blog import page_cache, rendering
+
+
+class Command(BaseCommand):
+    help = 'Vuelve a renderizar Post.content_html cuando cambia el contenido o el renderizador.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--post',
+            action='append',
+            type=int,
+            dest='post_ids',
+            help='ID de la publicación a renderizar (repetible). Por defecto, todas.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Renderizar también las publicaciones que están al día.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Publicaciones por lote (500 por defecto).',
+        )
+
+    def handle(self, *args, **options):
+        rendered = rendering.render_posts(
+            options['post_ids'], force=options['force'], batch_size=options['batch_size'],
+        )
+        if rendered:
+            # Todas las páginas de detalle dependen de TAXONOMY
+            page_cache.invalidate(page_cache.POSTS, page_cache.TAXONOMY)
+        self.stdout.write(self.style.SUCCESS(
+            f'Contenido renderizado (versión {rendering.RENDERER_VERSION}) en {rendered} publicación(es).'
+        ))
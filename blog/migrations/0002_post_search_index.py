@@ -0,0 +1,57 @@
+# Índice full-text de publicaciones (FTS5 en SQLite, tsvector/GIN en PostgreSQL)
+
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, excerpt, content, tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO posts_fts(rowid, title, excerpt, content) "
+    "SELECT id, title, excerpt, content FROM posts",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS posts_fts",
+]
+
+POSTGRESQL_FORWARD = [
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(excerpt, '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(content, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS posts_search_vector_idx "
+    "ON posts USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS posts_search_vector_idx",
+    "ALTER TABLE posts DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(
+                {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD}
+            ),
+            run_for_vendor(
+                {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD}
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_approved_comment_count(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    approved = (
+        Comment.objects.filter(post=OuterRef("pk"), is_approved=True)
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Post.objects.update(
+        approved_comment_count=Coalesce(Subquery(approved), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_post_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="approved_comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Comentarios aprobados"
+            ),
+        ),
+        migrations.RunPython(
+            backfill_approved_comment_count, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:05
+
+from django.db import migrations, models
+
+WORDS_PER_MINUTE = 200
+BATCH_SIZE = 1000
+
+
+def backfill_reading_time(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    sql = (
+        f"UPDATE {quote(Post._meta.db_table)} SET {quote('word_count')} = %s, "
+        f"{quote('reading_time')} = %s WHERE {quote('id')} = %s"
+    )
+    changed = []
+    rows = Post.objects.order_by("pk").values_list("pk", "content")
+    for pk, content in rows.iterator(chunk_size=BATCH_SIZE):
+        words = len(content.split()) if content else 0
+        changed.append((words, max(1, round(words / WORDS_PER_MINUTE)), pk))
+        if len(changed) >= BATCH_SIZE:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, changed)
+            changed = []
+    if changed:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, changed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_post_approved_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(
+                db_index=True,
+                default=1,
+                editable=False,
+                verbose_name="Tiempo de lectura (min)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Palabras"
+            ),
+        ),
+        migrations.RunPython(backfill_reading_time, migrations.RunPython.noop),
+    ]
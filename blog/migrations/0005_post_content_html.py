@@ -0,0 +1,64 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:11
+
+import hashlib
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+
+# Versión del renderizador de blog.rendering al crear la migración
+RENDERER_VERSION = 1
+BATCH_SIZE = 500
+
+
+def render_content(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    sql = (
+        f"UPDATE {quote(Post._meta.db_table)} SET {quote('content_html')} = %s, "
+        f"{quote('content_hash')} = %s WHERE {quote('id')} = %s"
+    )
+    changed = []
+    rows = Post.objects.order_by("pk").values_list("pk", "content")
+    for pk, content in rows.iterator(chunk_size=BATCH_SIZE):
+        digest = hashlib.sha256(f"{RENDERER_VERSION}\n{content}".encode()).hexdigest()
+        changed.append((linebreaks(content, autoescape=True), digest, pk))
+        if len(changed) >= BATCH_SIZE:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, changed)
+            changed = []
+    if changed:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, changed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_post_reading_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=64,
+                verbose_name="Hash del contenido",
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(
+                blank=True,
+                default="",
+                editable=False,
+                verbose_name="Contenido renderizado",
+            ),
+        ),
+        migrations.RunPython(render_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_content_html"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField(verbose_name="Posición")),
+                ("score", models.FloatField(verbose_name="Similitud")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="blog.post",
+                        verbose_name="Publicación",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbor_of",
+                        to="blog.post",
+                        verbose_name="Relacionada",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Publicación relacionada",
+                "verbose_name_plural": "Publicaciones relacionadas",
+                "db_table": "related_posts",
+                "ordering": ["post", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatedpost",
+            constraint=models.UniqueConstraint(
+                fields=("post", "rank"), name="related_posts_post_rank_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_comment_thread_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "term",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="Término"
+                    ),
+                ),
+                ("documents", models.PositiveIntegerField(verbose_name="Documentos")),
+            ],
+            options={
+                "verbose_name": "Término de relacionados",
+                "verbose_name_plural": "Términos de relacionados",
+                "db_table": "related_terms",
+            },
+        ),
+    ]
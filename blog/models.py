@@ -5,11 +5,20 @@ Este módulo contiene los modelos para publicaciones, categorías,
 etiquetas y comentarios del blog.
 """
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.text import slugify
 from django.utils import timezone
 from django.urls import reverse
 from accounts.models import CustomUser
+from .reading_time import reading_stats
+from .rendering import content_hash, rendered_fields
+from .slugs import next_free_slug, slug_base
+
+# Intentos de guardado de un post cuyo slug ocupa otra transacción
+SLUG_SAVE_ATTEMPTS = 5
+
+# Columnas pesadas que los listados de publicaciones no cargan
+SUMMARY_DEFERRED_FIELDS = ('content', 'content_html', 'content_hash')
 
 
 class Category(models.Model):
@@ -61,7 +70,19 @@ class Tag(models.Model):
         super().save(*args, **kwargs)
 
 
-class PublishedManager(models.Manager):
+class PostQuerySet(models.QuerySet):
+    """
+    QuerySet de publicaciones.
+    """
+    def summaries(self):
+        """
+        Solo las columnas de los listados: difiere el cuerpo del post
+        (``SUMMARY_DEFERRED_FIELDS``), que los listados no muestran.
+        """
+        return self.defer(*SUMMARY_DEFERRED_FIELDS)
+
+
+class PublishedManager(models.Manager.from_queryset(PostQuerySet)):
     """
     Manager personalizado para obtener solo publicaciones publicadas.
     """
@@ -104,6 +125,14 @@ class Post(models.Model):
     title = models.CharField('Título', max_length=200, db_index=True)
     slug = models.SlugField('Slug', unique=True, max_length=200, db_index=True)
     content = models.TextField('Contenido')
+    content_html = models.TextField('Contenido renderizado', blank=True, default='', editable=False)
+    content_hash = models.CharField(
+        'Hash del contenido',
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False
+    )
     excerpt = models.TextField('Extracto', max_length=300, blank=True, 
                                help_text='Resumen breve del post')
     featured_image = models.ImageField(
@@ -124,6 +153,18 @@ class Post(models.Model):
     
     # Estadísticas
     views_count = models.PositiveIntegerField('Vistas', default=0)
+    approved_comment_count = models.PositiveIntegerField(
+        'Comentarios aprobados',
+        default=0,
+        editable=False
+    )
+    word_count = models.PositiveIntegerField('Palabras', default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(
+        'Tiempo de lectura (min)',
+        default=1,
+        editable=False,
+        db_index=True
+    )
     
     # Metadatos temporales
     created_at = models.DateTimeField('Fecha de creación', auto_now_add=True, db_index=True)
@@ -131,7 +172,7 @@ class Post(models.Model):
     published_at = models.DateTimeField('Fecha de publicación', null=True, blank=True)
     
     # Managers
-    objects = models.Manager()  # Manager por defecto
+    objects = PostQuerySet.as_manager()  # Manager por defecto
     published = PublishedManager()  # Solo publicados
     
     class Meta:
@@ -149,16 +190,6 @@ class Post(models.Model):
         return self.title
     
     def save(self, *args, **kwargs):
-        # Auto-generar slug si no existe
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Post.objects.filter(slug=slug).exists():
-                slug = f'{base_slug}-{counter}'
-                counter += 1
-            self.slug = slug
-        
         # Establecer fecha de publicación
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
@@ -167,23 +198,43 @@ class Post(models.Model):
         if not self.excerpt and self.content:
             self.excerpt = self.content[:280] + '...' if len(self.content) > 280 else self.content
         
-        super().save(*args, **kwargs)
+        # Palabras, tiempo de lectura y HTML precalculados del contenido
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.word_count, self.reading_time = reading_stats(self.content)
+            derived = {'word_count', 'reading_time'}
+            if self.content_hash != content_hash(self.content):
+                self.content_html, self.content_hash = rendered_fields(self.content)
+                derived |= {'content_html', 'content_hash'}
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *derived}
+        
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+        
+        # Auto-generar slug: siguiente sufijo libre; si otra transacción lo
+        # ocupa antes de guardar, se vuelve a calcular
+        base_slug = slug_base(self.title, self._meta.get_field('slug').max_length)
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            self.slug = next_free_slug(Post, base_slug)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                taken = Post._base_manager.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
     
     def get_absolute_url(self):
         return reverse('post_detail', kwargs={'slug': self.slug})
     
-    @property
-    def reading_time(self):
-        """Calcula el tiempo estimado de lectura en minutos."""
-        words_per_minute = 200
-        word_count = len(self.content.split())
-        minutes = word_count / words_per_minute
-        return max(1, round(minutes))
-    
     @property
     def comment_count(self):
-        """Retorna el número de comentarios aprobados."""
-        return self.comments.filter(is_approved=True).count()
+        """Retorna el número de comentarios aprobados (contador desnormalizado)."""
+        return self.approved_comment_count
 
 
 class Comment(models.Model):
@@ -225,6 +276,8 @@ class Comment(models.Model):
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['post', 'created_at']),
+            # Hilos (comentarios raíz) de un post, paginados por fecha
+            models.Index(fields=['post', 'parent', 'created_at']),
             models.Index(fields=['user']),
         ]
     
@@ -235,3 +288,52 @@ class Comment(models.Model):
     def is_reply(self):
         """Verifica si es una respuesta a otro comentario."""
         return self.parent is not None
+
+
+class RelatedPost(models.Model):
+    """
+    Publicación relacionada precalculada (ver ``blog.related``).
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='related_entries',
+        verbose_name='Publicación'
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='neighbor_of',
+        verbose_name='Relacionada'
+    )
+    rank = models.PositiveSmallIntegerField('Posición')
+    score = models.FloatField('Similitud')
+    
+    class Meta:
+        db_table = 'related_posts'
+        verbose_name = 'Publicación relacionada'
+        verbose_name_plural = 'Publicaciones relacionadas'
+        ordering = ['post', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'rank'], name='related_posts_post_rank_uniq'),
+        ]
+    
+    def __str__(self):
+        return f'{self.post_id} -> {self.related_id} ({self.score:.3f})'
+
+
+class RelatedTerm(models.Model):
+    """
+    Frecuencia de documento de un término (o etiqueta, ``tag:<id>``) del
+    índice de relacionados (ver ``blog.related``).
+    """
+    term = models.CharField('Término', max_length=100, unique=True)
+    documents = models.PositiveIntegerField('Documentos')
+    
+    class Meta:
+        db_table = 'related_terms'
+        verbose_name = 'Término de relacionados'
+        verbose_name_plural = 'Términos de relacionados'
+    
+    def __str__(self):
+        return f'{self.term} ({self.documents})'
@@ -0,0 +1,217 @@
+"""
+Caché de páginas completas para lectores anónimos.
+
+Las vistas públicas (lista y detalle de posts, categorías, etiquetas e
+inicio) generan el mismo HTML para todos los visitantes anónimos. El
+decorador ``cache_anonymous_page`` guarda la respuesta renderizada con
+clave ruta + query string normalizado y la sirve en las siguientes
+peticiones sin tocar el ORM ni las plantillas.
+
+Invalidación por grupos de dependencias: cada entrada guarda la versión
+de los grupos de los que depende (``posts``, ``taxonomy``, ``post:<id>``,
+``category:<id>``) y deja de ser válida cuando alguno cambia de versión.
+Las señales de ``blog.signals`` llaman a ``invalidate`` con los grupos
+afectados por cada cambio.
+
+Configuración (settings.py):
+    PAGE_CACHE_ENABLED: activa la caché (True por defecto)
+    PAGE_CACHE_TIMEOUT: segundos de vida de cada página (600 por defecto)
+"""
+
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+KEY_PREFIX = 'pagecache'
+DEFAULT_PAGE_CACHE_TIMEOUT = 600
+
+# Grupos base de las vistas de listados
+POSTS = 'posts'
+TAXONOMY = 'taxonomy'
+
+# Cabeceras de la respuesta que no se deben almacenar
+EXCLUDED_HEADERS = {'set-cookie', 'vary'}
+
+
+def post_group(post_id):
+    return f'post:{post_id}'
+
+
+def category_group(category_id):
+    return f'category:{category_id}'
+
+
+def _version_key(group):
+    return f'{KEY_PREFIX}:version:{group}'
+
+
+def _page_key(request):
+    """Clave de la página: ruta + parámetros ordenados y no vacíos."""
+    params = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+        if value != ''
+    )
+    url = f'{request.path}?{urlencode(params)}'
+    return f'{KEY_PREFIX}:page:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def invalidate(*groups):
+    """Invalida todas las páginas que dependen de los grupos indicados."""
+    token = time.time_ns()
+    cache.set_many({_version_key(group): token for group in groups}, None)
+    _incr_stat('invalidations', len(groups))
+
+
+def _current_versions(groups):
+    """
+    Versión actual de cada grupo.
+
+    Las versiones que faltan en la caché (nunca creadas o expulsadas) se
+    crean con ``cache.add``: una entrada guarda siempre versiones reales y
+    no puede coincidir con un grupo ausente.
+    """
+    keys = {group: _version_key(group) for group in groups}
+    versions = cache.get_many(list(keys.values()))
+    current = {}
+    for group, key in keys.items():
+        version = versions.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        current[group] = version
+    return current
+
+
+def depends_on(request, *groups):
+    """Declara grupos adicionales de los que depende la página en curso."""
+    # Las versiones se leen al declarar la dependencia (antes de renderizar):
+    # una invalidación concurrente deja la entrada obsoleta, nunca válida
+    if hasattr(request, '_page_cache_groups'):
+        request._page_cache_groups.update(_current_versions(groups))
+
+
+def count_view_on_hit(request, post_id):
+    """Indica que los aciertos de esta página cuentan como visita al post."""
+    request._page_cache_post_id = post_id
+
+
+def _is_cacheable_request(request):
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Sin cookie de sesión el visitante es anónimo sin consultar la BD
+    if settings.SESSION_COOKIE_NAME in request.COOKIES and request.user.is_authenticated:
+        return False
+    # No servir ni guardar páginas mientras haya mensajes flash pendientes
+    return not len(messages.get_messages(request))
+
+
+def _incr_stat(name, delta=1):
+    key = f'{KEY_PREFIX}:stats:{name}'
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, None):
+            cache.incr(key, delta)
+
+
+def get_stats():
+    """
+    Retorna las métricas de la caché de páginas.
+
+    Returns:
+        dict: ``hits``, ``misses``, ``invalidations`` y ``hit_ratio`` (%)
+    """
+    names = ('hits', 'misses', 'invalidations')
+    values = cache.get_many([f'{KEY_PREFIX}:stats:{name}' for name in names])
+    stats = {name: values.get(f'{KEY_PREFIX}:stats:{name}', 0) for name in names}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] * 100 / lookups, 1) if lookups else 0
+    return stats
+
+
+def _get_valid_entry(key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    versions = cache.get_many([_version_key(group) for group in entry['groups']])
+    for group, version in entry['groups'].items():
+        # Una versión ausente (expulsada de la caché) nunca es válida
+        current = versions.get(_version_key(group))
+        if current is None or current != version:
+            return None
+    return entry
+
+
+def _store(key, request, response, groups):
+    entry = {
+        'content': response.content,
+        'status': response.status_code,
+        'headers': {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in EXCLUDED_HEADERS
+        },
+        'groups': groups,
+        'post_id': getattr(request, '_page_cache_post_id', None),
+    }
+    timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_PAGE_CACHE_TIMEOUT)
+    cache.set(key, entry, timeout)
+
+
+def cache_anonymous_page(*groups):
+    """
+    Decorador que cachea la respuesta de una vista para visitantes anónimos.
+
+    Args:
+        *groups: Grupos de dependencias comunes a todas las páginas de la
+                 vista; la vista puede añadir más con ``depends_on``.
+
+    Usage:
+        @cache_anonymous_page(POSTS, TAXONOMY)
+        def category_list(request):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request)
+            entry = _get_valid_entry(key)
+            if entry is not None:
+                _incr_stat('hits')
+                if entry['post_id'] is not None:
+                    from .view_counter import view_counter
+                    view_counter.increment(entry['post_id'])
+                response = HttpResponse(entry['content'], status=entry['status'])
+                for name, value in entry['headers'].items():
+                    response[name] = value
+                response['X-Page-Cache'] = 'HIT'
+                return response
+
+            _incr_stat('misses')
+            request._page_cache_groups = _current_versions(groups)
+            response = view_func(request, *args, **kwargs)
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+                and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+                and not len(messages.get_messages(request))
+            ):
+                _store(key, request, response, request._page_cache_groups)
+            response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
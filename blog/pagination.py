@@ -0,0 +1,210 @@
+"""
+Paginación por cursor (keyset) para listados de publicaciones.
+
+A diferencia de ``django.core.paginator.Paginator``, no ejecuta
+``COUNT(*)`` ni ``OFFSET n``: cada página filtra a partir de los valores
+de ordenación del último elemento visto, de modo que la página 1000
+cuesta lo mismo que la primera (siempre que exista un índice sobre las
+columnas de ordenación).
+
+Los cursores son tokens opacos (JSON en base64 url-safe) que contienen
+la dirección y los valores de ordenación del elemento frontera.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+# Orden de cada opción de ``valid_orders`` con ``id`` como desempate
+KEYSET_ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+    '-views_count': ('-views_count', '-id'),
+    'title': ('title', 'id'),
+    'reading_time': ('reading_time', 'id'),
+}
+
+ESTIMATE_CAP = 1000
+
+
+def _json_default(value):
+    # isoformat completo: DjangoJSONEncoder recorta los microsegundos
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f'Valor no serializable en cursor: {value!r}')
+
+
+class InvalidCursor(ValueError):
+    """El token de cursor no se puede decodificar."""
+
+
+class CursorPage:
+    """
+    Página de resultados obtenida con un ``CursorPaginator``.
+    """
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginador keyset sobre un queryset.
+
+    Args:
+        queryset: QuerySet a paginar
+        per_page (int): Elementos por página
+        ordering (tuple): Campos de ordenación; el último debe ser único
+                          (normalmente ``id``/``-id``)
+        estimate_total (bool): Si es True, calcula ``estimated_total``
+    """
+
+    def __init__(self, queryset, per_page, ordering=KEYSET_ORDERINGS['-created_at'],
+                 estimate_total=False):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.estimate_total = estimate_total
+        self._estimated_total = None
+
+    # Cursores
+
+    def encode_cursor(self, obj, direction):
+        values = [getattr(obj, name) for name in self.fields]
+        payload = json.dumps({'d': direction, 'v': values}, default=_json_default)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload['d'], payload['v']
+            if direction not in ('n', 'p') or len(raw_values) != len(self.fields):
+                raise InvalidCursor(cursor)
+            opts = self.queryset.model._meta
+            values = [
+                opts.get_field(name).to_python(value)
+                for name, value in zip(self.fields, raw_values)
+            ]
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError) as e:
+            raise InvalidCursor(cursor) from e
+        return direction, values
+
+    # Consultas
+
+    def _after(self, values, reverse=False):
+        """Construye el filtro de los elementos posteriores a ``values``."""
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    @staticmethod
+    def _reverse(ordering):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    def get_page(self, cursor=None):
+        """
+        Retorna la página indicada por el cursor (la primera si es None
+        o no es válido).
+        """
+        direction, values = 'n', None
+        if cursor:
+            try:
+                direction, values = self.decode_cursor(cursor)
+            except InvalidCursor:
+                direction, values = 'n', None
+
+        queryset = self.queryset
+        if direction == 'p':
+            queryset = queryset.filter(self._after(values, reverse=True))
+            queryset = queryset.order_by(*self._reverse(self.ordering))
+        else:
+            if values is not None:
+                queryset = queryset.filter(self._after(values))
+            queryset = queryset.order_by(*self.ordering)
+
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+
+        if direction == 'p':
+            items.reverse()
+            has_next = True
+            has_previous = has_more
+        else:
+            has_next = has_more
+            has_previous = values is not None
+
+        next_cursor = previous_cursor = None
+        if items:
+            if has_next:
+                next_cursor = self.encode_cursor(items[-1], 'n')
+            if has_previous:
+                previous_cursor = self.encode_cursor(items[0], 'p')
+
+        return CursorPage(items, self, next_cursor, previous_cursor)
+
+    # Total estimado
+
+    @property
+    def estimated_total(self):
+        """
+        Número aproximado de resultados, o None si no se solicitó.
+
+        En PostgreSQL usa la estimación del planificador (EXPLAIN); en otros
+        motores cuenta como máximo ``ESTIMATE_CAP`` filas.
+        """
+        if not self.estimate_total:
+            return None
+        if self._estimated_total is None:
+            self._estimated_total = self._estimate()
+        return self._estimated_total
+
+    @property
+    def estimate_is_capped(self):
+        return connection.vendor != 'postgresql' and self.estimated_total == ESTIMATE_CAP
+
+    def _estimate(self):
+        queryset = self.queryset.order_by()
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset[:ESTIMATE_CAP].count()
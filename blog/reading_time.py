@@ -0,0 +1,45 @@
+"""
+Palabras y tiempo de lectura precalculados de las publicaciones.
+
+``Post.word_count`` y ``Post.reading_time`` se calculan en ``Post.save``
+para que los listados puedan mostrarlos, ordenar y filtrar por ellos sin
+cargar ni partir ``content``. Las escrituras que no pasan por ``save``
+(``QuerySet.update``, ``bulk_create``) deben usar ``reading_stats`` o
+llamar después a ``backfill_reading_time``.
+"""
+
+from .backfill import backfill_posts
+
+WORDS_PER_MINUTE = 200
+
+
+def reading_stats(text):
+    """
+    Palabras y minutos de lectura de un texto.
+
+    Returns:
+        tuple: ``(palabras, minutos)``; como mínimo un minuto
+    """
+    words = len(text.split()) if text else 0
+    return words, max(1, round(words / WORDS_PER_MINUTE))
+
+
+def backfill_reading_time(post_ids=None, batch_size=1000):
+    """
+    Recalcula las columnas de los posts cuyo valor guardado no coincide.
+
+    Args:
+        post_ids (iterable): Posts a recalcular; todos si es None.
+        batch_size (int): Posts leídos y actualizados por lote
+
+    Returns:
+        int: Número de publicaciones actualizadas.
+    """
+    def compute(content, word_count, reading_time):
+        stats = reading_stats(content)
+        return None if stats == (word_count, reading_time) else stats
+
+    return backfill_posts(
+        ('content', 'word_count', 'reading_time'), ('word_count', 'reading_time'),
+        compute, post_ids=post_ids, batch_size=batch_size,
+    )
@@ -0,0 +1,549 @@
+"""
+Publicaciones relacionadas precalculadas.
+
+Para cada post publicado se guardan en ``RelatedPost`` sus
+``RELATED_POSTS_COUNT`` vecinos más parecidos con su puntuación; la
+página de detalle los lee con una sola consulta sobre el índice único
+``(post, rank)``.
+
+La similitud entre dos posts suma, con los pesos ``*_WEIGHT``:
+
+- Texto: coseno de los vectores TF-IDF del título (que cuenta doble) y
+  del extracto.
+- Etiquetas: coseno de los vectores de etiquetas ponderadas por IDF, de
+  modo que compartir una etiqueta poco usada pesa más que una popular.
+- Categoría: bonificación fija si comparten categoría.
+
+Los vectores son diccionarios dispersos en Python puro. Para no comparar
+todos los pares, los candidatos de cada post salen de listas invertidas
+(término -> posts, etiqueta -> posts) recortadas a los ``MAX_POSTINGS``
+pesos mayores y recorridas solo para los ``MAX_TERMS`` términos más
+pesados del post: el coste crece linealmente con el número de posts.
+Si no hay suficientes candidatos se completa con los posts más recientes
+de la misma categoría.
+
+Mantenimiento:
+
+- ``rebuild_related_posts`` recalcula la tabla completa con el índice de
+  todos los posts (comando ``rebuild_related_posts``; conviene tras
+  cargas masivas) y guarda la frecuencia de documento de cada término y
+  etiqueta en ``RelatedTerm``.
+- ``refresh_related_posts`` recalcula solo los posts indicados: los
+  puntúa contra candidatos leídos de la base de datos (búsqueda
+  full-text de sus términos, posts con sus etiquetas y recientes de su
+  categoría) con el IDF guardado, sin construir el índice completo. Como
+  la similitud es simétrica, los coloca también en las listas de sus
+  vecinos cuando superan al último.
+- Las señales programan ese refresco tras el commit (``schedule_refresh``)
+  cuando cambian el título, el extracto, la categoría, el estado o las
+  etiquetas de un post, o al eliminarlo.
+
+El IDF guardado envejece entre reconstrucciones (los términos nuevos
+cuentan como raros); un ``rebuild_related_posts`` periódico lo pone al día.
+"""
+
+import heapq
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from . import page_cache, search
+
+logger = logging.getLogger(__name__)
+
+RELATED_POSTS_COUNT = 3
+
+# Pesos de cada componente de la similitud (suman 1)
+TEXT_WEIGHT = 0.5
+TAG_WEIGHT = 0.4
+CATEGORY_WEIGHT = 0.1
+
+# Poda de las listas invertidas
+MAX_TERMS = 8
+MAX_POSTINGS = 64
+# Candidatos por vecino que se vuelven a puntuar con la similitud exacta
+RESCORE_FACTOR = 4
+TITLE_REPEAT = 2
+# Campos de Post que alimentan el índice, además de las etiquetas
+INDEXED_FIELDS = ('title', 'excerpt', 'category_id', 'status')
+
+_TOKEN_RE = re.compile(r'[^\W\d_]{3,}')
+
+STOPWORDS = frozenset(
+    'algo ante antes aquí así cada como con contra cual cuando del desde donde '
+    'durante este esta esto estos estas entre era eran esa ese eso fue hay han '
+    'las los más mas muy nos otra otro para pero poco por porque que qué quien '
+    'sea ser será sin sobre son también tan tiene todo todos una uno unos unas '
+    'usted vez and are for from has have its not that the this was were with you your'
+    .split()
+)
+
+
+def tokenize(text):
+    """Términos de un texto en minúsculas, sin palabras vacías."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _term_counts(title, excerpt):
+    return Counter(tokenize(title) * TITLE_REPEAT + tokenize(excerpt or ''))
+
+
+def _normalize(weights):
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {key: weight / norm for key, weight in weights.items()}
+
+
+def _idf(document_frequency, total):
+    return math.log((1 + total) / (1 + document_frequency)) + 1
+
+
+def _dot(left, right):
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(weight * right.get(key, 0.0) for key, weight in left.items())
+
+
+def _post_tags(links):
+    """``post_id -> [tag_id, ...]`` de un queryset de la tabla intermedia."""
+    post_tags = defaultdict(list)
+    for post_id, tag_id in links.values_list('post_id', 'tag_id').iterator():
+        post_tags[post_id].append(tag_id)
+    return post_tags
+
+
+def _term_candidates(published, term):
+    """Ids de los posts publicados más recientes que contienen el término."""
+    backend = search.search_backend()
+    if backend == 'sqlite':
+        # La subconsulta recorre la lista del término en FTS5 de más
+        # reciente a más antigua y se detiene en el límite
+        matches = published.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {search.FTS_TABLE} WHERE {search.FTS_TABLE} MATCH %s '
+            f'ORDER BY rowid DESC LIMIT %s',
+            [f'{{title excerpt}} : "{term}"', MAX_POSTINGS * 2],
+        ))
+    elif backend == 'postgresql':
+        matches = published.extra(
+            where=[f"posts.search_vector @@ plainto_tsquery('{search.PG_SEARCH_CONFIG}', %s)"],
+            params=[term],
+        )
+    else:
+        matches = published.filter(Q(title__icontains=term) | Q(excerpt__icontains=term))
+    return matches.order_by('-id').values_list('id', flat=True)[:MAX_POSTINGS]
+
+
+def _tag_candidates(published, tag_id):
+    """Ids de los posts publicados más recientes con la etiqueta."""
+    from .models import Post
+
+    links = Post.tags.through.objects.filter(tag_id=tag_id).order_by('-post_id')
+    matches = published.filter(pk__in=links.values('post_id')[:MAX_POSTINGS * 2])
+    return matches.order_by('-id').values_list('id', flat=True)[:MAX_POSTINGS]
+
+
+def _tag_term(tag_id):
+    # Las etiquetas comparten tabla de frecuencias con los términos; los
+    # términos son solo letras, así que el prefijo no colisiona
+    return f'tag:{tag_id}'
+
+
+def _document_frequency(keys):
+    from .models import RelatedTerm
+
+    if not keys:
+        return {}
+    return dict(RelatedTerm.objects.filter(term__in=keys).values_list('term', 'documents'))
+
+
+class RelatedIndex:
+    """
+    Vectores e índices invertidos de las publicaciones publicadas.
+
+    Se construye con una lectura de las columnas ligeras de los posts
+    (``title``, ``excerpt``, ``category_id``) y de sus etiquetas: de todos
+    los publicados (``from_database``) o solo de unos posts y sus
+    candidatos (``around``).
+    """
+
+    def __init__(self, documents, post_tags, idf=None, tag_idf=None):
+        """
+        Args:
+            documents (list): Tuplas ``(id, category_id, title, excerpt)``
+                              ordenadas de más reciente a más antigua
+            post_tags (dict): ``post_id -> [tag_id, ...]``
+            idf (dict): IDF de cada término en el corpus completo; si es
+                        None se calcula sobre ``documents``
+            tag_idf (dict): IDF de cada etiqueta, igual que ``idf``
+        """
+        total = len(documents)
+        self.category = {}
+        self.by_category = defaultdict(list)
+        term_counts = {}
+        self.document_frequency = Counter()
+        self.tag_frequency = Counter()
+        for post_id, category_id, title, excerpt in documents:
+            self.category[post_id] = category_id
+            self.by_category[category_id].append(post_id)
+            counts = _term_counts(title, excerpt)
+            term_counts[post_id] = counts
+            self.document_frequency.update(counts.keys())
+            self.tag_frequency.update(set(post_tags.get(post_id, ())))
+
+        if idf is None:
+            idf = {term: _idf(frequency, total) for term, frequency in self.document_frequency.items()}
+        if tag_idf is None:
+            tag_idf = {tag_id: _idf(frequency, total) for tag_id, frequency in self.tag_frequency.items()}
+        self.text = {
+            post_id: _normalize({
+                term: (1 + math.log(count)) * idf[term]
+                for term, count in counts.items()
+            })
+            for post_id, counts in term_counts.items()
+        }
+        self.tags = {
+            post_id: _normalize({
+                tag_id: tag_idf[tag_id]
+                for tag_id in set(post_tags.get(post_id, ()))
+            })
+            for post_id in self.category
+        }
+        self.text_postings = self._postings(self.text)
+        self.tag_postings = self._postings(self.tags)
+
+    @staticmethod
+    def _postings(vectors):
+        postings = defaultdict(list)
+        for post_id, vector in vectors.items():
+            for key, weight in vector.items():
+                postings[key].append((weight, post_id))
+        return {
+            key: heapq.nlargest(MAX_POSTINGS, entries)
+            for key, entries in postings.items()
+        }
+
+    @classmethod
+    def from_database(cls):
+        """Construye el índice a partir de los posts publicados."""
+        from .models import Post
+
+        published = Post.published.order_by('-created_at', '-id')
+        documents = list(published.values_list('id', 'category_id', 'title', 'excerpt'))
+        links = Post.tags.through.objects.filter(post__status='published')
+        return cls(documents, _post_tags(links))
+
+    @classmethod
+    def around(cls, post_ids, extra_ids=()):
+        """
+        Construye un índice con los posts indicados y sus candidatos.
+
+        Los candidatos son los posts publicados más recientes que comparten
+        alguno de los ``MAX_TERMS`` términos más pesados de cada post (según
+        la búsqueda full-text), alguna etiqueta o la categoría. El IDF es el
+        del corpus completo guardado en ``RelatedTerm``, de modo que las
+        puntuaciones son comparables con las de ``rebuild_related_posts``.
+
+        Args:
+            post_ids (iterable): Posts cuyos vecinos se van a calcular
+            extra_ids (iterable): Posts que se incluyen sin buscarles
+                                  candidatos
+        """
+        from .models import Post
+
+        published = Post.published.order_by('-created_at', '-id')
+        columns = ('id', 'category_id', 'title', 'excerpt')
+        targets = list(published.filter(pk__in=post_ids).values_list(*columns))
+        target_ids = {document[0] for document in targets}
+        target_tags = _post_tags(Post.tags.through.objects.filter(post_id__in=target_ids))
+
+        target_counts = [_term_counts(title, excerpt) for _, _, title, excerpt in targets]
+        frequency = _document_frequency({term for counts in target_counts for term in counts})
+        total = published.count()
+        terms = set()
+        for counts in target_counts:
+            weights = {term: (1 + math.log(count)) * _idf(frequency.get(term, 0), total)
+                       for term, count in counts.items()}
+            terms.update(heapq.nlargest(MAX_TERMS, weights, key=weights.get))
+
+        candidates = set(extra_ids)
+        for term in terms:
+            candidates.update(_term_candidates(published, term))
+        for tag_id in {tag_id for tags in target_tags.values() for tag_id in tags}:
+            candidates.update(_tag_candidates(published, tag_id))
+        for category_id in {document[1] for document in targets}:
+            candidates.update(
+                published.filter(category_id=category_id)
+                .values_list('id', flat=True)[:RELATED_POSTS_COUNT + 1]
+            )
+        candidates -= target_ids
+
+        # Todos en orden de recencia (lo usa el relleno por categoría)
+        documents = list(published.filter(pk__in=candidates | target_ids).values_list(*columns))
+        post_tags = _post_tags(Post.tags.through.objects.filter(post_id__in=candidates))
+        post_tags.update(target_tags)
+
+        terms = set()
+        for _, _, title, excerpt in documents:
+            terms.update(_term_counts(title, excerpt))
+        tag_ids = {tag_id for tags in post_tags.values() for tag_id in tags}
+        frequency = _document_frequency(terms | {_tag_term(tag_id) for tag_id in tag_ids})
+        return cls(
+            documents,
+            post_tags,
+            idf={term: _idf(frequency.get(term, 0), total) for term in terms},
+            tag_idf={
+                tag_id: _idf(frequency.get(_tag_term(tag_id), 0), total)
+                for tag_id in tag_ids
+            },
+        )
+
+    def __contains__(self, post_id):
+        return post_id in self.category
+
+    def similarity(self, left, right):
+        """Similitud entre dos posts del índice (simétrica)."""
+        score = (
+            TEXT_WEIGHT * _dot(self.text[left], self.text[right])
+            + TAG_WEIGHT * _dot(self.tags[left], self.tags[right])
+        )
+        if self.category[left] == self.category[right]:
+            score += CATEGORY_WEIGHT
+        return score
+
+    def _accumulate(self, scores, vector, postings, weight, post_id):
+        top = sorted(vector.items(), key=lambda item: item[1], reverse=True)[:MAX_TERMS]
+        for key, value in top:
+            for other_value, other in postings.get(key, ()):
+                if other != post_id:
+                    scores[other] += weight * value * other_value
+
+    def neighbors(self, post_id, count=RELATED_POSTS_COUNT):
+        """
+        Posts más parecidos a ``post_id``.
+
+        Returns:
+            list: Tuplas ``(puntuación, id)`` de mayor a menor
+        """
+        scores = defaultdict(float)
+        self._accumulate(scores, self.text[post_id], self.text_postings, TEXT_WEIGHT, post_id)
+        self._accumulate(scores, self.tags[post_id], self.tag_postings, TAG_WEIGHT, post_id)
+
+        category = self.category[post_id]
+        for other in scores:
+            if self.category[other] == category:
+                scores[other] += CATEGORY_WEIGHT
+        # Completar con los más recientes de la misma categoría
+        if len(scores) < count:
+            for other in self.by_category[category]:
+                if other != post_id and other not in scores:
+                    scores[other] = CATEGORY_WEIGHT
+                    if len(scores) >= count:
+                        break
+
+        # Las puntuaciones acumuladas son aproximadas (listas podadas): los
+        # mejores candidatos se puntúan de nuevo con la similitud exacta
+        candidates = heapq.nlargest(count * RESCORE_FACTOR, scores, key=scores.get)
+        ranked = sorted(
+            ((self.similarity(post_id, other), other) for other in candidates),
+            key=_rank_key,
+        )
+        return ranked[:count]
+
+
+def _rank_key(entry):
+    # Mayor puntuación primero; a igualdad, el post más reciente
+    score, post_id = entry
+    return -score, -post_id
+
+
+def _insert_sql():
+    from .models import RelatedPost
+
+    quote = connection.ops.quote_name
+    return (
+        f'INSERT INTO {quote(RelatedPost._meta.db_table)} '
+        f'({quote("post_id")}, {quote("related_id")}, {quote("rank")}, {quote("score")}) '
+        f'VALUES (%s, %s, %s, %s)'
+    )
+
+
+def _rows(post_id, ranked):
+    return [(post_id, other, rank, round(score, 6)) for rank, (score, other) in enumerate(ranked)]
+
+
+def rebuild_related_posts(batch_size=5000, progress=None):
+    """
+    Recalcula las publicaciones relacionadas de todos los posts publicados.
+
+    Args:
+        batch_size (int): Filas por lote de inserción
+        progress (callable): ``progress(procesados, total)`` tras cada lote
+
+    Returns:
+        int: Número de publicaciones procesadas.
+    """
+    from .models import RelatedPost, RelatedTerm
+
+    index = RelatedIndex.from_database()
+    sql = _insert_sql()
+    total = len(index.category)
+    max_length = RelatedTerm._meta.get_field('term').max_length
+    with transaction.atomic():
+        RelatedTerm.objects.all().delete()
+        RelatedTerm.objects.bulk_create(
+            (
+                RelatedTerm(term=term, documents=documents)
+                for term, documents in chain(
+                    index.document_frequency.items(),
+                    ((_tag_term(tag_id), n) for tag_id, n in index.tag_frequency.items()),
+                )
+                if len(term) <= max_length
+            ),
+            batch_size=batch_size,
+        )
+        RelatedPost.objects.all().delete()
+        rows = []
+        with connection.cursor() as cursor:
+            for done, post_id in enumerate(index.category, start=1):
+                rows.extend(_rows(post_id, index.neighbors(post_id)))
+                if len(rows) >= batch_size or done == total:
+                    cursor.executemany(sql, rows)
+                    rows = []
+                    if progress:
+                        progress(done, total)
+    # Todas las páginas de detalle dependen de TAXONOMY
+    page_cache.invalidate(page_cache.TAXONOMY)
+    return total
+
+
+def refresh_related_posts(post_ids):
+    """
+    Recalcula los relacionados de los posts indicados y de sus vecinos.
+
+    - Los posts publicados reciben sus vecinos y se insertan en la lista
+      de cada candidato si su similitud supera a la del último (o la
+      lista no está completa); de las listas en las que ya estaban se
+      retiran si dejan de parecerse.
+    - Los que ya no están publicados (o no existen) desaparecen de la
+      tabla.
+    - Las listas que pierden a alguno de los indicados se recalculan.
+
+    Args:
+        post_ids (iterable): Posts a recalcular
+
+    Returns:
+        int: Número de publicaciones cuya lista se ha reescrito.
+    """
+    from .models import Post, RelatedPost
+
+    post_ids = set(post_ids)
+    if not post_ids:
+        return 0
+    changed = set(Post.published.filter(pk__in=post_ids).values_list('id', flat=True))
+    gone = post_ids - changed
+
+    current = defaultdict(list)
+    entries = (
+        RelatedPost.objects.filter(related_id__in=post_ids)
+        .exclude(post_id__in=post_ids)
+        .values_list('post_id', flat=True)
+    )
+    referrers = set(entries)
+    entries = RelatedPost.objects.filter(post_id__in=referrers).values_list('post_id', 'related_id', 'score')
+    for post_id, related_id, score in entries:
+        current[post_id].append((score, related_id))
+
+    # Las listas que apuntaban a un post retirado se recalculan enteras
+    dropped = {post_id for post_id in referrers if any(entry[1] in gone for entry in current[post_id])}
+    index = RelatedIndex.around(changed | dropped, extra_ids=referrers - dropped)
+    lists = {post_id: index.neighbors(post_id) for post_id in changed | dropped if post_id in index}
+
+    # Inserción en las listas de los candidatos (la similitud es simétrica)
+    candidate_ids = set(index.category) - set(lists)
+    entries = (
+        RelatedPost.objects.filter(post_id__in=candidate_ids - referrers)
+        .values_list('post_id', 'related_id', 'score')
+    )
+    for post_id, related_id, score in entries:
+        current[post_id].append((score, related_id))
+    shrunk = set()
+    for post_id in changed & set(lists):
+        for other in candidate_ids:
+            listed = any(entry[1] == post_id for entry in current[other])
+            ranked = [entry for entry in current[other] if entry[1] != post_id]
+            score = index.similarity(other, post_id)
+            if score and (len(ranked) < RELATED_POSTS_COUNT or score > min(ranked)[0]):
+                ranked.append((score, post_id))
+                ranked.sort(key=_rank_key)
+                lists[other] = current[other] = ranked[:RELATED_POSTS_COUNT]
+            elif listed:
+                shrunk.add(other)
+
+    # Las que pierden al post porque ha dejado de parecerse, desde cero
+    if shrunk:
+        index = RelatedIndex.around(shrunk)
+        lists.update((post_id, index.neighbors(post_id)) for post_id in shrunk if post_id in index)
+
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=set(lists) | gone).delete()
+        rows = [row for post_id, ranked in lists.items() for row in _rows(post_id, ranked)]
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(_insert_sql(), rows)
+    if lists:
+        page_cache.invalidate(*(page_cache.post_group(post_id) for post_id in lists))
+    return len(lists)
+
+
+def _refresh_after_commit(post_ids):
+    try:
+        refresh_related_posts(post_ids)
+    except DatabaseError as e:
+        # Se recuperan con el siguiente rebuild_related_posts
+        logger.error(f"Error al refrescar publicaciones relacionadas: {e}")
+
+
+def schedule_refresh(*post_ids):
+    """
+    Refresca los relacionados de los posts indicados al confirmar la
+    transacción en curso (en el acto si no hay ninguna).
+
+    El refresco solo lee los posts afectados y sus candidatos, así que se
+    hace en el mismo hilo: no queda trabajo pendiente en el proceso.
+    """
+    if post_ids:
+        transaction.on_commit(lambda: _refresh_after_commit(post_ids))
+
+
+def get_related_posts(post, count=RELATED_POSTS_COUNT):
+    """
+    Publicaciones relacionadas de ``post`` para mostrar.
+
+    Lee los vecinos precalculados; si el post aún no los tiene (por
+    ejemplo, antes del primer ``rebuild_related_posts``) recurre a los
+    más recientes de su categoría.
+
+    Returns:
+        list: Posts publicados (columnas de listado) en orden de similitud
+    """
+    from .models import Post
+
+    related = list(
+        Post.published.summaries()
+        .filter(neighbor_of__post=post)
+        .order_by('neighbor_of__rank')[:count]
+    )
+    if related:
+        return related
+    return list(
+        Post.published.summaries()
+        .filter(category_id=post.category_id)
+        .exclude(pk=post.pk)[:count]
+    )
@@ -0,0 +1,68 @@
+"""
+Renderizado del contenido de las publicaciones a HTML.
+
+El cuerpo de un post se convierte a HTML una sola vez, en ``Post.save``,
+y se guarda en ``Post.content_html`` junto con ``Post.content_hash``
+(SHA-256 de ``RENDERER_VERSION`` y del contenido). La página de detalle
+sirve el HTML guardado sin volver a procesar el texto.
+
+Al cambiar el renderizador hay que incrementar ``RENDERER_VERSION`` y
+ejecutar ``python manage.py render_post_content``, que vuelve a
+renderizar los posts cuyo hash ya no coincide. Lo mismo tras escrituras
+que no pasan por ``save`` (``QuerySet.update``, ``bulk_create``).
+
+El renderizador actual equivale al filtro ``linebreaks`` de la plantilla:
+escapa el texto y lo divide en párrafos y saltos de línea.
+"""
+
+import hashlib
+
+from django.utils.html import linebreaks
+
+from .backfill import backfill_posts
+
+RENDERER_VERSION = 1
+
+
+def content_hash(content):
+    """Hash del contenido para la versión actual del renderizador."""
+    return hashlib.sha256(f'{RENDERER_VERSION}\n{content}'.encode()).hexdigest()
+
+
+def render_content(content):
+    """Convierte el contenido de un post en HTML seguro."""
+    return linebreaks(content, autoescape=True)
+
+
+def rendered_fields(content):
+    """
+    HTML y hash de un contenido.
+
+    Returns:
+        tuple: ``(content_html, content_hash)``
+    """
+    return render_content(content), content_hash(content)
+
+
+def render_posts(post_ids=None, force=False, batch_size=500):
+    """
+    Vuelve a renderizar los posts cuyo hash no coincide con su contenido.
+
+    Args:
+        post_ids (iterable): Posts a revisar; todos si es None.
+        force (bool): Renderizar también los que están al día
+        batch_size (int): Posts leídos y actualizados por lote
+
+    Returns:
+        int: Número de publicaciones renderizadas.
+    """
+    def compute(content, stored_hash):
+        new_hash = content_hash(content)
+        if force or new_hash != stored_hash:
+            return render_content(content), new_hash
+        return None
+
+    return backfill_posts(
+        ('content', 'content_hash'), ('content_html', 'content_hash'),
+        compute, post_ids=post_ids, batch_size=batch_size,
+    )
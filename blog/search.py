@@ -0,0 +1,128 @@
+"""
+Búsqueda full-text de publicaciones.
+
+Mantiene un índice invertido según el motor de base de datos:
+
+- SQLite: tabla virtual FTS5 ``posts_fts`` (rowid = id del post),
+  sincronizada desde las señales ``post_save``/``post_delete`` de Post.
+- PostgreSQL: columna generada ``posts.search_vector`` (tsvector) con
+  índice GIN; la base de datos la mantiene al día en cada escritura.
+
+En otros motores se recurre a la búsqueda por ``icontains``.
+Los resultados se ordenan por relevancia en la anotación ``search_rank``
+(mayor es más relevante).
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'posts_fts'
+PG_SEARCH_CONFIG = 'spanish'
+
+# Pesos de relevancia: título > extracto > contenido
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_backend():
+    """Retorna el backend de búsqueda disponible para la conexión actual."""
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return connection.vendor
+    return 'basic'
+
+
+def build_fts_query(query):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura.
+
+    Cada palabra se escapa como frase con búsqueda por prefijo, de modo que
+    los operadores de FTS5 escritos por el usuario no rompan la consulta.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_posts(queryset, query):
+    """
+    Filtra un queryset de Post por texto y lo ordena por relevancia.
+
+    Args:
+        queryset: QuerySet de Post a filtrar
+        query (str): Texto introducido por el usuario
+
+    Returns:
+        QuerySet: Posts que coinciden, anotados con ``search_rank``
+    """
+    backend = search_backend()
+
+    if backend == 'sqlite':
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return queryset.none()
+        weights = ', '.join(str(w) for w in SQLITE_WEIGHTS)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = posts.id', f'{FTS_TABLE} MATCH %s'],
+            params=[fts_query],
+            select={'search_rank': f'-bm25({FTS_TABLE}, {weights})'},
+        ).order_by('-search_rank')
+
+    if backend == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{PG_SEARCH_CONFIG}', %s)"
+        return queryset.extra(
+            where=[f'posts.search_vector @@ {tsquery}'],
+            params=[query],
+            select={'search_rank': f'ts_rank(posts.search_vector, {tsquery})'},
+            select_params=[query],
+        ).order_by('-search_rank')
+
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(content__icontains=query) |
+        Q(excerpt__icontains=query)
+    )
+
+
+def index_post(post):
+    """Inserta o actualiza una publicación en el índice FTS5."""
+    if search_backend() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)',
+            [post.pk, post.title, post.excerpt, post.content]
+        )
+
+
+def unindex_post(post_id):
+    """Elimina una publicación del índice FTS5."""
+    if search_backend() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index():
+    """
+    Reconstruye el índice completo a partir de la tabla de posts.
+
+    Returns:
+        int: Número de publicaciones indexadas.
+    """
+    from .models import Post
+
+    backend = search_backend()
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE}(rowid, title, excerpt, content) '
+                f'SELECT id, title, excerpt, content FROM posts'
+            )
+        elif backend == 'postgresql':
+            cursor.execute('REINDEX INDEX posts_search_vector_idx')
+    return Post.objects.count()
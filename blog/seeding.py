@@ -0,0 +1,322 @@
+"""
+Generación masiva de datos de prueba.
+
+``seed_dataset`` crea usuarios, categorías, etiquetas, publicaciones (con
+sus etiquetas) y comentarios por lotes, dentro de una transacción, para
+reproducir volúmenes de producción (cientos de miles de posts, millones
+de comentarios) en minutos:
+
+- Las filas se construyen como tuplas y se insertan con ``executemany``
+  sobre las columnas del modelo, sin instanciar modelos: a esta escala
+  la preparación de cada campo en ``bulk_create`` cuesta más que el
+  propio INSERT.
+- Las claves primarias se asignan explícitamente a partir del máximo
+  actual, de modo que las relaciones (autor, categoría, comentario padre)
+  se resuelven sin leer de vuelta lo insertado.
+- Los nombres únicos (usuarios, correos, slugs, nombres de categorías y
+  etiquetas) llevan una marca de la ejecución (``seed<semilla>``, o
+  ``seed<semilla>r<n>`` si ya está en uso) y el id, de modo que no chocan
+  con filas existentes ni con otra ejecución, sin el bucle de ``Post.save``.
+- Las fechas de creación se reparten en el pasado.
+- Todos los usuarios comparten el mismo hash de contraseña
+  (``SEED_PASSWORD``), calculado una sola vez.
+
+Con la misma semilla y la misma base de datos inicial el resultado es
+idéntico. Al no pasar por el ORM no se disparan señales: al final se
+recalculan los contadores de comentarios, se reconstruyen el índice de
+búsqueda y las publicaciones relacionadas, se actualizan las
+estadísticas del planificador (``ANALYZE``; sin ellas SQLite elige mal
+el orden de la unión con ``posts_fts``) y se invalidan las cachés del
+blog.
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import CustomUser
+from . import page_cache, search
+from .counters import recount_approved_comments
+from .models import Category, Comment, Post, Tag
+from .reading_time import reading_stats
+from .related import rebuild_related_posts
+from .rendering import rendered_fields
+from .sidebar import invalidate_sidebar
+
+SEED_PASSWORD = 'SeedPass123!'
+DEFAULT_BATCH_SIZE = 5000
+
+# Proporciones del conjunto de datos generado
+AUTHOR_RATIO = 0.05
+PUBLISHED_RATIO = 0.85
+APPROVED_RATIO = 0.95
+REPLY_RATIO = 0.3
+MAX_TAGS_PER_POST = 5
+# Comentarios por post que se guardan como posibles padres de respuestas
+REPLY_CANDIDATES = 50
+
+# Días hacia atrás en los que se reparten las publicaciones
+HISTORY_DAYS = 730
+
+WORDS = (
+    'python django blog datos rendimiento consulta índice caché servidor '
+    'base tabla usuario sistema red memoria proceso archivo código prueba '
+    'diseño modelo vista plantilla señal cola registro error búsqueda texto '
+    'página lista detalle comentario etiqueta categoría autor lector tiempo '
+    'semana mes año equipo proyecto versión cambio mejora problema solución '
+    'ejemplo guía tutorial práctica análisis resultado método función clase '
+    'objeto valor campo filtro orden grupo total media escala carga latencia '
+    'seguridad sesión permiso acceso contraseña correo mensaje noticia idea'
+).split()
+
+
+def _next_id(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def _run_token(seed):
+    """
+    Marca de la ejecución que no aparece en ningún nombre existente.
+
+    Todos los nombres generados contienen ``<marca>-``; la primera marca
+    libre para la semilla hace que el resultado siga siendo reproducible.
+    """
+    attempt = 0
+    while True:
+        token = f'seed{seed}' + (f'r{attempt}' if attempt else '')
+        mark = f'{token}-'
+        in_use = (
+            CustomUser.objects.filter(Q(username__contains=mark) | Q(email__contains=mark)).exists()
+            or Category.objects.filter(Q(name__contains=mark) | Q(slug__contains=mark)).exists()
+            or Tag.objects.filter(Q(name__contains=mark) | Q(slug__contains=mark)).exists()
+            or Post.objects.filter(slug__contains=mark).exists()
+        )
+        if not in_use:
+            return token
+        attempt += 1
+
+
+def _skewed(rng, size, power):
+    """Índice en ``range(size)`` sesgado hacia los primeros (popularidad)."""
+    return min(int(size * rng.random() ** power), size - 1)
+
+
+def _text(rng, min_words, max_words):
+    return ' '.join(rng.choices(WORDS, k=rng.randint(min_words, max_words)))
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def _insert_rows(model, fields, rows):
+    """
+    Inserta tuplas de valores ya preparados en la tabla del modelo.
+
+    Args:
+        model: Modelo destino
+        fields (tuple): Nombres (``attname``) de los campos de cada tupla
+        rows (list): Tuplas con los valores en el orden de ``fields``
+    """
+    if not rows:
+        return
+    opts = model._meta
+    columns = ', '.join(
+        connection.ops.quote_name(opts.get_field(name).column) for name in fields
+    )
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f'INSERT INTO {connection.ops.quote_name(opts.db_table)} ({columns}) VALUES ({placeholders})'
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def seed_dataset(users=1000, categories=20, tags=500, posts=5000, comments=20000,
+                 seed=42, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Genera un conjunto de datos de prueba.
+
+    Args:
+        users (int): Usuarios (el primero es administrador, ~5% autores)
+        categories (int): Categorías
+        tags (int): Etiquetas
+        posts (int): Publicaciones (~85% publicadas, 0-5 etiquetas cada una)
+        comments (int): Comentarios (~30% respuestas a otro del mismo post)
+        seed (int): Semilla del generador pseudoaleatorio
+        batch_size (int): Filas por lote de inserción
+        progress (callable): ``progress(modelo, insertados, total)`` tras cada
+                             lote, con el acumulado de filas del modelo
+
+    Returns:
+        dict: Filas creadas por modelo y segundos empleados (``seconds``)
+    """
+    if users < 1 or (posts and not categories):
+        raise ValueError('Se necesita al menos un usuario y una categoría si hay posts')
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    started = time.perf_counter()
+    created = {}
+    # Valores de fecha en el formato de la base de datos
+    adapt = connection.ops.adapt_datetimefield_value
+
+    def report(label, done, total):
+        if progress:
+            progress(label, done, total)
+
+    with transaction.atomic():
+        token = _run_token(seed)
+
+        # Usuarios
+        password = make_password(SEED_PASSWORD)
+        first_user = _next_id(CustomUser)
+        author_ids = []
+        user_fields = (
+            'id', 'username', 'email', 'first_name', 'last_name', 'password', 'role',
+            'is_active', 'is_email_verified', 'is_staff', 'is_superuser', 'date_joined',
+        )
+        for start, end in _chunks(users, batch_size):
+            rows = []
+            for offset in range(start, end):
+                pk = first_user + offset
+                if offset == 0:
+                    role = 'admin'
+                elif rng.random() < AUTHOR_RATIO:
+                    role = 'author'
+                else:
+                    role = 'reader'
+                if role != 'reader':
+                    author_ids.append(pk)
+                rows.append((
+                    pk, f'{token}-user{pk}', f'{token}-user{pk}@example.com',
+                    rng.choice(WORDS).capitalize(), rng.choice(WORDS).capitalize(),
+                    password, role, True, True, role == 'admin', False,
+                    adapt(now - timedelta(days=rng.uniform(0, HISTORY_DAYS))),
+                ))
+            _insert_rows(CustomUser, user_fields, rows)
+            report('users', end, users)
+        user_ids = range(first_user, first_user + users)
+        created['users'] = users
+
+        # Categorías y etiquetas
+        first_category = _next_id(Category)
+        category_date = adapt(now - timedelta(days=HISTORY_DAYS))
+        _insert_rows(Category, ('id', 'name', 'slug', 'description', 'created_at'), [
+            (first_category + offset, f'{rng.choice(WORDS).capitalize()} {token}-{first_category + offset}',
+             f'{token}-categoria-{first_category + offset}', _text(rng, 5, 15), category_date)
+            for offset in range(categories)
+        ])
+        report('categories', categories, categories)
+        created['categories'] = categories
+
+        first_tag = _next_id(Tag)
+        for start, end in _chunks(tags, batch_size):
+            _insert_rows(Tag, ('id', 'name', 'slug'), [
+                (first_tag + offset, f'{rng.choice(WORDS)}-{token}-{first_tag + offset}',
+                 f'{token}-tag-{first_tag + offset}')
+                for offset in range(start, end)
+            ])
+            report('tags', end, tags)
+        created['tags'] = tags
+
+        # Publicaciones y sus etiquetas
+        first_post = _next_id(Post)
+        post_fields = (
+            'id', 'author_id', 'category_id', 'title', 'slug', 'content', 'content_html',
+            'content_hash', 'excerpt', 'featured_image', 'status', 'views_count', 'approved_comment_count',
+            'word_count', 'reading_time', 'created_at', 'updated_at', 'published_at',
+        )
+        post_dates = []
+        post_tags = 0
+        for start, end in _chunks(posts, batch_size):
+            rows, links = [], []
+            for offset in range(start, end):
+                pk = first_post + offset
+                title = _text(rng, 3, 8).capitalize()
+                content = _text(rng, 80, 400)
+                created_at = now - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+                published = rng.random() < PUBLISHED_RATIO
+                post_dates.append(created_at)
+                created_value = adapt(created_at)
+                rows.append((
+                    pk, rng.choice(author_ids), first_category + _skewed(rng, categories, 2),
+                    title, f'{slugify(title)[:170]}-{token}-{pk}', content, *rendered_fields(content),
+                    content[:280] + '...',
+                    '', 'published' if published else 'draft',
+                    min(int(rng.paretovariate(1.2) * 10), 10 ** 6), 0, *reading_stats(content),
+                    created_value, created_value, created_value if published else None,
+                ))
+                if tags:
+                    picked = {
+                        _skewed(rng, tags, 3)
+                        for _ in range(rng.randint(0, MAX_TAGS_PER_POST))
+                    }
+                    links.extend((pk, first_tag + index) for index in sorted(picked))
+            _insert_rows(Post, post_fields, rows)
+            _insert_rows(Post.tags.through, ('post_id', 'tag_id'), links)
+            post_tags += len(links)
+            report('posts', end, posts)
+        created['posts'] = posts
+        created['post_tags'] = post_tags
+
+        # Comentarios, con respuestas dentro del mismo post. De cada post se
+        # guardan como mucho REPLY_CANDIDATES comentarios a los que responder
+        # para acotar la memoria con millones de filas.
+        first_comment = _next_id(Comment)
+        comment_fields = (
+            'id', 'post_id', 'user_id', 'parent_id', 'content', 'is_approved',
+            'created_at', 'updated_at',
+        )
+        threads = {}  # post -> [(id, fecha)] de comentarios a los que responder
+        total_comments = comments if posts else 0
+        for start, end in _chunks(total_comments, batch_size):
+            rows = []
+            for offset in range(start, end):
+                pk = first_comment + offset
+                post_index = _skewed(rng, posts, 2)
+                thread = threads.setdefault(post_index, [])
+                parent_id = None
+                after = post_dates[post_index]
+                if thread and rng.random() < REPLY_RATIO:
+                    parent_id, after = rng.choice(thread)
+                created_at = min(after + timedelta(minutes=rng.uniform(1, 60 * 24 * 7)), now)
+                if len(thread) < REPLY_CANDIDATES:
+                    thread.append((pk, created_at))
+                else:
+                    thread[rng.randrange(REPLY_CANDIDATES)] = (pk, created_at)
+                created_value = adapt(created_at)
+                rows.append((
+                    pk, first_post + post_index, rng.choice(user_ids), parent_id,
+                    _text(rng, 5, 40), rng.random() < APPROVED_RATIO,
+                    created_value, created_value,
+                ))
+            _insert_rows(Comment, comment_fields, rows)
+            report('comments', end, total_comments)
+        created['comments'] = total_comments
+
+        # Secuencias de las claves primarias (PostgreSQL) tras fijar los ids
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [CustomUser, Category, Tag, Post, Comment]):
+                cursor.execute(sql)
+
+        # Estructuras derivadas que normalmente mantienen las señales
+        recount_approved_comments()
+        search.rebuild_index()
+        rebuild_related_posts()
+
+    # Estadísticas del planificador tras la carga masiva
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    invalidate_sidebar()
+    page_cache.invalidate(page_cache.POSTS, page_cache.TAXONOMY)
+    created['seconds'] = round(time.perf_counter() - started, 2)
+    return created
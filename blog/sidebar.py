@@ -0,0 +1,53 @@
+"""
+Caché de los datos del sidebar de la lista de publicaciones.
+
+Las categorías con conteo, las etiquetas populares y las publicaciones
+recientes solo cambian cuando se modifican posts, categorías o etiquetas,
+así que se calculan una vez y se guardan en la caché por defecto.
+Las señales de ``blog.signals`` invalidan la entrada en cada cambio.
+
+Configuración (settings.py):
+    SIDEBAR_CACHE_TIMEOUT: segundos de vida de la entrada (300 por defecto)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+SIDEBAR_CACHE_KEY = 'blog:sidebar'
+DEFAULT_SIDEBAR_CACHE_TIMEOUT = 300
+
+
+def build_sidebar_data():
+    """Calcula los datos del sidebar consultando la base de datos."""
+    from .models import Post, Category, Tag
+
+    return {
+        'categories': list(
+            Category.objects.annotate(post_count=Count('posts')).filter(post_count__gt=0)
+        ),
+        'popular_tags': list(
+            Tag.objects.annotate(post_count=Count('posts')).filter(post_count__gt=0)[:10]
+        ),
+        'recent_posts': list(Post.published.summaries()[:5]),
+    }
+
+
+def get_sidebar_data():
+    """
+    Retorna los datos del sidebar, desde la caché si están disponibles.
+
+    Returns:
+        dict: ``categories``, ``popular_tags`` y ``recent_posts``
+    """
+    data = cache.get(SIDEBAR_CACHE_KEY)
+    if data is None:
+        data = build_sidebar_data()
+        timeout = getattr(settings, 'SIDEBAR_CACHE_TIMEOUT', DEFAULT_SIDEBAR_CACHE_TIMEOUT)
+        cache.set(SIDEBAR_CACHE_KEY, data, timeout)
+    return data
+
+
+def invalidate_sidebar():
+    """Elimina los datos del sidebar de la caché."""
+    cache.delete(SIDEBAR_CACHE_KEY)
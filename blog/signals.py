@@ -0,0 +1,201 @@
+"""
+Señales del blog.
+
+Mantienen sincronizadas las estructuras derivadas de las publicaciones
+(índice de búsqueda, caché del sidebar, caché de páginas, contador de
+comentarios, publicaciones relacionadas) cuando se guardan o eliminan
+posts, comentarios, categorías o etiquetas.
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import Post, Category, Tag, Comment, RelatedPost
+from . import page_cache, search
+from .related import INDEXED_FIELDS, schedule_refresh
+from .counters import adjust_approved_comment_count
+from .sidebar import invalidate_sidebar
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Indexa la publicación tras guardarla."""
+    if raw:
+        return
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Elimina la publicación del índice de búsqueda."""
+    search.unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_sidebar_cache(sender, **kwargs):
+    """Invalida el sidebar cuando cambian posts, categorías o etiquetas."""
+    invalidate_sidebar()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_sidebar_on_tags_change(sender, action, **kwargs):
+    """Invalida el sidebar cuando cambian las etiquetas de un post."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_sidebar()
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_state(sender, instance, raw=False, **kwargs):
+    """Guarda el post y el estado de aprobación previos del comentario."""
+    instance._previous_state = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_state = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list('post_id', 'is_approved')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, raw=False, **kwargs):
+    """Ajusta el contador de comentarios aprobados tras guardar."""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None)
+    current = (instance.post_id, instance.is_approved)
+    if previous == current:
+        return
+    if previous and previous[1]:
+        adjust_approved_comment_count(previous[0], -1)
+    if instance.is_approved:
+        adjust_approved_comment_count(instance.post_id, 1)
+
+
+def _deleted_with_post(instance, origin):
+    """Indica si el comentario se elimina en cascada al eliminar su post."""
+    if isinstance(origin, Post):
+        return origin.pk == instance.post_id
+    return isinstance(origin, QuerySet) and origin.model is Post
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, origin=None, **kwargs):
+    """Descuenta el comentario eliminado si estaba aprobado."""
+    # Si se elimina el post no hay contador que ajustar (evita un UPDATE
+    # por comentario en la cascada)
+    if instance.is_approved and not _deleted_with_post(instance, origin):
+        adjust_approved_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Invalida los listados, el detalle y los relacionados del post."""
+    page_cache.invalidate(
+        page_cache.POSTS,
+        page_cache.post_group(instance.pk),
+        page_cache.category_group(instance.category_id),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, origin=None, **kwargs):
+    """Invalida el detalle del post comentado."""
+    # Al eliminar el post ya se invalidan sus páginas una sola vez
+    if not _deleted_with_post(instance, origin):
+        page_cache.invalidate(page_cache.post_group(instance.post_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_taxonomy_pages(sender, **kwargs):
+    """Invalida las páginas que muestran categorías o etiquetas."""
+    page_cache.invalidate(page_cache.TAXONOMY)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_pages_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalida las páginas afectadas por cambios en las etiquetas de posts."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    groups = [page_cache.TAXONOMY]
+    if not reverse:
+        groups.append(page_cache.post_group(instance.pk))
+    elif pk_set:
+        groups.extend(page_cache.post_group(pk) for pk in pk_set)
+    else:
+        groups.append(page_cache.POSTS)
+    page_cache.invalidate(*groups)
+
+
+def _related_state(instance):
+    return tuple(getattr(instance, name) for name in INDEXED_FIELDS)
+
+
+@receiver(pre_save, sender=Post)
+def remember_related_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda los campos del post que alimentan los relacionados."""
+    instance._related_state = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {
+        Post._meta.get_field(name).attname for name in update_fields
+    } & set(INDEXED_FIELDS):
+        # Guardado parcial que no toca el índice
+        instance._related_state = _related_state(instance)
+        return
+    instance._related_state = (
+        Post.objects.filter(pk=instance.pk).values_list(*INDEXED_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def refresh_related_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Recalcula los relacionados del post y de sus vecinos si cambia algo
+    que los afecta: título, extracto, categoría o estado de publicación.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_related_state', None)
+    if previous == _related_state(instance):
+        return
+    was_published = previous is not None and previous[-1] == 'published'
+    if was_published or instance.status == 'published':
+        schedule_refresh(instance.pk)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_related_referrers(sender, instance, **kwargs):
+    """Guarda los posts que listan al eliminado antes de la cascada."""
+    instance._related_referrers = list(
+        RelatedPost.objects.filter(related=instance).values_list('post_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def refresh_related_on_delete(sender, instance, **kwargs):
+    """Recalcula los posts que listaban a la publicación eliminada."""
+    schedule_refresh(*getattr(instance, '_related_referrers', ()))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_related_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recalcula los relacionados de los posts cuyas etiquetas cambian."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        if instance.status == 'published':
+            schedule_refresh(instance.pk)
+    elif pk_set:
+        schedule_refresh(*pk_set)
@@ -0,0 +1,73 @@
+"""
+Asignación de slugs únicos para publicaciones.
+
+``next_free_slug`` obtiene el siguiente slug libre de una base con una
+sola consulta: entre los slugs ``base`` y ``base-N`` existentes toma el de
+sufijo numérico mayor y suma uno. La búsqueda usa el índice único de
+``slug``: la igualdad con ``base`` más el rango ``[base-0, base-:)``, que
+en SQLite solo contiene slugs cuyo sufijo empieza por un dígito (en
+PostgreSQL, ``LIKE 'base-%'`` sobre el índice ``varchar_pattern_ops`` que
+Django crea para los SlugField). Slugs de otros títulos con el mismo
+prefijo, como ``base-foo``, no se leen.
+
+Dos transacciones concurrentes pueden obtener el mismo slug; la
+restricción única decide y ``Post.save`` vuelve a calcularlo al recibir
+``IntegrityError``.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.utils.text import slugify
+
+# Caracteres reservados para el sufijo ``-N``
+SUFFIX_LENGTH = 11
+
+# Base usada cuando el título no produce ningún carácter válido
+DEFAULT_BASE = 'post'
+
+
+def slug_base(title, max_length):
+    """Slug base de un título, recortado para que quepa el sufijo."""
+    base = slugify(title)[:max_length - SUFFIX_LENGTH].strip('-')
+    return base or DEFAULT_BASE
+
+
+def _with_base(model, base):
+    """QuerySet de los slugs ``base`` y ``base-N`` del modelo."""
+    if connection.vendor == 'sqlite':
+        # Colación binaria: ':' sigue a '9', así que [base-0, base-:)
+        # contiene solo los ``base-<dígito>...``
+        suffixed = Q(slug__gte=f'{base}-0', slug__lt=f'{base}-:')
+    else:
+        suffixed = Q(slug__startswith=f'{base}-')
+    suffixed &= Q(slug__regex=rf'^{re.escape(base)}-[0-9]+$')
+    return model._base_manager.filter(Q(slug=base) | suffixed)
+
+
+def _suffix(slug, base):
+    """Sufijo numérico de ``slug`` (0 para la base sin sufijo)."""
+    return int(slug[len(base) + 1:] or 0) if slug != base else 0
+
+
+def next_free_slug(model, base):
+    """
+    Siguiente slug libre para ``base``.
+
+    Returns:
+        str: ``base`` si está libre; si no, ``base-N`` con N el mayor
+             sufijo existente más uno
+    """
+    last = (
+        _with_base(model, base)
+        .annotate(slug_length=Length('slug'))
+        .order_by('-slug_length', '-slug')
+        .values_list('slug', flat=True)
+        .first()
+    )
+    if last is None:
+        return base
+    return f'{base}-{_suffix(last, base) + 1}'
+
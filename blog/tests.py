@@ -6,12 +6,30 @@ Tests de:
 - Vistas CRUD de posts
 - Permisos y autorización
 - Comentarios
+- Presupuestos de consultas por vista y detección de N+1
 """
 
-from django.test import TestCase, Client
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
-from blog.models import Category, Tag, Post, Comment
+from django.template import engines
+from blog import page_cache
+from blog.models import Category, Tag, Post, Comment, RelatedPost
+from blog.comments import load_comment_page
+from blog.pagination import KEYSET_ORDERINGS
+from blog.related import RelatedIndex, get_related_posts
+from blog.rendering import content_hash
+from blog.seeding import seed_dataset
+from blog.slugs import next_free_slug
+from blog.view_counter import SEQUENCE_KEY, ViewCountBuffer, _cache, _dirty_key, view_counter
+from blog_platform.query_inspector import QueryBudgetTestMixin, QueryInspector, normalize_sql
 
 User = get_user_model()
 
@@ -125,6 +143,10 @@ class PostViewsTestCase(TestCase):
             category=self.category,
             status='published'
         )
+    
+    def tearDown(self):
+        """Descarta las visitas acumuladas durante el test."""
+        view_counter.clear()
         
     def test_post_list_view(self):
         """Test que la lista de posts carga correctamente."""
@@ -212,3 +234,1210 @@ class CommentModelTestCase(TestCase):
         
         self.assertEqual(reply.parent, self.comment)
         self.assertIn(reply, self.comment.replies.all())
+
+
+@override_settings(
+    VIEW_COUNT_FLUSH_INTERVAL=3600,
+    VIEW_COUNT_FLUSH_THRESHOLD=3,
+    PAGE_CACHE_ENABLED=False
+)
+class ViewCounterTestCase(TestCase):
+    """Tests para el contador de vistas con escritura diferida."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        view_counter.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.post = Post.objects.create(
+            title='Post Visitado',
+            content='Contenido del post',
+            author=self.author,
+            status='published'
+        )
+        self.url = reverse('post_detail', args=[self.post.slug])
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def test_views_are_buffered_until_flush(self):
+        """Test que las visitas se acumulan y se vuelcan con el comando."""
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        
+        self.assertContains(response, '2 vistas')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 0)
+        
+        out = StringIO()
+        call_command('flush_view_counts', stdout=out)
+        self.assertIn('2 visita(s) volcada(s) en 1 publicación(es)', out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 2)
+        self.assertEqual(view_counter.pending_for(self.post.pk), 0)
+    
+    def test_threshold_triggers_flush(self):
+        """Test que alcanzar el umbral vuelca las visitas automáticamente."""
+        for _ in range(3):
+            self.client.get(self.url)
+        
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 3)
+        self.assertEqual(view_counter.pending_for(self.post.pk), 0)
+    
+    def test_pending_views_are_shared_between_processes(self):
+        """Test que otro proceso (otra instancia) vuelca las visitas pendientes."""
+        self.client.get(self.url)
+        self.client.get(self.url)
+        
+        self.assertEqual(ViewCountBuffer().flush(), (1, 2))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 2)
+        self.assertEqual(view_counter.flush(), (0, 0))
+    
+    def test_views_after_flush_stay_pending(self):
+        """Test que las visitas posteriores a un volcado se vuelcan en el siguiente."""
+        view_counter.increment(self.post.pk)
+        view_counter.flush()
+        self.assertEqual(view_counter.increment(self.post.pk, 2), 2)
+        
+        self.assertEqual(view_counter.flush(), (1, 2))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 3)
+    
+    def test_missing_dirty_entry_is_skipped_on_next_flush(self):
+        """Test que una posición vacía del registro solo retrasa un volcado."""
+        # Posición reservada cuyo set no llegó (p. ej. un worker interrumpido)
+        _cache().set(SEQUENCE_KEY, _cache().get(SEQUENCE_KEY, 0) + 1, None)
+        view_counter.increment(self.post.pk)
+        
+        self.assertEqual(view_counter.flush(), (0, 0))
+        self.assertEqual(view_counter.flush(), (1, 1))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 1)
+    
+    def test_lost_dirty_entry_does_not_lose_views(self):
+        """Test que un post cuya entrada del registro se perdió se vuelca igual."""
+        view_counter.increment(self.post.pk, 3)
+        _cache().delete(_dirty_key(_cache().get(SEQUENCE_KEY)))
+        view_counter.increment(self.post.pk)
+        
+        self.assertEqual(view_counter.flush(), (0, 0))
+        self.assertEqual(view_counter.flush(), (1, 4))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 4)
+    
+    def test_pending_views_survive_cache_culling(self):
+        """Test que llenar la caché por defecto no expulsa visitas pendientes."""
+        view_counter.increment(self.post.pk, 3)
+        for n in range(400):
+            cache.set(f'relleno:{n}', n)
+        
+        self.assertEqual(view_counter.flush(), (1, 3))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views_count, 3)
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class PostSearchTestCase(TestCase):
+    """Tests para la búsqueda full-text de publicaciones."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.title_match = Post.objects.create(
+            title='Introducción a Django',
+            content='Un framework web para Python.',
+            author=self.author,
+            status='published'
+        )
+        self.content_match = Post.objects.create(
+            title='Frameworks web',
+            content='Comparamos Flask, FastAPI y Django en detalle.',
+            author=self.author,
+            status='published'
+        )
+        self.other = Post.objects.create(
+            title='Recetas de cocina',
+            content='Arroz con pollo.',
+            author=self.author,
+            status='published'
+        )
+    
+    def search(self, query):
+        response = self.client.get(reverse('post_list'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['posts'])
+    
+    def test_search_ranks_title_matches_first(self):
+        """Test que las coincidencias en el título tienen mayor relevancia."""
+        results = self.search('django')
+        self.assertEqual(results, [self.title_match, self.content_match])
+    
+    def test_search_ignores_accents_and_operators(self):
+        """Test que la búsqueda ignora acentos y caracteres especiales."""
+        self.assertEqual(self.search('introduccion'), [self.title_match])
+        self.assertEqual(self.search('"cocina" -*'), [self.other])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Test que el índice se sincroniza al editar y eliminar posts."""
+        self.other.title = 'Recetas con Django'
+        self.other.save()
+        self.assertIn(self.other, self.search('recetas django'))
+        
+        self.other.delete()
+        self.assertEqual(self.search('recetas'), [])
+    
+    def test_rebuild_search_index_command(self):
+        """Test que el comando reconstruye el índice desde la tabla de posts."""
+        Post.objects.filter(pk=self.other.pk).update(title='Sopa de verduras')
+        self.assertEqual(self.search('sopa'), [])
+        
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('sopa'), [self.other])
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class SidebarCacheTestCase(TestCase):
+    """Tests para la caché del sidebar de la lista de posts."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.category = Category.objects.create(name='Tecnología')
+        self.post = Post.objects.create(
+            title='Post en Caché',
+            content='Contenido del post',
+            author=self.author,
+            category=self.category,
+            status='published'
+        )
+    
+    def test_steady_state_skips_aggregate_queries(self):
+        """Test que con la caché caliente no se ejecutan agregaciones."""
+        self.client.get(reverse('post_list'))
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post_list'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'GROUP BY' in q['sql']])
+        self.assertEqual(response.context['categories'], [self.category])
+    
+    def test_sidebar_invalidated_on_changes(self):
+        """Test que guardar posts o etiquetas invalida el sidebar."""
+        tag = Tag.objects.create(name='Django')
+        response = self.client.get(reverse('post_list'))
+        self.assertEqual(list(response.context['popular_tags']), [])
+        
+        self.post.tags.add(tag)
+        response = self.client.get(reverse('post_list'))
+        self.assertEqual(list(response.context['popular_tags']), [tag])
+        
+        new_post = Post.objects.create(
+            title='Otro Post',
+            content='Contenido',
+            author=self.author,
+            status='published'
+        )
+        
+        response = self.client.get(reverse('post_list'))
+        self.assertEqual(response.context['recent_posts'][0], new_post)
+
+
+class CommentCounterTestCase(TestCase):
+    """Tests para el contador desnormalizado de comentarios aprobados."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.post = Post.objects.create(
+            title='Post Comentado',
+            content='Contenido del post',
+            author=self.author,
+            status='published'
+        )
+        self.comment = Comment.objects.create(
+            post=self.post, user=self.author, content='Primero'
+        )
+        self.reply = Comment.objects.create(
+            post=self.post, user=self.author, content='Respuesta', parent=self.comment
+        )
+    
+    def assertCount(self, expected):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.approved_comment_count, expected)
+    
+    def test_counter_follows_create_approve_and_delete(self):
+        """Test que el contador sigue altas, aprobaciones y bajas."""
+        self.assertCount(2)
+        
+        self.reply.is_approved = False
+        self.reply.save()
+        self.assertCount(1)
+        
+        self.reply.is_approved = True
+        self.reply.save()
+        self.assertCount(2)
+        
+        # Eliminar el padre elimina en cascada la respuesta
+        self.comment.delete()
+        self.assertCount(0)
+    
+    def test_admin_bulk_actions_update_counter(self):
+        """Test que las acciones masivas del admin recalculan el contador."""
+        User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='AdminPass123!'
+        )
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+        url = reverse('admin:blog_comment_changelist')
+        selected = [self.comment.pk, self.reply.pk]
+        
+        self.client.post(url, {'action': 'disapprove_comments', '_selected_action': selected})
+        self.assertCount(0)
+        
+        self.client.post(url, {'action': 'approve_comments', '_selected_action': selected})
+        self.assertCount(2)
+    
+    def test_reconcile_comment_counts_command(self):
+        """Test que el comando corrige contadores desincronizados."""
+        Post.objects.filter(pk=self.post.pk).update(approved_comment_count=42)
+        
+        call_command('reconcile_comment_counts', stdout=StringIO())
+        self.assertCount(2)
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CursorPaginationTestCase(TestCase):
+    """Tests para la paginación por cursor de post_list y my_posts."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        for i in range(30):
+            post = Post.objects.create(
+                title=f'Post {i:02d}',
+                content='Contenido',
+                author=self.author,
+                status='published'
+            )
+            # Valores repetidos para forzar el desempate por id
+            Post.objects.filter(pk=post.pk).update(views_count=i % 4)
+    
+    def walk(self, url, params):
+        """Recorre todas las páginas hacia delante y luego hacia atrás."""
+        forward, pages = [], []
+        response = self.client.get(url, params)
+        while True:
+            page = response.context['posts']
+            pages.append([p.pk for p in page])
+            forward.extend(p.pk for p in page)
+            if not page.has_next():
+                break
+            response = self.client.get(url, {**params, 'cursor': page.next_cursor})
+        
+        backward = [pages[-1]]
+        while page.has_previous():
+            response = self.client.get(url, {**params, 'cursor': page.previous_cursor})
+            page = response.context['posts']
+            backward.insert(0, [p.pk for p in page])
+        return forward, pages, backward
+    
+    def test_every_order_matches_full_ordering(self):
+        """Test que cada orden recorre todos los posts sin huecos ni repetidos."""
+        for order, ordering in KEYSET_ORDERINGS.items():
+            with self.subTest(order=order):
+                expected = list(Post.published.order_by(*ordering).values_list('pk', flat=True))
+                forward, pages, backward = self.walk(reverse('post_list'), {'order': order})
+                self.assertEqual(forward, expected)
+                self.assertEqual(backward, pages)
+    
+    def test_deep_page_does_not_use_offset_or_count(self):
+        """Test que las páginas profundas no usan OFFSET ni COUNT sobre posts."""
+        self.client.login(email='author@example.com', password='AuthorPass123!')
+        response = self.client.get(reverse('my_posts'))
+        cursor = response.context['posts'].next_cursor
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('my_posts'), {'cursor': cursor})
+        
+        self.assertEqual(len(response.context['posts']), 10)
+        page_queries = [q['sql'] for q in queries if 'LIMIT 11' in q['sql']]
+        self.assertEqual(len(page_queries), 1)
+        self.assertNotIn('OFFSET', page_queries[0])
+    
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        """Test que un cursor inválido muestra la primera página."""
+        response = self.client.get(reverse('post_list'), {'cursor': 'no-valido'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['posts'].has_previous())
+        self.assertEqual(response.context['posts'].paginator.estimated_total, 30)
+
+
+class CommentTreeTestCase(TestCase):
+    """Tests para la carga de comentarios en árbol."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.post = Post.objects.create(
+            title='Post con Hilos',
+            content='Contenido del post',
+            author=self.author,
+            status='published'
+        )
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def comment(self, content, parent=None, is_approved=True):
+        return Comment.objects.create(
+            post=self.post, user=self.author, content=content,
+            parent=parent, is_approved=is_approved
+        )
+    
+    def test_tree_supports_nesting_and_skips_unapproved(self):
+        """Test que el árbol anida respuestas y omite las no aprobadas."""
+        root = self.comment('Raíz')
+        child = self.comment('Hijo', parent=root)
+        grandchild = self.comment('Nieto', parent=child)
+        hidden = self.comment('Oculto', parent=root, is_approved=False)
+        self.comment('Respuesta a oculto', parent=hidden)
+        
+        roots = load_comment_page(self.post, 1, 20).object_list
+        
+        self.assertEqual(roots, [root])
+        self.assertEqual(roots[0].children, [child])
+        self.assertEqual(roots[0].children[0].children, [grandchild])
+        self.assertEqual(roots[0].children[0].children[0].depth, 2)
+    
+    def test_post_detail_queries_do_not_grow_with_replies(self):
+        """Test que el número de consultas no depende de las respuestas."""
+        root = self.comment('Raíz')
+        self.comment('Respuesta', parent=root)
+        url = reverse('post_detail', args=[self.post.slug])
+        
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        
+        parent = root
+        for i in range(10):
+            parent = self.comment(f'Respuesta {i}', parent=parent)
+        
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        
+        self.assertContains(response, 'Respuesta 9')
+        self.assertEqual(len(many), len(few))
+    
+    def test_page_loads_only_its_threads(self):
+        """Test que cada página lee solo sus hilos y las respuestas de estos."""
+        roots = [self.comment(f'Hilo {i}') for i in range(3)]
+        for root in roots:
+            self.comment(f'Respuesta a {root.content}', parent=root)
+        
+        with CaptureQueriesContext(connection) as queries:
+            page = load_comment_page(self.post, 2, 2)
+        self.assertEqual(page.object_list, [roots[2]])
+        self.assertEqual(
+            [reply.content for reply in page.object_list[0].children], ['Respuesta a Hilo 2']
+        )
+        self.assertEqual(page.paginator.num_pages, 2)
+        # Recuento de hilos, hilos de la página y sus respuestas
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('Hilo 0', str(page.object_list))
+    
+    def test_single_reply_form(self):
+        """Test que la página incluye un único formulario de respuesta."""
+        for i in range(3):
+            self.comment(f'Hilo {i}')
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('post_detail', args=[self.post.slug]))
+        content = response.content.decode()
+        self.assertEqual(content.count('id="reply-form"'), 1)
+        self.assertEqual(content.count('name="parent_id"'), 1)
+        self.assertEqual(content.count('id="reply-slot-'), 3)
+
+
+class PageCacheTestCase(TestCase):
+    """Tests para la caché de páginas de visitantes anónimos."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.category = Category.objects.create(name='Tecnología')
+        self.post = Post.objects.create(
+            title='Post Cacheado',
+            content='Contenido del post',
+            author=self.author,
+            category=self.category,
+            status='published'
+        )
+        self.detail_url = reverse('post_detail', args=[self.post.slug])
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def test_anonymous_hit_skips_orm(self):
+        """Test que un acierto no ejecuta consultas y cuenta la visita."""
+        first = self.client.get(self.detail_url)
+        self.assertEqual(first['X-Page-Cache'], 'MISS')
+        
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.detail_url)
+        
+        self.assertEqual(second['X-Page-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(view_counter.pending_for(self.post.pk), 2)
+    
+    def test_evicted_version_invalidates_page(self):
+        """Test que una versión expulsada de la caché no revalida páginas antiguas."""
+        cache.clear()
+        self.client.get(self.detail_url)
+        # Cambio del post y, después, expulsión de su clave de versión
+        page_cache.invalidate(page_cache.post_group(self.post.pk))
+        cache.delete(page_cache._version_key(page_cache.post_group(self.post.pk)))
+        
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.detail_url)['X-Page-Cache'], 'HIT')
+    
+    def test_query_string_is_normalized(self):
+        """Test que el orden de los parámetros no genera entradas distintas."""
+        self.client.get(reverse('post_list'), {'order': 'title', 'category': 'tecnologia'})
+        response = self.client.get(
+            reverse('post_list') + '?category=tecnologia&q=&order=title'
+        )
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+    
+    def test_invalidation_is_targeted(self):
+        """Test que un comentario invalida solo el detalle de su post."""
+        self.client.get(self.detail_url)
+        self.client.get(reverse('post_list'))
+        
+        Comment.objects.create(post=self.post, user=self.author, content='Nuevo comentario')
+        
+        detail = self.client.get(self.detail_url)
+        self.assertEqual(detail['X-Page-Cache'], 'MISS')
+        self.assertContains(detail, 'Nuevo comentario')
+        self.assertEqual(self.client.get(reverse('post_list'))['X-Page-Cache'], 'HIT')
+        
+        self.post.title = 'Título Editado'
+        self.post.save()
+        response = self.client.get(reverse('post_list'))
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Título Editado')
+    
+    def test_authenticated_users_bypass_cache(self):
+        """Test que los usuarios autenticados no reciben páginas cacheadas."""
+        self.client.get(self.detail_url)
+        self.client.login(email='author@example.com', password='AuthorPass123!')
+        
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertContains(response, 'Deja tu comentario')
+    
+    def test_system_status_shows_metrics(self):
+        """Test que el estado del sistema muestra aciertos y fallos."""
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        
+        User.objects.create_user(
+            username='admin', email='admin@example.com', password='AdminPass123!',
+            role='admin', is_active=True
+        )
+        self.client.login(email='admin@example.com', password='AdminPass123!')
+        response = self.client.get(reverse('admin_panel:system_status'))
+        self.assertEqual(response.context['page_cache_stats']['hits'], 1)
+        self.assertEqual(response.context['page_cache_stats']['misses'], 1)
+
+
+class QueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    """Tests de presupuesto de consultas de las vistas del blog."""
+    
+    def setUp(self):
+        """Configuración inicial con varias filas por listado."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        readers = [
+            User.objects.create_user(
+                username=f'reader{i}',
+                email=f'reader{i}@example.com',
+                password='ReaderPass123!',
+                is_active=True
+            )
+            for i in range(3)
+        ]
+        categories = [Category.objects.create(name=f'Categoría {i}') for i in range(3)]
+        tags = [Tag.objects.create(name=f'Etiqueta {i}') for i in range(4)]
+        self.posts = []
+        for i in range(8):
+            post = Post.objects.create(
+                title=f'Post {i}',
+                content='Contenido del post',
+                author=self.author,
+                category=categories[i % 3],
+                status='published' if i < 6 else 'draft'
+            )
+            post.tags.set(tags[i % 4:i % 4 + 2])
+            self.posts.append(post)
+        
+        self.post = self.posts[0]
+        for reader in readers:
+            root = Comment.objects.create(post=self.post, user=reader, content='Comentario')
+            for other in readers:
+                Comment.objects.create(post=self.post, user=other, content='Respuesta', parent=root)
+        self.comment = root
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def test_public_views(self):
+        """Test que las vistas públicas cumplen su presupuesto."""
+        self.assertWithinQueryBudget(reverse('post_list'))
+        self.assertWithinQueryBudget(reverse('post_list'), data={'q': 'Post'})
+        self.assertWithinQueryBudget(reverse('post_detail', args=[self.post.slug]))
+        self.assertWithinQueryBudget(reverse('category_list'))
+        self.assertWithinQueryBudget(reverse('tag_list'))
+    
+    def test_author_views(self):
+        """Test que las vistas del autor cumplen su presupuesto."""
+        self.client.force_login(self.author)
+        self.assertWithinQueryBudget(reverse('post_list'))
+        self.assertWithinQueryBudget(reverse('post_detail', args=[self.post.slug]))
+        self.assertWithinQueryBudget(reverse('category_list'))
+        self.assertWithinQueryBudget(reverse('tag_list'))
+        self.assertWithinQueryBudget(reverse('my_posts'))
+        self.assertWithinQueryBudget(reverse('post_create'))
+        self.assertWithinQueryBudget(reverse('post_edit', args=[self.post.slug]))
+        self.assertWithinQueryBudget(reverse('post_delete', args=[self.post.slug]))
+        self.assertWithinQueryBudget(reverse('comment_delete', args=[self.comment.pk]))
+    
+    def test_write_views(self):
+        """Test que publicar y comentar cumplen su presupuesto."""
+        self.client.force_login(self.author)
+        response = self.assertWithinQueryBudget(
+            reverse('post_create'), method='post',
+            data={'title': 'Nuevo post', 'content': 'Contenido del post. ' * 5, 'status': 'published',
+                  'category': self.post.category_id,
+                  'tags': [tag.pk for tag in Tag.objects.all()[:2]]}
+        )
+        self.assertEqual(response.status_code, 302)
+        response = self.assertWithinQueryBudget(
+            reverse('post_edit', args=[self.post.slug]), method='post',
+            data={'title': 'Post editado', 'content': 'Contenido del post. ' * 5,
+                  'status': 'published', 'category': self.post.category_id}
+        )
+        self.assertEqual(response.status_code, 302)
+        response = self.assertWithinQueryBudget(
+            reverse('post_detail', args=[self.post.slug]), method='post',
+            data={'content': 'Respuesta', 'parent_id': self.comment.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        own_comment = Comment.objects.get(user=self.author)
+        response = self.assertWithinQueryBudget(
+            reverse('comment_delete', args=[own_comment.pk]), method='post'
+        )
+        self.assertEqual(response.status_code, 302)
+        response = self.assertWithinQueryBudget(
+            reverse('post_delete', args=[self.post.slug]), method='post'
+        )
+        self.assertEqual(response.status_code, 302)
+    
+    def test_detector_flags_repeated_queries(self):
+        """Test que se detecta la misma consulta repetida desde un mismo lugar."""
+        with QueryInspector() as inspector:
+            for post in Post.objects.all():
+                post.author.username
+        repeated = inspector.repeated()
+        self.assertEqual(len(repeated), 1)
+        site, sql, times = repeated[0]
+        self.assertTrue(site.startswith('blog/tests.py:'))
+        self.assertEqual(times, len(self.posts))
+        self.assertTrue(inspector.problems(budget=3))
+    
+    def test_detector_reports_template_line(self):
+        """Test que los N+1 de plantillas se atribuyen a su línea."""
+        template = engines['django'].from_string(
+            '{% for post in posts %}\n{{ post.author.username }}\n{% endfor %}'
+        )
+        with QueryInspector() as inspector:
+            template.render({'posts': Post.objects.all()})
+        self.assertEqual(inspector.repeated()[0][0], '<unknown source>:2')
+    
+    def test_normalize_sql(self):
+        """Test que la normalización ignora literales y tamaños de IN."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id = 12 AND name = 'a''b'"),
+            'SELECT * FROM t WHERE id = ? AND name = ?'
+        )
+        self.assertEqual(
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            normalize_sql('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+
+class SeedDatasetTestCase(TestCase):
+    """Tests para la generación masiva de datos."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    def seed(self, **kwargs):
+        options = dict(users=20, categories=3, tags=10, posts=30, comments=120, batch_size=25)
+        options.update(kwargs)
+        return seed_dataset(**options)
+    
+    def test_counts(self):
+        """Test que se crean las filas pedidas."""
+        created = self.seed()
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Tag.objects.count(), 10)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 120)
+        self.assertEqual(created['posts'], 30)
+        self.assertTrue(User.objects.filter(role='admin').exists())
+    
+    def test_deterministic(self):
+        """Test que la misma semilla genera los mismos datos."""
+        self.seed(seed=7)
+        first = list(Post.objects.order_by('pk').values_list('title', 'views_count', 'status'))
+        Comment.objects.all().delete()
+        Post.objects.all().delete()
+        Tag.objects.all().delete()
+        Category.objects.all().delete()
+        User.objects.all().delete()
+        self.seed(seed=7)
+        second = list(Post.objects.order_by('pk').values_list('title', 'views_count', 'status'))
+        self.assertEqual(first, second)
+    
+    def test_consistency(self):
+        """Test que respuestas, contadores y búsqueda quedan coherentes."""
+        self.seed()
+        for reply in Comment.objects.filter(parent__isnull=False).select_related('parent'):
+            self.assertEqual(reply.post_id, reply.parent.post_id)
+            self.assertGreaterEqual(reply.created_at, reply.parent.created_at)
+        for post in Post.objects.all():
+            self.assertEqual(
+                post.approved_comment_count,
+                post.comments.filter(is_approved=True).count()
+            )
+        post = Post.published.first()
+        word = post.title.split()[0]
+        response = self.client.get(reverse('post_list'), {'q': word})
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(response.context['posts']), 0)
+    
+    def test_new_rows_after_seeding(self):
+        """Test que las secuencias permiten crear filas después."""
+        self.seed()
+        author = User.objects.filter(role='admin').first()
+        post = Post.objects.create(
+            title='Post nuevo', content='Contenido', author=author,
+            category=Category.objects.first(), status='published'
+        )
+        self.assertEqual(post.pk, Post.objects.order_by('-pk').values_list('pk', flat=True)[0])
+    
+    def test_seeding_twice_and_over_existing_names(self):
+        """Test que los nombres generados no chocan con filas existentes."""
+        # Nombre que generaría la primera ejecución con la semilla 42
+        existing = User.objects.create_user(
+            username='existing', email='existing@example.com', password='Pass123!x'
+        )
+        User.objects.filter(pk=existing.pk).update(username=f'seed42-user{existing.pk + 1}')
+        self.seed(users=5, posts=5, comments=5)
+        self.seed(users=5, posts=5, comments=5)
+        self.assertEqual(User.objects.count(), 11)
+        self.assertEqual(Post.objects.count(), 10)
+        self.assertTrue(User.objects.filter(username__startswith='seed42r1-').exists())
+        self.assertTrue(User.objects.filter(username__startswith='seed42r2-').exists())
+
+
+class SlugAllocationTestCase(TestCase):
+    """Tests para la asignación de slugs únicos de publicaciones."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.category = Category.objects.create(name='Tecnología')
+    
+    def create(self, title, **kwargs):
+        return Post.objects.create(
+            title=title, content='Contenido', author=self.author,
+            category=self.category, **kwargs
+        )
+    
+    def test_sequential_suffixes(self):
+        """Test que los títulos repetidos reciben sufijos consecutivos."""
+        self.create('Hola mundo con Python')
+        slugs = [self.create('Hola mundo').slug for _ in range(3)]
+        self.assertEqual(slugs, ['hola-mundo', 'hola-mundo-1', 'hola-mundo-2'])
+        self.assertEqual(Post.objects.get(title='Hola mundo con Python').slug, 'hola-mundo-con-python')
+    
+    def test_next_suffix_after_gaps(self):
+        """Test que se continúa desde el mayor sufijo existente."""
+        self.create('Hola mundo', slug='hola-mundo-9')
+        self.create('Hola mundo', slug='hola-mundo-10')
+        self.assertEqual(self.create('Hola mundo').slug, 'hola-mundo-11')
+    
+    def test_single_query(self):
+        """Test que el coste no depende de cuántos posts comparten título."""
+        for _ in range(10):
+            self.create('Título repetido')
+        with CaptureQueriesContext(connection) as queries:
+            slug = next_free_slug(Post, 'titulo-repetido')
+        self.assertEqual(slug, 'titulo-repetido-10')
+        self.assertEqual(len(queries), 1)
+    
+    def test_title_without_slug_characters(self):
+        """Test que un título sin caracteres válidos usa la base por defecto."""
+        self.assertEqual(self.create('¿¡!?').slug, 'post')
+        self.assertEqual(len(self.create('x' * 200).slug), 189)
+    
+    def test_retry_on_integrity_error(self):
+        """Test que se recalcula el slug si otra transacción lo ocupa."""
+        self.create('Carrera', slug='carrera-5')
+        with mock.patch('blog.models.next_free_slug', side_effect=['carrera-5', 'carrera-6']):
+            post = self.create('Carrera')
+        self.assertEqual(post.slug, 'carrera-6')
+        self.assertEqual(Post.objects.filter(title='Carrera').count(), 2)
+    
+    def test_other_slugs_with_prefix_are_not_read(self):
+        """Test que los slugs de otros títulos con el mismo prefijo no cuentan."""
+        self.create('Hola mundo', slug='hola-mundo-3')
+        self.create('Hola mundo feliz', slug='hola-mundo-feliz')
+        self.create('Hola mundo 2024', slug='hola-mundo-2024b')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(next_free_slug(Post, 'hola-mundo'), 'hola-mundo-4')
+        sql = queries[0]['sql']
+        self.assertIn("'hola-mundo-0'", sql)
+        self.assertIn("'hola-mundo-:'", sql)
+
+
+class ReadingTimeTestCase(TestCase):
+    """Tests para las palabras y el tiempo de lectura precalculados."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.category = Category.objects.create(name='Tecnología')
+        self.short = self.create('Post corto', 'palabra ' * 150)
+        self.long = self.create('Post largo', 'palabra ' * 1500)
+    
+    def create(self, title, content):
+        return Post.objects.create(
+            title=title, content=content, author=self.author,
+            category=self.category, status='published'
+        )
+    
+    def test_computed_on_save(self):
+        """Test que save guarda palabras y minutos (mínimo un minuto)."""
+        self.assertEqual((self.short.word_count, self.short.reading_time), (150, 1))
+        self.assertEqual((self.long.word_count, self.long.reading_time), (1500, 8))
+    
+    def test_update_fields_with_content(self):
+        """Test que guardar solo el contenido también actualiza las columnas."""
+        self.short.content = 'palabra ' * 1000
+        self.short.save(update_fields=['content'])
+        self.short.refresh_from_db()
+        self.assertEqual((self.short.word_count, self.short.reading_time), (1000, 5))
+    
+    def test_backfill_command(self):
+        """Test que el comando recalcula los valores desactualizados."""
+        Post.objects.update(word_count=0, reading_time=1)
+        out = StringIO()
+        call_command('backfill_reading_time', stdout=out)
+        self.assertIn('2 publicación(es)', out.getvalue())
+        self.long.refresh_from_db()
+        self.assertEqual((self.long.word_count, self.long.reading_time), (1500, 8))
+        
+        out = StringIO()
+        call_command('backfill_reading_time', stdout=out)
+        self.assertIn('0 publicación(es)', out.getvalue())
+    
+    def test_list_filter_and_order(self):
+        """Test que el listado filtra y ordena por tiempo de lectura."""
+        response = self.client.get(reverse('post_list'), {'max_minutes': '5'})
+        self.assertEqual([post.title for post in response.context['posts']], ['Post corto'])
+        
+        response = self.client.get(reverse('post_list'), {'order': 'reading_time'})
+        self.assertEqual(
+            [post.title for post in response.context['posts']],
+            ['Post corto', 'Post largo']
+        )
+        self.assertContains(response, '8 min')
+    
+    def test_list_ignores_invalid_max_minutes(self):
+        """Test que valores fuera de las opciones no filtran ni fallan."""
+        for value in ('²', '9' * 30, '7', '-1'):
+            response = self.client.get(reverse('post_list'), {'max_minutes': value})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['posts']), 2)
+
+
+class PostSummaryColumnsTestCase(TestCase):
+    """Tests de que los listados no cargan el contenido de los posts."""
+    
+    CONTENT_COLUMN = '"posts"."content"'
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        category = Category.objects.create(name='Tecnología')
+        self.posts = [
+            Post.objects.create(
+                title=f'Post número {i}', content='Contenido largo del post. ' * 50,
+                author=self.author, category=category, status='published'
+            )
+            for i in range(4)
+        ]
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def content_queries(self, url, **data):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries if self.CONTENT_COLUMN in query['sql']]
+    
+    def test_summaries_defers_content(self):
+        """Test que summaries() difiere content y mantiene el resto."""
+        post = Post.published.summaries().get(pk=self.posts[0].pk)
+        self.assertEqual(post.get_deferred_fields(), {'content', 'content_html', 'content_hash'})
+        with self.assertNumQueries(0):
+            post.title, post.excerpt, post.reading_time, post.views_count
+    
+    def test_list_views_never_select_content(self):
+        """Test que post_list y my_posts no seleccionan content."""
+        self.assertEqual(self.content_queries(reverse('post_list')), [])
+        self.assertEqual(self.content_queries(reverse('post_list'), q='Post'), [])
+        self.assertEqual(self.content_queries(reverse('post_list'), order='title'), [])
+        self.client.force_login(self.author)
+        self.assertEqual(self.content_queries(reverse('my_posts')), [])
+    
+    def test_post_detail_never_selects_content(self):
+        """Test que el detalle sirve el HTML guardado sin cargar content."""
+        self.assertEqual(self.content_queries(reverse('post_detail', args=[self.posts[0].slug])), [])
+
+
+class RenderedContentTestCase(TestCase):
+    """Tests para el HTML precalculado del contenido de los posts."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.post = Post.objects.create(
+            title='Post con formato',
+            content='Primer párrafo <script>alert(1)</script>\nsegunda línea\n\nSegundo párrafo',
+            author=self.author,
+            category=Category.objects.create(name='Tecnología'),
+            status='published'
+        )
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def test_rendered_on_save(self):
+        """Test que save guarda el HTML escapado y el hash del contenido."""
+        self.assertEqual(
+            self.post.content_html,
+            '<p>Primer párrafo &lt;script&gt;alert(1)&lt;/script&gt;<br>segunda línea</p>\n\n'
+            '<p>Segundo párrafo</p>'
+        )
+        self.assertEqual(self.post.content_hash, content_hash(self.post.content))
+    
+    def test_rerendered_only_when_content_changes(self):
+        """Test que solo se vuelve a renderizar si cambia el contenido."""
+        Post.objects.filter(pk=self.post.pk).update(content_html='<p>guardado</p>')
+        post = Post.objects.get(pk=self.post.pk)
+        post.title = 'Otro título'
+        post.save()
+        self.assertEqual(post.content_html, '<p>guardado</p>')
+        
+        post.content = 'Nuevo contenido'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.content_html, '<p>Nuevo contenido</p>')
+    
+    def test_detail_serves_stored_html(self):
+        """Test que el detalle muestra el HTML guardado."""
+        Post.objects.filter(pk=self.post.pk).update(content_html='<p>HTML guardado</p>')
+        response = self.client.get(reverse('post_detail', args=[self.post.slug]))
+        self.assertContains(response, '<p>HTML guardado</p>', html=True)
+        self.assertNotContains(response, '<script>alert(1)</script>')
+    
+    def test_render_command(self):
+        """Test que el comando renderiza solo los posts desactualizados."""
+        Post.objects.filter(pk=self.post.pk).update(content_html='', content_hash='')
+        out = StringIO()
+        call_command('render_post_content', stdout=out)
+        self.assertIn('1 publicación(es)', out.getvalue())
+        self.post.refresh_from_db()
+        self.assertIn('<p>Segundo párrafo</p>', self.post.content_html)
+        
+        out = StringIO()
+        call_command('render_post_content', stdout=out)
+        self.assertIn('0 publicación(es)', out.getvalue())
+        call_command('render_post_content', '--force', stdout=out)
+        self.assertIn('1 publicación(es)', out.getvalue())
+    
+    def test_renderer_version_change(self):
+        """Test que cambiar la versión del renderizador invalida los hashes."""
+        with mock.patch('blog.rendering.RENDERER_VERSION', 2):
+            self.assertNotEqual(content_hash(self.post.content), self.post.content_hash)
+            out = StringIO()
+            call_command('render_post_content', stdout=out)
+            self.assertIn('versión 2) en 1 publicación(es)', out.getvalue())
+
+
+class RelatedPostsTestCase(TestCase):
+    """Tests para las publicaciones relacionadas precalculadas."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author',
+            email='author@example.com',
+            password='AuthorPass123!',
+            role='author',
+            is_active=True
+        )
+        self.tech = Category.objects.create(name='Tecnología')
+        self.travel = Category.objects.create(name='Viajes')
+        self.django = Tag.objects.create(name='django')
+        self.python = Tag.objects.create(name='python')
+        self.post = self.create_post(
+            'Optimizar consultas en Django', 'Índices y consultas del ORM de Django.',
+            self.tech, [self.django, self.python],
+        )
+        self.same_tags = self.create_post(
+            'Notas de la semana', 'Resumen variado.', self.travel, [self.django, self.python],
+        )
+        self.same_text = self.create_post(
+            'Consultas lentas en Django', 'Cómo encontrar consultas lentas con el ORM de Django.',
+            self.travel, [],
+        )
+        self.same_category = self.create_post(
+            'Teclados mecánicos', 'Comparativa de interruptores.', self.tech, [],
+        )
+        self.unrelated = self.create_post(
+            'Ruta por los Alpes', 'Montañas, lagos y refugios.', self.travel, [],
+        )
+        call_command('rebuild_related_posts', stdout=StringIO())
+    
+    def tearDown(self):
+        view_counter.clear()
+    
+    def create_post(self, title, excerpt, category, tags, status='published'):
+        post = Post.objects.create(
+            title=title, excerpt=excerpt, content=excerpt, author=self.author,
+            category=category, status=status,
+        )
+        post.tags.set(tags)
+        return post
+    
+    def related_ids(self, post):
+        return list(
+            RelatedPost.objects.filter(post=post).order_by('rank').values_list('related_id', flat=True)
+        )
+    
+    def test_ranked_by_similarity(self):
+        """Test que etiquetas y texto compartidos pesan más que la categoría."""
+        self.assertEqual(
+            self.related_ids(self.post),
+            [self.same_tags.pk, self.same_text.pk, self.same_category.pk],
+        )
+        self.assertEqual(
+            [p.pk for p in get_related_posts(self.post)],
+            [self.same_tags.pk, self.same_text.pk, self.same_category.pk],
+        )
+    
+    def test_similarity_is_symmetric(self):
+        """Test que la similitud no depende del orden de los posts."""
+        index = RelatedIndex.from_database()
+        self.assertAlmostEqual(
+            index.similarity(self.post.pk, self.same_tags.pk),
+            index.similarity(self.same_tags.pk, self.post.pk),
+        )
+        self.assertEqual(index.similarity(self.post.pk, self.unrelated.pk), 0)
+    
+    def test_detail_reads_related_in_one_query(self):
+        """Test que el detalle lee los relacionados precalculados."""
+        with CaptureQueriesContext(connection) as queries:
+            related = get_related_posts(self.post)
+        self.assertEqual(len(related), 3)
+        self.assertEqual(len(queries), 1)
+        
+        response = self.client.get(reverse('post_detail', args=[self.post.slug]))
+        self.assertEqual(
+            [p.pk for p in response.context['related_posts']],
+            [self.same_tags.pk, self.same_text.pk, self.same_category.pk],
+        )
+    
+    def test_fallback_to_category(self):
+        """Test que sin vecinos calculados se usan los recientes de la categoría."""
+        RelatedPost.objects.all().delete()
+        self.assertEqual([p.pk for p in get_related_posts(self.post)], [self.same_category.pk])
+    
+    def test_refresh_on_publish(self):
+        """Test que publicar un post lo añade a las listas de sus vecinos."""
+        with self.captureOnCommitCallbacks(execute=True):
+            draft = self.create_post(
+                'Consultas de Django con el ORM', 'Consultas del ORM de Django: índices.',
+                self.tech, [self.django, self.python], status='draft',
+            )
+        self.assertEqual(self.related_ids(draft), [])
+        self.assertNotIn(draft.pk, self.related_ids(self.post))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.status = 'published'
+            draft.save()
+        self.assertEqual(len(self.related_ids(draft)), 3)
+        self.assertEqual(self.related_ids(self.post)[0], draft.pk)
+    
+    def test_refresh_on_unpublish_and_delete(self):
+        """Test que retirar o eliminar un post lo quita de otras listas."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.same_text.status = 'draft'
+            self.same_text.save()
+        self.assertEqual(self.related_ids(self.same_text), [])
+        # Sin parecido ni categoría común, el post de viajes no entra
+        self.assertEqual(self.related_ids(self.post), [self.same_tags.pk, self.same_category.pk])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.same_tags.delete()
+        self.assertEqual(self.related_ids(self.post), [self.same_category.pk])
+    
+    def test_refresh_on_tags_change(self):
+        """Test que cambiar las etiquetas recalcula los relacionados."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.unrelated.tags.set([self.django, self.python])
+        self.assertIn(self.unrelated.pk, self.related_ids(self.post))
+    
+    def test_command_refreshes_selected_posts(self):
+        """Test que el comando acepta posts concretos."""
+        RelatedPost.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_related_posts', '--post', str(self.post.pk), stdout=out)
+        self.assertIn('publicación(es)', out.getvalue())
+        self.assertEqual(len(self.related_ids(self.post)), 3)
+    
+    def test_refresh_only_when_indexed_fields_change(self):
+        """Test que solo se refresca si cambian los campos del índice."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.content = 'Otro contenido.'
+            self.post.save()
+            self.post.save(update_fields=['views_count'])
+            draft = self.create_post('Borrador', 'Sin publicar.', self.tech, [self.django], status='draft')
+            draft.title = 'Borrador corregido'
+            draft.save()
+        self.assertEqual(callbacks, [])
+        
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.title = 'Optimizar consultas lentas en Django'
+            self.post.save()
+        self.assertEqual(len(callbacks), 1)
+    
+    def test_refresh_does_not_build_full_index(self):
+        """Test que el refresco puntúa solo los posts afectados."""
+        with mock.patch.object(RelatedIndex, 'from_database', side_effect=AssertionError):
+            with self.captureOnCommitCallbacks(execute=True):
+                post = self.create_post(
+                    'Consultas de Django con el ORM', 'Consultas del ORM de Django: índices.',
+                    self.tech, [self.django, self.python],
+                )
+        refreshed = {p.pk: self.related_ids(p) for p in Post.published.all()}
+        call_command('rebuild_related_posts', stdout=StringIO())
+        self.assertEqual(self.related_ids(post)[0], self.post.pk)
+        self.assertEqual(refreshed, {p.pk: self.related_ids(p) for p in Post.published.all()})
+    
+    def test_detail_depends_on_related_posts(self):
+        """Test que la página en caché se invalida al cambiar un relacionado."""
+        url = reverse('post_detail', args=[self.post.slug])
+        self.assertContains(self.client.get(url), 'Notas de la semana')
+        Post.objects.filter(pk=self.same_tags.pk).update(title='Notas corregidas')
+        self.assertContains(self.client.get(url), 'Notas de la semana')
+        
+        page_cache.invalidate(page_cache.post_group(self.same_tags.pk))
+        self.assertContains(self.client.get(url), 'Notas corregidas')
@@ -0,0 +1,308 @@
+"""
+Contador de vistas con escritura diferida (write-behind).
+
+En lugar de ejecutar un UPDATE por cada visita a una publicación, las
+visitas se acumulan en una caché compartida (el alias ``VIEW_COUNT_CACHE``)
+y se vuelcan a ``Post.views_count`` en actualizaciones agrupadas:
+
+- Cada publicación tiene un contador ``viewcount:post:<id>`` que se
+  incrementa con ``cache.incr`` (atómico en los backends ``sqlite``,
+  ``redis`` y ``locmem``).
+- Cuando un contador pasa de 0 a positivo, el id del post se anota en un
+  registro de posts pendientes (``viewcount:dirty:<n>``, con ``n`` tomado
+  de un contador de secuencia). El volcado recorre solo esas entradas.
+- El volcado lee los contadores, aplica los UPDATE y resta lo escrito con
+  ``cache.decr``, de modo que las visitas llegadas mientras tanto quedan
+  para el siguiente. Un cerrojo en la caché evita dos volcados a la vez.
+- Si una posición del registro sigue vacía en el volcado siguiente (un
+  worker interrumpido entre el ``incr`` y el ``set``), se revisan los
+  contadores de todas las publicaciones para no perder ninguno.
+
+Como el estado vive en la caché y no en el proceso, ``manage.py
+flush_view_counts`` (por ejemplo, desde cron cada minuto) vuelca las
+visitas de todos los workers, y las que no se han volcado no se pierden
+al reiniciar un worker. La caché de ``VIEW_COUNT_CACHE`` no debe purgar
+entradas (settings.py la configura sin límite de entradas), y su backend
+necesita un ``incr`` atómico: el de archivos no sirve. Con el backend
+``locmem`` la caché es de cada proceso: solo sirve con un único proceso y
+el comando no ve sus visitas.
+
+Además, cada proceso vuelca al terminar una petición (``request_finished``,
+ya enviada la respuesta) cuando han pasado ``VIEW_COUNT_FLUSH_INTERVAL``
+segundos desde su último volcado o ha registrado
+``VIEW_COUNT_FLUSH_THRESHOLD`` visitas, y al terminar de forma ordenada
+(``atexit``, registrado en ``BlogConfig.ready``).
+
+Configuración (settings.py):
+    VIEW_COUNT_CACHE: alias de ``CACHES`` para las visitas pendientes
+        (``default`` por defecto)
+    VIEW_COUNT_FLUSH_INTERVAL: segundos máximos entre volcados (30 por defecto)
+    VIEW_COUNT_FLUSH_THRESHOLD: visitas del proceso que fuerzan un volcado (100)
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30
+DEFAULT_FLUSH_THRESHOLD = 100
+
+KEY_PREFIX = 'viewcount'
+SEQUENCE_KEY = f'{KEY_PREFIX}:dirty:seq'
+DRAINED_KEY = f'{KEY_PREFIX}:dirty:drained'
+STALLED_KEY = f'{KEY_PREFIX}:dirty:stalled'
+LOCK_KEY = f'{KEY_PREFIX}:lock'
+
+# Segundos tras los que se libera el cerrojo de un volcado interrumpido
+LOCK_TIMEOUT = 60
+
+# Entradas del registro de pendientes leídas por consulta a la caché
+DRAIN_BATCH = 1000
+
+
+def _cache():
+    return caches[getattr(settings, 'VIEW_COUNT_CACHE', 'default')]
+
+
+def backend_warning():
+    """
+    Problema de la caché de visitas pendientes, si lo hay.
+
+    Returns:
+        str: Aviso para el operador, o None si la caché es adecuada
+    """
+    backend = _cache()
+    if isinstance(backend, FileBasedCache):
+        return (
+            'La caché de visitas usa el backend de archivos: su incr no es '
+            'atómico y se pierden visitas concurrentes.'
+        )
+    if isinstance(backend, LocMemCache):
+        return (
+            'La caché de visitas es locmem: no es compartida, solo se vuelcan '
+            'las visitas de este proceso.'
+        )
+    return None
+
+
+def _counter_key(post_id):
+    return f'{KEY_PREFIX}:post:{post_id}'
+
+
+def _dirty_key(position):
+    return f'{KEY_PREFIX}:dirty:{position}'
+
+
+def _incr(key, delta):
+    """``cache.incr`` creando la clave (sin caducidad) si no existe."""
+    cache = _cache()
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, None):
+            return delta
+        return cache.incr(key, delta)
+
+
+class ViewCountBuffer:
+    """
+    Visitas pendientes por publicación guardadas en la caché compartida.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local_views = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def flush_threshold(self):
+        return getattr(settings, 'VIEW_COUNT_FLUSH_THRESHOLD', DEFAULT_FLUSH_THRESHOLD)
+
+    def increment(self, post_id, amount=1):
+        """
+        Registra visitas para una publicación.
+
+        Returns:
+            int: Visitas de esa publicación pendientes de volcar (incluyendo
+                 las recién registradas), para sumarlas al valor leído de
+                 la base de datos.
+        """
+        pending = _incr(_counter_key(post_id), amount)
+        if pending == amount:
+            # Primera visita desde el último volcado: anotar el post
+            self._mark_dirty([post_id])
+        with self._lock:
+            self._local_views += amount
+        return pending
+
+    def _mark_dirty(self, post_ids):
+        cache = _cache()
+        for post_id in post_ids:
+            cache.set(_dirty_key(_incr(SEQUENCE_KEY, 1)), post_id, None)
+
+    def pending_for(self, post_id):
+        """Retorna las visitas aún no volcadas de una publicación."""
+        return _cache().get(_counter_key(post_id), 0)
+
+    def is_flush_due(self):
+        """Indica si este proceso debe volcar (por intervalo o umbral)."""
+        with self._lock:
+            return self._local_views > 0 and (
+                self._local_views >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+    def flush_if_due(self, **kwargs):
+        """Vuelca si toca; receptor de ``request_finished``."""
+        if self.is_flush_due():
+            self.flush()
+
+    def _drain_dirty(self):
+        """
+        Retira del registro los posts pendientes.
+
+        Una posición sin entrada puede ser un incremento cuyo ``set`` aún
+        no ha llegado: se espera a ella hasta el siguiente volcado. Si sigue
+        vacía, su post no se sabe y no se volvería a anotar (solo se anota
+        al pasar su contador de 0 a positivo): se descarta la posición y se
+        añaden los posts con contador pendiente.
+        """
+        cache = _cache()
+        drained = cache.get(DRAINED_KEY, 0)
+        last = cache.get(SEQUENCE_KEY, 0)
+        stalled = cache.get(STALLED_KEY)
+        post_ids = set()
+        position = drained
+        blocked = False
+        lost = False
+        while position < last and not blocked:
+            positions = range(position + 1, min(position + DRAIN_BATCH, last) + 1)
+            entries = cache.get_many([_dirty_key(n) for n in positions])
+            for n in positions:
+                if _dirty_key(n) in entries:
+                    post_ids.add(entries[_dirty_key(n)])
+                elif n != stalled:
+                    cache.set(STALLED_KEY, n, None)
+                    blocked = True
+                    break
+                else:
+                    lost = True
+                position = n
+        if position > drained:
+            cache.set(DRAINED_KEY, position, None)
+            cache.delete_many([_dirty_key(n) for n in range(drained + 1, position + 1)])
+        if lost:
+            post_ids.update(self._pending_posts())
+        return post_ids
+
+    def _pending_posts(self):
+        """Posts con visitas pendientes, revisando el contador de cada uno."""
+        from .models import Post
+
+        cache = _cache()
+        found = set()
+        post_ids = Post.objects.order_by('pk').values_list('pk', flat=True)
+        batch = []
+        for post_id in post_ids.iterator(chunk_size=DRAIN_BATCH):
+            batch.append(post_id)
+            if len(batch) == DRAIN_BATCH:
+                found.update(self._nonzero(cache, batch))
+                batch = []
+        found.update(self._nonzero(cache, batch))
+        return found
+
+    @staticmethod
+    def _nonzero(cache, post_ids):
+        counts = cache.get_many([_counter_key(post_id) for post_id in post_ids])
+        return [post_id for post_id in post_ids if counts.get(_counter_key(post_id), 0) > 0]
+
+    def flush(self):
+        """
+        Vuelca las visitas pendientes de todos los procesos a la base de datos.
+
+        Agrupa las publicaciones por incremento para emitir un único UPDATE
+        por cada valor distinto. Si la escritura falla, las visitas siguen
+        en la caché y los posts se vuelven a anotar como pendientes.
+
+        Returns:
+            tuple: ``(publicaciones, visitas)`` volcadas.
+        """
+        with self._lock:
+            self._local_views = 0
+            self._last_flush = time.monotonic()
+
+        cache = _cache()
+        if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+            return 0, 0
+        try:
+            return self._flush()
+        finally:
+            cache.delete(LOCK_KEY)
+
+    def _flush(self):
+        post_ids = self._drain_dirty()
+        if not post_ids:
+            return 0, 0
+
+        from .models import Post
+
+        cache = _cache()
+        counts = cache.get_many([_counter_key(post_id) for post_id in post_ids])
+        pending = {
+            post_id: counts[_counter_key(post_id)]
+            for post_id in post_ids
+            if counts.get(_counter_key(post_id), 0) > 0
+        }
+        if not pending:
+            return 0, 0
+
+        by_amount = defaultdict(list)
+        for post_id, amount in pending.items():
+            by_amount[amount].append(post_id)
+
+        try:
+            with transaction.atomic():
+                for amount, ids in by_amount.items():
+                    Post.objects.filter(pk__in=ids).update(
+                        views_count=F('views_count') + amount
+                    )
+        except DatabaseError as e:
+            logger.error(f"Error al volcar contadores de vistas: {e}")
+            self._mark_dirty(pending)
+            return 0, 0
+
+        # Restar lo escrito; lo que llegó entre medias queda pendiente
+        again = []
+        for post_id, amount in pending.items():
+            try:
+                if cache.decr(_counter_key(post_id), amount) > 0:
+                    again.append(post_id)
+            except ValueError:
+                pass
+        self._mark_dirty(again)
+        return len(pending), sum(pending.values())
+
+    def clear(self):
+        """Descarta las visitas pendientes sin escribirlas."""
+        post_ids = self._drain_dirty()
+        _cache().delete_many([_counter_key(post_id) for post_id in post_ids])
+        with self._lock:
+            self._local_views = 0
+            self._last_flush = time.monotonic()
+
+
+view_counter = ViewCountBuffer()
@@ -9,28 +9,42 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, F
+from django.db.models import Q, Count, Sum
 from django.http import HttpResponseForbidden
 from django_ratelimit.decorators import ratelimit
 from accounts.decorators import author_required
+from blog_platform.query_inspector import query_budget
 from .models import Post, Category, Tag, Comment
+from .comments import load_comment_page
 from .forms import PostForm, CommentForm, PostSearchForm
+from .page_cache import (
+    cache_anonymous_page, depends_on, count_view_on_hit,
+    post_group, category_group, POSTS, TAXONOMY,
+)
+from .pagination import CursorPaginator, KEYSET_ORDERINGS
+from .related import get_related_posts
+from .search import search_posts
+from .sidebar import get_sidebar_data
+from .view_counter import view_counter
 
+COMMENT_THREADS_PER_PAGE = 20
 
+# Opciones del filtro de tiempo de lectura máximo (minutos)
+READING_TIME_CHOICES = (3, 5, 10, 20)
+
+
+@query_budget(10)
+@cache_anonymous_page(POSTS, TAXONOMY)
 def post_list(request):
     """
     Lista de publicaciones públicas con búsqueda y filtrado.
     """
-    posts = Post.published.all().select_related('author', 'category').prefetch_related('tags')
+    posts = Post.published.summaries().select_related('author', 'category').prefetch_related('tags')
     
-    # Búsqueda
+    # Búsqueda (ordenada por relevancia salvo que se pida otro orden)
     query = request.GET.get('q')
     if query:
-        posts = posts.filter(
-            Q(title__icontains=query) | 
-            Q(content__icontains=query) |
-            Q(excerpt__icontains=query)
-        )
+        posts = search_posts(posts, query)
     
     # Filtro por categoría
     category_slug = request.GET.get('category')
@@ -42,60 +56,76 @@ def post_list(request):
     if tag_slug:
         posts = posts.filter(tags__slug=tag_slug)
     
-    # Ordenamiento
-    order = request.GET.get('order', '-created_at')
-    valid_orders = ['-created_at', 'created_at', '-views_count', 'title']
-    if order in valid_orders:
-        posts = posts.order_by(order)
-    
-    # Paginación
-    paginator = Paginator(posts, 12)
-    page = request.GET.get('page')
-    posts_page = paginator.get_page(page)
+    # Filtro por tiempo de lectura máximo (minutos); solo las opciones del
+    # formulario (otros valores, como '²' o enteros enormes, se ignoran)
+    max_minutes = request.GET.get('max_minutes', '')
+    if max_minutes in {str(minutes) for minutes in READING_TIME_CHOICES}:
+        posts = posts.filter(reading_time__lte=int(max_minutes))
+    else:
+        max_minutes = ''
+    
+    # Ordenamiento (la búsqueda sin orden explícito se ordena por relevancia)
+    order = request.GET.get('order')
+    valid_orders = ['-created_at', 'created_at', '-views_count', 'title', 'reading_time']
+    if order not in valid_orders:
+        order = None if query else '-created_at'
+    
+    # Paginación: por cursor (keyset) para los órdenes válidos, numerada
+    # para los resultados ordenados por relevancia
+    if order:
+        paginator = CursorPaginator(posts, 12, KEYSET_ORDERINGS[order], estimate_total=True)
+        posts_page = paginator.get_page(request.GET.get('cursor'))
+    else:
+        paginator = Paginator(posts, 12)
+        posts_page = paginator.get_page(request.GET.get('page'))
     
-    # Datos para el sidebar
-    categories = Category.objects.annotate(post_count=Count('posts')).filter(post_count__gt=0)
-    popular_tags = Tag.objects.annotate(post_count=Count('posts')).filter(post_count__gt=0)[:10]
-    recent_posts = Post.published.all()[:5]
+    # Parámetros a conservar en los enlaces de paginación
+    pagination_query = request.GET.copy()
+    pagination_query.pop('cursor', None)
+    pagination_query.pop('page', None)
     
     context = {
         'posts': posts_page,
-        'categories': categories,
-        'popular_tags': popular_tags,
-        'recent_posts': recent_posts,
+        'pagination_query': pagination_query.urlencode(),
+        # Datos para el sidebar (categorías, etiquetas populares y recientes)
+        **get_sidebar_data(),
         'query': query,
         'current_category': category_slug,
         'current_tag': tag_slug,
+        'current_max_minutes': max_minutes,
+        'reading_time_choices': READING_TIME_CHOICES,
     }
     
     return render(request, 'blog/post_list.html', context)
 
 
+@query_budget(12)
+@cache_anonymous_page(TAXONOMY)
 @ratelimit(key='user_or_ip', rate='10/h', method='POST', block=True)
 def post_detail(request, slug):
     """
     Detalle de una publicación con comentarios.
     Rate limit: 10 comentarios por hora por usuario o IP.
     """
+    # El cuerpo se sirve ya renderizado (content_html): no se carga content
     post = get_object_or_404(
-        Post.objects.select_related('author', 'category').prefetch_related('tags'),
+        Post.objects.defer('content').select_related('author', 'category').prefetch_related('tags'),
         slug=slug,
         status='published'
     )
     
-    # Incrementar contador de vistas
-    Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-    post.refresh_from_db()
+    # Incrementar contador de vistas (se vuelca a la BD en lotes)
+    post.views_count += view_counter.increment(post.pk)
     
-    # Comentarios (solo los principales, sin respuestas)
-    comments = post.comments.filter(
-        is_approved=True, 
-        parent=None
-    ).select_related('user').prefetch_related('replies')
+    # Dependencias para la caché de páginas anónimas
+    depends_on(request, post_group(post.pk), category_group(post.category_id))
+    count_view_on_hit(request, post.pk)
     
-    # Formulario de comentarios
+    # Formulario de comentarios (y el de respuesta, único para toda la página)
     comment_form = None
+    reply_form = None
     if request.user.is_authenticated:
+        reply_form = CommentForm(auto_id='reply_%s')
         if request.method == 'POST':
             comment_form = CommentForm(request.POST)
             if comment_form.is_valid():
@@ -106,7 +136,7 @@ def post_detail(request, slug):
                 # Si es una respuesta
                 parent_id = request.POST.get('parent_id')
                 if parent_id:
-                    parent_comment = get_object_or_404(Comment, id=parent_id)
+                    parent_comment = get_object_or_404(Comment, id=parent_id, post=post)
                     comment.parent = parent_comment
                 
                 comment.save()
@@ -115,21 +145,26 @@ def post_detail(request, slug):
         else:
             comment_form = CommentForm()
     
-    # Posts relacionados (misma categoría)
-    related_posts = Post.published.filter(
-        category=post.category
-    ).exclude(pk=post.pk)[:3]
+    # Hilos de comentarios aprobados, paginados en SQL, con sus respuestas
+    comments = load_comment_page(post, request.GET.get('comments_page'), COMMENT_THREADS_PER_PAGE)
+    
+    # Posts relacionados (vecinos precalculados); la página enlaza a ellos,
+    # así que depende también de sus grupos
+    related_posts = get_related_posts(post)
+    depends_on(request, *(post_group(related.pk) for related in related_posts))
     
     context = {
         'post': post,
         'comments': comments,
         'comment_form': comment_form,
+        'reply_form': reply_form,
         'related_posts': related_posts,
     }
     
     return render(request, 'blog/post_detail.html', context)
 
 
+@query_budget(17)
 @login_required
 @author_required
 def post_create(request):
@@ -159,6 +194,7 @@ def post_create(request):
     })
 
 
+@query_budget(15)
 @login_required
 def post_edit(request, slug):
     """
@@ -168,7 +204,7 @@ def post_edit(request, slug):
     post = get_object_or_404(Post, slug=slug)
     
     # Verificar permisos: debe ser el autor o admin
-    if post.author != request.user and not request.user.is_admin:
+    if post.author_id != request.user.pk and not request.user.is_admin:
         messages.error(request, 'No tienes permiso para editar esta publicación.')
         return HttpResponseForbidden('No tienes permiso para editar esta publicación.')
     
@@ -188,6 +224,7 @@ def post_edit(request, slug):
     })
 
 
+@query_budget(14)
 @login_required
 def post_delete(request, slug):
     """
@@ -197,7 +234,7 @@ def post_delete(request, slug):
     post = get_object_or_404(Post, slug=slug)
     
     # Verificar permisos
-    if post.author != request.user and not request.user.is_admin:
+    if post.author_id != request.user.pk and not request.user.is_admin:
         messages.error(request, 'No tienes permiso para eliminar esta publicación.')
         return HttpResponseForbidden('No tienes permiso para eliminar esta publicación.')
     
@@ -210,41 +247,44 @@ def post_delete(request, slug):
     return render(request, 'blog/post_confirm_delete.html', {'post': post})
 
 
+@query_budget(7)
 @login_required
 def my_posts(request):
     """
     Lista de publicaciones del usuario actual.
     """
-    posts = Post.objects.filter(author=request.user).select_related('category')
-    
-    # Estadísticas
-    total_count = posts.count()
-    published_count = posts.filter(status='published').count()
-    draft_count = posts.filter(status='draft').count()
-    total_views = sum(post.views_count for post in posts)
+    posts = Post.objects.summaries().filter(author=request.user).select_related('category')
+    
+    # Estadísticas (una sola consulta de agregación)
+    stats = posts.aggregate(
+        total_count=Count('pk'),
+        published_count=Count('pk', filter=Q(status='published')),
+        draft_count=Count('pk', filter=Q(status='draft')),
+        total_views=Sum('views_count'),
+    )
     
     # Filtro por estado
     status_filter = request.GET.get('status')
     if status_filter in ['draft', 'published']:
         posts = posts.filter(status=status_filter)
     
-    # Paginación
-    paginator = Paginator(posts, 10)
-    page = request.GET.get('page')
-    posts_page = paginator.get_page(page)
+    # Paginación por cursor (más recientes primero)
+    paginator = CursorPaginator(posts, 10, KEYSET_ORDERINGS['-created_at'])
+    posts_page = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'posts': posts_page,
         'status_filter': status_filter,
-        'total_count': total_count,
-        'published_count': published_count,
-        'draft_count': draft_count,
-        'total_views': total_views,
+        'total_count': stats['total_count'],
+        'published_count': stats['published_count'],
+        'draft_count': stats['draft_count'],
+        'total_views': stats['total_views'] or 0,
     }
     
     return render(request, 'blog/my_posts.html', context)
 
 
+@query_budget(10)
 @login_required
 def comment_delete(request, comment_id):
     """
@@ -254,7 +294,7 @@ def comment_delete(request, comment_id):
     comment = get_object_or_404(Comment, id=comment_id)
     
     # Verificar permisos
-    if comment.user != request.user and not request.user.is_admin:
+    if comment.user_id != request.user.pk and not request.user.is_admin:
         messages.error(request, 'No tienes permiso para eliminar este comentario.')
         return HttpResponseForbidden('No tienes permiso para eliminar este comentario.')
     
@@ -270,6 +310,8 @@ def comment_delete(request, comment_id):
     })
 
 
+@query_budget(7)
+@cache_anonymous_page(POSTS, TAXONOMY)
 def category_list(request):
     """
     Lista de todas las categorías con conteo de posts.
@@ -286,6 +328,8 @@ def category_list(request):
     })
 
 
+@query_budget(9)
+@cache_anonymous_page(POSTS, TAXONOMY)
 def tag_list(request):
     """
     Lista de todas las etiquetas con conteo de posts.
@@ -0,0 +1,235 @@
+"""
+Backends de caché propios del proyecto.
+
+``SQLiteCache`` guarda las entradas en un archivo SQLite local en modo WAL,
+de modo que todos los workers de gunicorn de un mismo host comparten la
+caché (contadores de rate limiting, caché de páginas, sidebar...) sin
+necesidad de un servidor externo. A diferencia de ``FileBasedCache``,
+``incr``/``decr`` y ``add`` son atómicos.
+
+Uso en settings.py:
+    CACHES = {
+        'default': {
+            'BACKEND': 'blog_platform.cache_backends.SQLiteCache',
+            'LOCATION': BASE_DIR / 'cache' / 'cache.sqlite3',
+        }
+    }
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+
+# Cada cuántas escrituras por proceso se revisa si hay que purgar
+CULL_EVERY = 100
+
+
+class SQLiteCache(BaseCache):
+    """
+    Caché compartida entre procesos respaldada por un archivo SQLite.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = Path(location)
+        self._local = threading.local()
+        self._writes = 0
+
+    # Conexión
+
+    def _connection(self):
+        """Retorna la conexión del hilo actual (una por hilo y proceso)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._path), timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries(expires)'
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode(value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        return pickle.loads(value)
+
+    @staticmethod
+    def _alive(expires, now=None):
+        return expires is None or expires > (now or time.time())
+
+    # API de caché
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection().execute(
+            'INSERT INTO cache_entries(key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache_entries.expires IS NOT NULL AND cache_entries.expires <= ?',
+            (key, self._encode(value), self.get_backend_timeout(timeout), now)
+        )
+        self._after_write()
+        return cursor.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or not self._alive(row[1]):
+            return default
+        return self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._connection().execute(
+            'INSERT OR REPLACE INTO cache_entries(key, value, expires) VALUES (?, ?, ?)',
+            (key, self._encode(value), self.get_backend_timeout(timeout))
+        )
+        self._after_write()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache_entries SET expires = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'DELETE FROM cache_entries WHERE key = ?', (key,)
+        )
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and self._alive(row[0])
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or not self._alive(row[1]):
+                raise ValueError(f"Key '{key}' not found.")
+            new_value = self._decode(row[0]) + delta
+            conn.execute(
+                'UPDATE cache_entries SET value = ? WHERE key = ?',
+                (self._encode(new_value), key)
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return new_value
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ', '.join('?' * len(key_map))
+        rows = self._connection().execute(
+            f'SELECT key, value, expires FROM cache_entries WHERE key IN ({placeholders})',
+            list(key_map)
+        ).fetchall()
+        now = time.time()
+        return {
+            key_map[key]: self._decode(value)
+            for key, value, expires in rows
+            if self._alive(expires, now)
+        }
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._encode(value), expires)
+            for key, value in data.items()
+        ]
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache_entries(key, value, expires) VALUES (?, ?, ?)',
+                rows
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        self._after_write()
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            placeholders = ', '.join('?' * len(keys))
+            self._connection().execute(
+                f'DELETE FROM cache_entries WHERE key IN ({placeholders})', keys
+            )
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')
+
+    def close(self, **kwargs):
+        # La conexión se reutiliza entre peticiones del mismo hilo
+        pass
+
+    # Purga
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % CULL_EVERY == 0:
+            self._cull()
+
+    def _cull(self):
+        """
+        Elimina entradas expiradas y, si se supera el máximo, las que antes
+        expiran.
+
+        Las entradas sin caducidad (``timeout=None``: versiones de la caché
+        de páginas, contadores) no cuentan para ``MAX_ENTRIES`` ni se
+        purgan: perderlas no es un fallo de caché sino pérdida de datos.
+        """
+        conn = self._connection()
+        conn.execute(
+            'DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?',
+            (time.time(),)
+        )
+        count = conn.execute(
+            'SELECT COUNT(*) FROM cache_entries WHERE expires IS NOT NULL'
+        ).fetchone()[0]
+        if count > self._max_entries:
+            to_delete = count // self._cull_frequency if self._cull_frequency else count
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries WHERE expires IS NOT NULL '
+                'ORDER BY expires LIMIT ?)',
+                (to_delete,)
+            )
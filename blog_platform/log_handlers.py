@@ -0,0 +1,228 @@
+"""
+Handlers de logging propios del proyecto.
+
+``ReopeningRotatingFileHandler`` es un ``RotatingFileHandler`` que, como
+``WatchedFileHandler``, detecta que su archivo fue renombrado o eliminado
+por otro proceso (p. ej. al archivar un log desde el panel de
+administración) y lo reabre antes de escribir el siguiente registro.
+Así todos los workers dejan de escribir en el archivo archivado sin
+necesidad de reiniciarlos ni de enviarles señales. La rotación se hace
+con un lock de archivo (``<log>.lock``) para que varios procesos no
+roten el mismo log a la vez.
+
+``queued_file_handler`` envuelve ese handler en un ``QueueHandler`` con
+cola acotada: el hilo de la petición solo formatea el registro y lo
+encola, y un ``QueueListener`` en segundo plano hace la escritura. Si la
+cola está llena el registro se descarta y se contabiliza (ver
+``get_queue_stats``) en lugar de bloquear la petición.
+
+Los hilos no sobreviven a un ``fork`` (p. ej. gunicorn con ``--preload``,
+que configura el logging en el maestro): el listener se arranca con el
+primer registro de cada proceso, y en el hijo de un fork el handler
+recibe una cola y un listener nuevos (``os.register_at_fork``).
+
+Uso en settings.LOGGING:
+    'file_general': {
+        '()': 'blog_platform.log_handlers.queued_file_handler',
+        'filename': BASE_DIR / 'logs' / 'general.log',
+        'maxBytes': 1024 * 1024 * 10,
+        'backupCount': 5,
+        'queue_size': 10000,
+        'formatter': 'verbose',
+    }
+"""
+
+import atexit
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock entre procesos
+    fcntl = None
+
+DEFAULT_QUEUE_SIZE = 10000
+
+# Handlers con cola creados en este proceso (para estadísticas y parada)
+_queued_handlers = []
+
+
+class ReopeningRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler que reabre el archivo si ya no es el de su ruta.
+    """
+
+    def _reopen_if_needed(self):
+        if self.stream is None:
+            return
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self.stream.fileno())
+        if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            # FileHandler.emit abre de nuevo la ruta si el stream es None
+            self.stream.close()
+            self.stream = None
+
+    def emit(self, record):
+        try:
+            self._reopen_if_needed()
+        except OSError:
+            self.handleError(record)
+            return
+        super().emit(record)
+
+    def doRollover(self):
+        if fcntl is None:
+            return super().doRollover()
+
+        with open(f'{self.baseFilename}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Otro proceso pudo rotar mientras esperábamos el lock
+                self._reopen_if_needed()
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.stream.seek(0, os.SEEK_END) >= self.maxBytes:
+                    super().doRollover()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler que descarta (y cuenta) los registros si la cola está llena.
+    """
+
+    def __init__(self, queue_obj):
+        super().__init__(queue_obj)
+        self.listener = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        # Proceso en el que corre el listener (None: sin arrancar)
+        self._pid = None
+
+    def start(self):
+        """Arranca el listener en este proceso si aún no lo está."""
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self.listener.start()
+                self._pid = os.getpid()
+
+    def reset_after_fork(self):
+        """
+        Prepara el handler en el hijo de un fork.
+
+        El hilo del listener no existe en el hijo y la cola pudo quedar
+        con registros o un lock tomados por el padre: se sustituyen por
+        unos nuevos, que arrancan con el primer registro.
+        """
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self.queue = queue.Queue(self.queue.maxsize)
+        if self.listener is not None:
+            self.listener = DrainingQueueListener(self.queue, *self.listener.handlers)
+        self._pid = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def enqueue(self, record):
+        if self.listener is not None and self._pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return
+        with self._stats_lock:
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener que espera a que haya hueco para el centinela al parar."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def queued_file_handler(filename, maxBytes=0, backupCount=0, encoding='utf-8',
+                        queue_size=DEFAULT_QUEUE_SIZE, enabled=True):
+    """
+    Crea un handler de archivo rotativo que escribe en un hilo en segundo plano.
+
+    Args:
+        filename: Ruta del log
+        maxBytes, backupCount: Igual que en ``RotatingFileHandler``
+        encoding (str): Codificación del archivo
+        queue_size (int): Registros pendientes máximos antes de descartar
+        enabled (bool): Si es False, retorna el handler de archivo síncrono
+
+    Returns:
+        logging.Handler
+    """
+    target = ReopeningRotatingFileHandler(
+        filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True
+    )
+    if not enabled:
+        return target
+
+    # El listener arranca con el primer registro del proceso que lo usa
+    handler = BoundedQueueHandler(queue.Queue(queue_size))
+    handler.listener = DrainingQueueListener(handler.queue, target)
+    _queued_handlers.append(handler)
+    return handler
+
+
+def get_queue_stats():
+    """
+    Retorna las métricas de los handlers con cola de este proceso.
+
+    Returns:
+        list: Un dict por handler con ``name``, ``filename``, ``enqueued``,
+              ``dropped``, ``pending``, ``max_depth`` y ``capacity``
+    """
+    stats = []
+    for handler in _queued_handlers:
+        target = handler.listener.handlers[0]
+        stats.append({
+            'name': handler.name or os.path.basename(target.baseFilename),
+            'filename': target.baseFilename,
+            'enqueued': handler.enqueued,
+            'dropped': handler.dropped,
+            'pending': handler.queue.qsize(),
+            'max_depth': handler.max_depth,
+            'capacity': handler.queue.maxsize,
+        })
+    return stats
+
+
+def iter_file_handlers():
+    """Retorna los handlers de archivo que escriben desde un hilo en segundo plano."""
+    return [handler.listener.handlers[0] for handler in _queued_handlers]
+
+
+def _reset_after_fork():
+    for handler in _queued_handlers:
+        handler.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@atexit.register
+def stop_listeners():
+    """Escribe los registros pendientes y detiene los hilos de escritura."""
+    for handler in _queued_handlers:
+        if handler.listener._thread is not None:
+            handler.listener.stop()
+        handler.listener.handlers[0].close()
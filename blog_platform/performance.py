@@ -0,0 +1,216 @@
+"""
+Instrumentación de rendimiento por petición.
+
+``PerformanceMiddleware`` mide en cada petición el tiempo total, el número
+y el tiempo de las consultas SQL, el tiempo de renderizado de plantillas y
+el tamaño de la respuesta, y los agrega por nombre de URL
+(``post_list``, ``post_detail``, ``admin_panel:logs``...) en memoria.
+
+- SQL: ``connection.execute_wrapper`` sobre todas las conexiones, de modo
+  que funciona también con ``DEBUG = False``.
+- Plantillas: el backend ``TimedDjangoTemplates`` (configurado en
+  ``TEMPLATES``) cronometra cada ``render`` de nivel superior; las
+  plantillas incluidas con ``{% include %}`` quedan dentro de ese tiempo.
+
+Por vista se conservan las últimas ``PERF_SAMPLE_SIZE`` muestras, de las
+que se calculan p50/p95/p99. Los datos son por proceso: con varios workers
+de gunicorn cada uno tiene los suyos.
+
+Configuración (settings.py):
+    PERF_MONITOR_ENABLED: activa la instrumentación (True por defecto)
+    PERF_SAMPLE_SIZE: muestras por vista que se conservan (1000 por defecto)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+DEFAULT_SAMPLE_SIZE = 1000
+PERCENTILES = (50, 95, 99)
+UNRESOLVED = '<unresolved>'
+
+# Métricas de cada muestra, en el orden en que se guardan
+METRICS = ('wall_ms', 'sql_count', 'sql_ms', 'template_ms', 'response_bytes')
+
+_current = ContextVar('perf_request_timings', default=None)
+
+
+class RequestTimings:
+    """Acumuladores de la petición en curso."""
+    __slots__ = ('sql_count', 'sql_time', 'template_time', 'template_depth')
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class PerformanceRegistry:
+    """
+    Muestras recientes por vista, protegidas por un lock para los
+    servidores con hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, view_name, sample):
+        """Añade una muestra (tupla en el orden de ``METRICS``)."""
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                size = getattr(settings, 'PERF_SAMPLE_SIZE', DEFAULT_SAMPLE_SIZE)
+                samples = self._samples[view_name] = deque(maxlen=size)
+            samples.append(sample)
+            self._counts[view_name] = self._counts.get(view_name, 0) + 1
+
+    def snapshot(self):
+        """
+        Retorna los percentiles de cada vista.
+
+        Returns:
+            list: Un dict por vista con ``view``, ``requests`` (total desde
+                  el arranque), ``samples`` y, por métrica, un dict con
+                  ``p50``, ``p95``, ``p99``, ``max`` y ``avg``
+        """
+        with self._lock:
+            data = {name: list(samples) for name, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        result = []
+        for name, samples in sorted(data.items()):
+            entry = {'view': name, 'requests': counts[name], 'samples': len(samples)}
+            for position, metric in enumerate(METRICS):
+                values = sorted(s[position] for s in samples if s[position] is not None)
+                summary = {f'p{pct}': percentile(values, pct) for pct in PERCENTILES}
+                summary['max'] = values[-1] if values else None
+                summary['avg'] = sum(values) / len(values) if values else None
+                entry[metric] = summary
+            result.append(entry)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+registry = PerformanceRegistry()
+
+
+def get_stats():
+    """Percentiles por vista del proceso actual (ver ``PerformanceRegistry.snapshot``)."""
+    return {
+        'pid': os.getpid(),
+        'sample_size': getattr(settings, 'PERF_SAMPLE_SIZE', DEFAULT_SAMPLE_SIZE),
+        'views': registry.snapshot(),
+    }
+
+
+def _time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.sql_count += 1
+        timings.sql_time += time.perf_counter() - start
+
+
+class TimedTemplate(Template):
+    """Plantilla del backend de Django que suma su tiempo de renderizado."""
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Solo cuenta el render exterior si una plantilla renderiza otra
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if timings.template_depth == 0:
+                timings.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Backend ``DjangoTemplates`` que devuelve plantillas cronometradas."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name
+
+
+def _response_size(response):
+    if response.streaming:
+        return None
+    return len(response.content)
+
+
+class PerformanceMiddleware:
+    """
+    Registra tiempo total, SQL, plantillas y tamaño de cada respuesta.
+
+    Debe ir la primera en ``MIDDLEWARE`` para que el tiempo total incluya
+    el resto de middlewares.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'PERF_MONITOR_ENABLED', True):
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        wall_time = time.perf_counter() - start
+
+        registry.record(_view_name(request), (
+            wall_time * 1000,
+            timings.sql_count,
+            timings.sql_time * 1000,
+            timings.template_time * 1000,
+            _response_size(response),
+        ))
+        return response
@@ -0,0 +1,202 @@
+"""
+Detección de consultas N+1 y presupuestos de consultas por vista.
+
+``QueryInspector`` registra las consultas SQL ejecutadas dentro de un
+bloque agrupándolas por sentencia normalizada (literales sustituidos por
+``?``) y por lugar de origen: la línea de plantilla que se estaba
+renderizando o, si no, la primera línea de código del proyecto en la pila.
+La misma sentencia repetida desde el mismo lugar varias veces es el patrón
+típico de N+1 (``{{ post.author.get_full_name }}`` dentro de un bucle sin
+``select_related``).
+
+Cada vista puede declarar su presupuesto máximo de consultas con el
+decorador ``query_budget``:
+
+    @query_budget(6)
+    @login_required
+    def my_posts(request):
+        ...
+
+- En desarrollo, ``QueryInspectorMiddleware`` registra un aviso en el
+  logger ``blog_platform.queries`` cuando una petición supera el
+  presupuesto de su vista o repite consultas.
+- En los tests, ``QueryBudgetTestMixin.assertWithinQueryBudget`` hace la
+  petición y falla si se supera el presupuesto o se detecta un N+1.
+
+Configuración (settings.py):
+    QUERY_INSPECTOR_ENABLED: activa el middleware (igual que DEBUG por defecto)
+    NPLUSONE_THRESHOLD: repeticiones a partir de las que se avisa (5 por defecto)
+"""
+
+import logging
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('blog_platform.queries')
+
+DEFAULT_NPLUSONE_THRESHOLD = 5
+
+# Literales que varían entre repeticiones de la misma consulta
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+
+_THIS_FILE = Path(__file__).resolve()
+
+
+def normalize_sql(sql):
+    """Sustituye los literales de una sentencia SQL por ``?``."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+def _project_roots():
+    return str(Path(settings.BASE_DIR).resolve()), sys.prefix, sys.base_prefix
+
+
+def call_site():
+    """
+    Lugar del proyecto que originó la consulta en curso.
+
+    Returns:
+        str: ``plantilla:línea`` si se está renderizando una plantilla, o
+             ``archivo:línea`` del primer marco de la pila en el proyecto
+    """
+    base_dir, prefix, base_prefix = _project_roots()
+    frame = sys._getframe(1)
+    project_frame = None
+    while frame is not None:
+        code = frame.f_code
+        # Nodo de plantilla en curso (el más interno)
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f'{origin.template_name or origin.name}:{token.lineno}'
+        if project_frame is None:
+            filename = code.co_filename
+            if (filename.startswith(base_dir) and not filename.startswith((prefix, base_prefix))
+                    and Path(filename).resolve() != _THIS_FILE):
+                project_frame = frame
+        frame = frame.f_back
+    if project_frame is None:
+        return '<desconocido>'
+    filename = Path(project_frame.f_code.co_filename).relative_to(base_dir)
+    return f'{filename}:{project_frame.f_lineno}'
+
+
+class QueryInspector:
+    """
+    Registra las consultas ejecutadas en todas las conexiones dentro del
+    bloque ``with``.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements = Counter()
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+
+    def _record(self, execute, sql, params, many, context):
+        self.count += 1
+        self.statements[(call_site(), normalize_sql(sql))] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold=None):
+        """
+        Consultas repetidas desde el mismo lugar (posibles N+1).
+
+        Returns:
+            list: Tuplas ``(lugar, sql normalizado, veces)``, más repetidas primero
+        """
+        if threshold is None:
+            threshold = getattr(settings, 'NPLUSONE_THRESHOLD', DEFAULT_NPLUSONE_THRESHOLD)
+        return [
+            (site, sql, times)
+            for (site, sql), times in self.statements.most_common()
+            if times >= threshold
+        ]
+
+    def problems(self, budget=None, threshold=None):
+        """Descripción de los presupuestos superados y los N+1 detectados."""
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f'{self.count} consultas (presupuesto: {budget})')
+        for site, sql, times in self.repeated(threshold):
+            problems.append(f'N+1 en {site}: {times} veces {sql}')
+        return problems
+
+
+def query_budget(max_queries):
+    """Declara el número máximo de consultas de una vista."""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func):
+    """Presupuesto declarado de una vista (None si no tiene)."""
+    return getattr(view_func, 'query_budget', None)
+
+
+class QueryInspectorMiddleware:
+    """
+    Avisa en el log de las peticiones que superan el presupuesto de su
+    vista o repiten consultas. Pensado para desarrollo.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', settings.DEBUG):
+            return self.get_response(request)
+
+        with QueryInspector() as inspector:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        budget = get_query_budget(match.func) if match else None
+        for problem in inspector.problems(budget):
+            logger.warning(f'{request.method} {request.path}: {problem}')
+        return response
+
+
+class QueryBudgetTestMixin:
+    """Aserciones de presupuesto de consultas para ``TestCase``."""
+
+    def assertWithinQueryBudget(self, url, method='get', data=None, threshold=None, **extra):
+        """
+        Hace la petición con ``self.client`` y falla si la vista no declara
+        presupuesto, lo supera o repite consultas.
+
+        Returns:
+            HttpResponse: La respuesta, para más comprobaciones
+        """
+        with QueryInspector() as inspector:
+            response = getattr(self.client, method)(url, data, **extra)
+        budget = get_query_budget(response.resolver_match.func)
+        if budget is None:
+            self.fail(f'{response.resolver_match.view_name} no declara query_budget')
+        problems = inspector.problems(budget, threshold)
+        if problems:
+            self.fail(f'{method.upper()} {url}:\n' + '\n'.join(problems))
+        return response
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from dotenv import load_dotenv
 
@@ -54,6 +55,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog_platform.performance.PerformanceMiddleware',
+    'blog_platform.query_inspector.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,7 +70,9 @@ ROOT_URLCONF = 'blog_platform.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates con medición del tiempo de renderizado
+        'BACKEND': 'blog_platform.performance.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -94,6 +99,64 @@ DATABASES = {
 }
 
 
+# Cache
+# CACHE_BACKEND:
+#   locmem - memoria de cada proceso (no compartida entre workers)
+#   file   - archivos en disco, compartida entre workers del mismo host
+#   sqlite - archivo SQLite compartido entre workers del mismo host (incr atómico)
+#   redis  - servidor Redis (requiere el paquete redis; si no está, usa sqlite)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', '')
+CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', 300))  # segundos
+# Entradas con caducidad antes de purgar (locmem, file y sqlite; Django usa 300)
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'blog-platform'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', BASE_DIR / 'cache' / 'files'),
+    'sqlite': ('blog_platform.cache_backends.SQLiteCache', BASE_DIR / 'cache' / 'cache.sqlite3'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+
+if CACHE_BACKEND == 'redis' and importlib.util.find_spec('redis') is None:
+    CACHE_BACKEND, CACHE_LOCATION = 'sqlite', ''
+
+_cache_class, _cache_location = CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKENDS['locmem'])
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_class,
+        'LOCATION': CACHE_LOCATION or str(_cache_location),
+        'TIMEOUT': CACHE_TIMEOUT,
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'blog_platform'),
+    }
+}
+if CACHE_BACKEND != 'redis':
+    # RedisCache pasa OPTIONS al cliente; los demás purgan al superar MAX_ENTRIES
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': CACHE_MAX_ENTRIES}
+
+# Visitas pendientes del contador de vistas: alias propio que nunca purga
+# entradas por número (una entrada purgada sería una visita perdida). El
+# backend de archivos no tiene incr atómico: en su lugar se usa SQLite.
+VIEW_COUNT_CACHE = 'view_counts'
+VIEW_COUNT_CACHE_LOCATIONS = {
+    'locmem': 'blog-platform-view-counts',
+    'sqlite': BASE_DIR / 'cache' / 'view_counts.sqlite3',
+    'redis': CACHE_LOCATION or CACHE_BACKENDS['redis'][1],
+}
+_view_count_backend = {'file': 'sqlite'}.get(CACHE_BACKEND, CACHE_BACKEND)
+if _view_count_backend not in VIEW_COUNT_CACHE_LOCATIONS:
+    _view_count_backend = 'locmem'
+CACHES[VIEW_COUNT_CACHE] = {
+    'BACKEND': CACHE_BACKENDS[_view_count_backend][0],
+    'LOCATION': str(VIEW_COUNT_CACHE_LOCATIONS[_view_count_backend]),
+    'TIMEOUT': None,
+    'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'blog_platform'),
+}
+if _view_count_backend != 'redis':
+    CACHES[VIEW_COUNT_CACHE]['OPTIONS'] = {'MAX_ENTRIES': 2 ** 62}
+
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
@@ -214,7 +277,38 @@ RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = 'default'
 RATELIMIT_VIEW = 'blog_platform.views.ratelimit_error'
 
-# Logging
+# Contador de vistas (escritura diferida)
+VIEW_COUNT_FLUSH_INTERVAL = int(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 30))  # segundos
+VIEW_COUNT_FLUSH_THRESHOLD = int(os.getenv('VIEW_COUNT_FLUSH_THRESHOLD', 100))  # visitas, por proceso
+
+# Caché del sidebar de publicaciones
+SIDEBAR_CACHE_TIMEOUT = int(os.getenv('SIDEBAR_CACHE_TIMEOUT', 300))  # segundos
+
+# Caché de las estadísticas del dashboard de administración
+DASHBOARD_STATS_TIMEOUT = int(os.getenv('DASHBOARD_STATS_TIMEOUT', 60))  # segundos
+
+# Caché de páginas completas para visitantes anónimos
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'True') == 'True'
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 600))  # segundos
+
+# Índice SQLite de logs del panel de administración (vacío: logs/log_index.sqlite3)
+LOG_STORE_PATH = os.getenv('LOG_STORE_PATH', '')
+
+# Archivos comprimidos que se conservan al limpiar un log desde el panel
+LOG_ARCHIVE_KEEP = int(os.getenv('LOG_ARCHIVE_KEEP', 5))
+
+# Logging: escritura en archivo desde un hilo en segundo plano con cola acotada
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'True') == 'True'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # registros pendientes
+
+# Métricas de rendimiento por petición (en memoria, por proceso)
+PERF_MONITOR_ENABLED = os.getenv('PERF_MONITOR_ENABLED', 'True') == 'True'
+PERF_SAMPLE_SIZE = int(os.getenv('PERF_SAMPLE_SIZE', 1000))  # muestras por vista
+
+# Detección de N+1 y presupuestos de consultas por vista (avisos en el log)
+QUERY_INSPECTOR_ENABLED = os.getenv('QUERY_INSPECTOR_ENABLED', str(DEBUG)) == 'True'
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', 5))  # repeticiones
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -244,34 +338,42 @@ LOGGING = {
         },
         'file_general': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'blog_platform.log_handlers.queued_file_handler',
             'filename': BASE_DIR / 'logs' / 'general.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 5,
+            'queue_size': LOG_QUEUE_SIZE,
+            'enabled': LOG_ASYNC,
             'formatter': 'verbose',
         },
         'file_error': {
             'level': 'ERROR',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'blog_platform.log_handlers.queued_file_handler',
             'filename': BASE_DIR / 'logs' / 'error.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 5,
+            'queue_size': LOG_QUEUE_SIZE,
+            'enabled': LOG_ASYNC,
             'formatter': 'verbose',
         },
         'file_security': {
             'level': 'WARNING',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'blog_platform.log_handlers.queued_file_handler',
             'filename': BASE_DIR / 'logs' / 'security.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 5,
+            'queue_size': LOG_QUEUE_SIZE,
+            'enabled': LOG_ASYNC,
             'formatter': 'verbose',
         },
         'file_database': {
             'level': 'DEBUG',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'blog_platform.log_handlers.queued_file_handler',
             'filename': BASE_DIR / 'logs' / 'database.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 3,
+            'queue_size': LOG_QUEUE_SIZE,
+            'enabled': LOG_ASYNC,
             'formatter': 'verbose',
         },
     },
@@ -310,5 +412,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'blog_platform.queries': {
+            'handlers': ['console', 'file_database'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
     },
 }
@@ -0,0 +1,264 @@
+"""
+Tests de la configuración del proyecto.
+
+Tests de:
+- Backend de caché compartida SQLiteCache
+- Handlers de logging con cola y rotación entre procesos
+- Middleware de métricas de rendimiento por petición
+- Avisos de N+1 y presupuestos de consultas en desarrollo
+"""
+
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from blog_platform import log_handlers
+from blog_platform import performance
+from blog_platform.cache_backends import SQLiteCache
+from blog_platform.log_handlers import (
+    BoundedQueueHandler, ReopeningRotatingFileHandler, queued_file_handler,
+)
+
+
+class SQLiteCacheTestCase(SimpleTestCase):
+    """Tests para el backend de caché SQLite."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.location = Path(self.tmpdir) / 'cache.sqlite3'
+        self.cache = SQLiteCache(self.location, {'TIMEOUT': 60})
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_basic_operations(self):
+        """Test de set, get, add, delete y get_many."""
+        self.cache.set('a', {'valor': 1})
+        self.assertEqual(self.cache.get('a'), {'valor': 1})
+        self.assertFalse(self.cache.add('a', 'otro'))
+        self.assertTrue(self.cache.add('b', 2))
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': {'valor': 1}, 'b': 2})
+        self.assertTrue(self.cache.delete('a'))
+        self.assertIsNone(self.cache.get('a'))
+    
+    def test_expired_entries_are_ignored(self):
+        """Test que las entradas expiradas no se devuelven y add las reemplaza."""
+        self.cache.set('a', 1, timeout=0)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertFalse(self.cache.has_key('a'))
+        self.assertTrue(self.cache.add('a', 2))
+        self.assertEqual(self.cache.get('a'), 2)
+    
+    def test_shared_between_instances(self):
+        """Test que dos instancias (como dos workers) comparten los datos."""
+        other = SQLiteCache(self.location, {'TIMEOUT': 60})
+        self.cache.set('compartida', 'sí')
+        self.assertEqual(other.get('compartida'), 'sí')
+    
+    def test_incr_is_atomic(self):
+        """Test que incr no pierde incrementos con escrituras concurrentes."""
+        self.cache.set('contador', 0)
+        
+        def worker():
+            instance = SQLiteCache(self.location, {'TIMEOUT': 60})
+            for _ in range(50):
+                instance.incr('contador')
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(self.cache.get('contador'), 200)
+        with self.assertRaises(ValueError):
+            self.cache.incr('inexistente')
+    
+    def test_cull_keeps_entries_without_expiry(self):
+        """Test que la purga por tamaño no elimina entradas sin caducidad."""
+        small = SQLiteCache(self.location, {'TIMEOUT': 60, 'OPTIONS': {'MAX_ENTRIES': 10}})
+        for i in range(20):
+            small.set(f'version:{i}', i, None)
+        for i in range(30):
+            small.set(f'pagina:{i}', i)
+        small._cull()
+        
+        self.assertEqual(len(small.get_many([f'version:{i}' for i in range(20)])), 20)
+        # Se purga un tercio (CULL_FREQUENCY) de las que caducan
+        self.assertEqual(len(small.get_many([f'pagina:{i}' for i in range(30)])), 20)
+
+
+class LogHandlersTestCase(SimpleTestCase):
+    """Tests para los handlers de logging asíncronos."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.log_path = Path(self.tmpdir) / 'general.log'
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def make_record(self, message):
+        return logging.LogRecord('test', logging.INFO, __file__, 1, message, None, None)
+    
+    def test_bounded_queue_drops_when_full(self):
+        """Test que con la cola llena se descarta y contabiliza el registro."""
+        handler = BoundedQueueHandler(queue.Queue(2))
+        for i in range(5):
+            handler.handle(self.make_record(f'mensaje {i}'))
+        
+        self.assertEqual(handler.enqueued, 2)
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(handler.max_depth, 2)
+    
+    def test_queued_handler_writes_in_background(self):
+        """Test que los registros encolados se escriben al parar el listener."""
+        handler = queued_file_handler(self.log_path, queue_size=100)
+        handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        try:
+            for i in range(3):
+                handler.handle(self.make_record(f'mensaje {i}'))
+            handler.listener.stop()
+        finally:
+            handler.listener.handlers[0].close()
+            log_handlers._queued_handlers.remove(handler)
+        
+        self.assertEqual(
+            self.log_path.read_text(encoding='utf-8').splitlines(),
+            ['[INFO] mensaje 0', '[INFO] mensaje 1', '[INFO] mensaje 2']
+        )
+    
+    @skipUnless(hasattr(os, 'fork'), 'requiere os.fork')
+    def test_queued_handler_writes_after_fork(self):
+        """Test que un proceso hijo (fork) arranca su propio listener."""
+        handler = queued_file_handler(self.log_path, queue_size=100)
+        handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        try:
+            handler.handle(self.make_record('padre'))
+            pid = os.fork()
+            if pid == 0:
+                # Hijo: sin el hilo del padre; salir sin los atexit del runner
+                try:
+                    handler.handle(self.make_record('hijo'))
+                    handler.listener.stop()
+                    handler.listener.handlers[0].close()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            handler.listener.stop()
+        finally:
+            handler.listener.handlers[0].close()
+            log_handlers._queued_handlers.remove(handler)
+        
+        self.assertEqual(
+            sorted(self.log_path.read_text(encoding='utf-8').splitlines()),
+            ['[INFO] hijo', '[INFO] padre']
+        )
+    
+    def test_rollover_is_not_repeated_by_second_process(self):
+        """Test que un handler no vuelve a rotar un log que otro ya rotó."""
+        first = ReopeningRotatingFileHandler(self.log_path, maxBytes=50, backupCount=3)
+        second = ReopeningRotatingFileHandler(self.log_path, maxBytes=50, backupCount=3)
+        try:
+            first.emit(self.make_record('x' * 60))
+            second.emit(self.make_record('y' * 10))
+            # Ambos superan el límite; el primero rota y el segundo no debe
+            # volver a rotar el archivo nuevo (aún vacío)
+            first.doRollover()
+            second.doRollover()
+        finally:
+            first.close()
+            second.close()
+        
+        self.assertTrue(Path(f'{self.log_path}.1').exists())
+        self.assertFalse(Path(f'{self.log_path}.2').exists())
+
+
+class PerformanceMiddlewareTestCase(TestCase):
+    """Tests para la instrumentación de rendimiento por petición."""
+    
+    def setUp(self):
+        """Configuración inicial."""
+        cache.clear()
+        performance.registry.reset()
+        self.addCleanup(performance.registry.reset)
+    
+    def view_stats(self, name):
+        for view in performance.registry.snapshot():
+            if view['view'] == name:
+                return view
+        self.fail(f'Sin muestras para {name}')
+    
+    def test_request_is_recorded_by_url_name(self):
+        """Test que se registran tiempo, SQL, plantillas y tamaño por vista."""
+        response = self.client.get(reverse('post_list'))
+        self.assertEqual(response.status_code, 200)
+        
+        stats = self.view_stats('post_list')
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['wall_ms']['p50'], 0)
+        self.assertGreater(stats['sql_count']['p50'], 0)
+        self.assertGreater(stats['template_ms']['p50'], 0)
+        self.assertLessEqual(stats['template_ms']['p50'], stats['wall_ms']['p50'])
+        self.assertEqual(stats['response_bytes']['p50'], len(response.content))
+    
+    def test_unresolved_requests(self):
+        """Test que las rutas inexistentes se agrupan en una sola entrada."""
+        self.client.get('/no-existe/')
+        self.client.get('/tampoco/')
+        self.assertEqual(self.view_stats(performance.UNRESOLVED)['requests'], 2)
+    
+    @override_settings(PERF_SAMPLE_SIZE=3)
+    def test_samples_are_bounded(self):
+        """Test que solo se conservan las últimas muestras por vista."""
+        for _ in range(5):
+            self.client.get(reverse('post_list'))
+        stats = self.view_stats('post_list')
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['samples'], 3)
+    
+    @override_settings(PERF_MONITOR_ENABLED=False)
+    def test_disabled(self):
+        """Test que no se registra nada con la instrumentación desactivada."""
+        self.client.get(reverse('post_list'))
+        self.assertEqual(performance.registry.snapshot(), [])
+    
+    def test_percentile(self):
+        """Test del percentil por rango más cercano."""
+        values = list(range(1, 101))
+        self.assertEqual(performance.percentile(values, 50), 50)
+        self.assertEqual(performance.percentile(values, 95), 95)
+        self.assertEqual(performance.percentile(values, 99), 99)
+        self.assertEqual(performance.percentile([7], 99), 7)
+        self.assertIsNone(performance.percentile([], 50))
+
+
+class QueryInspectorMiddlewareTestCase(TestCase):
+    """Tests para los avisos de consultas del middleware."""
+    
+    def setUp(self):
+        cache.clear()
+    
+    @override_settings(QUERY_INSPECTOR_ENABLED=True)
+    def test_no_warning_within_budget(self):
+        """Test que no se avisa si la vista cumple su presupuesto."""
+        with self.assertNoLogs('blog_platform.queries', level='WARNING'):
+            self.client.get(reverse('post_list'))
+    
+    @override_settings(QUERY_INSPECTOR_ENABLED=True, NPLUSONE_THRESHOLD=1)
+    def test_warns_on_repeated_queries(self):
+        """Test que se avisa de las consultas repetidas."""
+        with self.assertLogs('blog_platform.queries', level='WARNING') as logs:
+            self.client.get(reverse('post_list'))
+        self.assertIn('GET /blog/: N+1 en', logs.output[0])